@@ -0,0 +1,164 @@
+import math
+import queue
+import random
+import statistics
+import threading
+import time
+
+
+# Arrival profiles; rates are iterations started per minute
+#   constant:RATE                 evenly spaced starts
+#   poisson:RATE                  random starts averaging RATE
+#   step:RATE,RATE,...:SECONDS    each rate held for SECONDS, the last one until the end
+#   spike:BASE:PEAK:AT:LENGTH     BASE, except PEAK from AT seconds for LENGTH seconds
+PROFILE_KINDS = ['constant', 'poisson', 'step', 'spike']
+
+
+class ArrivalProfile:
+    """When each iteration of an open-loop run is due to start, independent of how long iterations take"""
+    
+    def __init__(self, spec, seed=None):
+        self.spec = spec
+        kind, _, rest = spec.partition(":")
+        parts = rest.split(":") if rest else []
+        try:
+            if kind in ("constant", "poisson") and len(parts) == 1:
+                segments = [(0, float(parts[0]))]
+            elif kind == "step" and len(parts) == 2:
+                hold = float(parts[1])
+                segments = [(i * hold, float(rate)) for i, rate in enumerate(parts[0].split(","))]
+            elif kind == "spike" and len(parts) == 4:
+                base, peak, at, length = (float(part) for part in parts)
+                segments = [(0, base), (at, peak), (at + length, base)]
+            else:
+                raise ValueError(spec)
+        except ValueError:
+            raise ValueError(f"Invalid arrival profile '{spec}'; use constant:RATE, poisson:RATE, "
+                             f"step:RATE,RATE,...:SECONDS or spike:BASE:PEAK:AT:LENGTH (rates per minute)")
+        if any(rate < 0 for _, rate in segments) or not any(rate > 0 for _, rate in segments):
+            raise ValueError(f"Arrival profile '{spec}' needs a positive rate")
+        self.kind = kind
+        # (start second, iterations per second) pieces of a piecewise constant rate
+        self.segments = [(start, rate / 60) for start, rate in segments]
+        self._random = random.Random(seed)
+    
+    def rate_at(self, offset):
+        """Iterations per minute the profile asks for at a number of seconds into the run"""
+        rate = 0
+        for start, per_second in self.segments:
+            if offset >= start:
+                rate = per_second
+        return rate * 60
+    
+    def _advance(self, offset, amount):
+        """The time at which the integrated rate has grown by amount, starting from offset"""
+        for i, (start, rate) in enumerate(self.segments):
+            end = self.segments[i + 1][0] if i + 1 < len(self.segments) else math.inf
+            if end <= offset:
+                continue
+            offset = max(offset, start)
+            if rate > 0 and amount <= (end - offset) * rate:
+                return offset + amount / rate
+            amount -= (end - offset) * rate
+            offset = end
+        return math.inf
+    
+    def arrivals(self, duration):
+        """Start offsets in seconds for every iteration due within duration seconds"""
+        offsets = []
+        # One unit of integrated rate per arrival; a Poisson process uses exponential units instead
+        offset = self._advance(0, 0)
+        while offset < duration:
+            offsets.append(offset)
+            amount = self._random.expovariate(1) if self.kind == "poisson" else 1
+            offset = self._advance(offset, amount)
+        return offsets
+
+
+class ArrivalScheduler:
+    """Starts iterations on an arrival profile with at most max_in_flight running at once
+    
+    Unlike the closed loop of virtual users, a slow server does not delay the next start: an iteration
+    that is due while every slot is busy waits in a queue, and the wait is reported as its start lag
+    so latency numbers are not flattered by coordinated omission. run_arrival(slot, sequence,
+    start_lag_ms) runs one iteration on a slot numbered from 1.
+    """
+    
+    def __init__(self, profile, duration, max_in_flight, run_arrival, stop_event=None):
+        self.profile = profile
+        self.duration = duration
+        self.max_in_flight = max_in_flight
+        self.run_arrival = run_arrival
+        self.stop_event = stop_event or threading.Event()
+        self.lags = []
+        # (sequence, error) of arrivals whose run_arrival raised
+        self.failures = []
+        self.peak_queue = 0
+        self._lock = threading.Lock()
+    
+    def _slot(self, slot, jobs, started):
+        """Run queued arrivals until the dispatcher sends None"""
+        while True:
+            job = jobs.get()
+            if job is None or self.stop_event.is_set():
+                return
+            sequence, offset = job
+            lag_ms = max(0.0, (time.monotonic() - started - offset) * 1000)
+            with self._lock:
+                self.lags.append(lag_ms)
+            try:
+                self.run_arrival(slot, sequence, round(lag_ms, 1))
+            except Exception as e:
+                # One broken arrival must not take its slot, and every arrival queued behind it, down
+                print(f"Arrival {sequence} on slot {slot} failed: {str(e)}")
+                with self._lock:
+                    self.failures.append((sequence, str(e)))
+    
+    def run(self):
+        """Dispatch every arrival due within the duration and wait for the iterations to finish"""
+        offsets = self.profile.arrivals(self.duration)
+        print(f"Open-loop run: {len(offsets)} iteration(s) over {self.duration:.0f}s ({self.profile.spec}, rates per minute), "
+              f"at most {self.max_in_flight} at once")
+        
+        jobs = queue.Queue()
+        started = time.monotonic()
+        slots = [threading.Thread(target=self._slot, args=(slot, jobs, started), name=f"oncore-arrival-{slot}")
+                 for slot in range(1, self.max_in_flight + 1)]
+        for thread in slots:
+            thread.start()
+        
+        try:
+            for sequence, offset in enumerate(offsets, 1):
+                if self.stop_event.wait(max(0.0, started + offset - time.monotonic())):
+                    break
+                jobs.put((sequence, offset))
+                self.peak_queue = max(self.peak_queue, jobs.qsize())
+        except KeyboardInterrupt:
+            print("\nOpen-loop run interrupted, waiting for running iterations to finish...")
+            self.stop_event.set()
+        for _ in slots:
+            jobs.put(None)
+        try:
+            for thread in slots:
+                thread.join()
+        except KeyboardInterrupt:
+            self.stop_event.set()
+            for thread in slots:
+                thread.join()
+        self.print_summary()
+        return self.lags
+    
+    def print_summary(self):
+        """Print how far iteration starts fell behind the schedule"""
+        if not self.lags:
+            return
+        lags = sorted(self.lags)
+        p95 = lags[min(len(lags) - 1, math.ceil(0.95 * len(lags)) - 1)]
+        late = sum(1 for lag in lags if lag >= 1000)
+        print(f"\nStart lag over {len(lags)} iteration(s): median {statistics.median(lags):.0f} ms, "
+              f"p95 {p95:.0f} ms, max {lags[-1]:.0f} ms; {late} started 1s or more late, "
+              f"up to {self.peak_queue} waiting for a free slot")
+        if self.failures:
+            print(f"{len(self.failures)} arrival(s) failed before their iteration could be recorded")
+        if late:
+            print("Iterations queued for a free browser: raise --users or lower the arrival rate to keep up")
@@ -1,38 +1,92 @@
-from selenium import webdriver
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-import unittest
-
-
-class BaseTest(unittest.TestCase):
-    """Base test class for all Selenium tests"""
-    
-    def setUp(self):
-        """Set up test environment before each test method runs"""
-        print("Setting up the test environment...")
-        
-        # Configure Chrome options
-        chrome_options = Options()
-        chrome_options.add_argument("--start-maximized")
-        # chrome_options.add_argument("--headless")  # Uncomment to run without UI
-        
-        # Add anti-bot detection evasion
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option("useAutomationExtension", False)
-        
-        # Set up Chrome driver with automatic webdriver management
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        
-        # Mask WebDriver to avoid detection
-        self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        
-        self.driver.implicitly_wait(10)  # Set implicit wait
-    
-    def tearDown(self):
-        """Clean up test environment after each test method runs"""
-        print("Tearing down the test environment...")
-        if self.driver:
-            self.driver.quit()
\ No newline at end of file
+from selenium import webdriver
+from webdriver_manager.chrome import ChromeDriverManager
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from devtools_log import enable_performance_log
+from browser_profiles import get_profile
+import web_vitals
+import threading
+import unittest
+
+
+# Path of the downloaded chromedriver, resolved once per process
+_chromedriver_path = None
+_chromedriver_lock = threading.Lock()
+
+
+def get_chromedriver_path():
+    """Install chromedriver on first use and reuse the path for every later session"""
+    global _chromedriver_path
+    with _chromedriver_lock:
+        if _chromedriver_path is None:
+            _chromedriver_path = ChromeDriverManager().install()
+        return _chromedriver_path
+
+
+def create_driver(performance_log=False, headless=False, profile=None, trace=False):
+    """Start and return a configured Chrome WebDriver session
+    
+    profile is a browser_profiles name (default measurement-faithful); headless runs it without a window,
+    e.g. on CI boxes without a display for benchmarks against mock_oncore_server. trace adds Chrome trace
+    events to the performance log so cdp_metrics can save a trace per step.
+    """
+    # Configure Chrome options from the browser profile
+    chrome_options = Options()
+    get_profile(profile, headless).apply(chrome_options)
+    
+    # Add anti-bot detection evasion
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option("useAutomationExtension", False)
+    
+    # Record DevTools network events when resource capture is enabled, and trace events when tracing
+    if performance_log or trace:
+        enable_performance_log(chrome_options, trace=trace)
+    
+    # Set up Chrome driver with automatic webdriver management
+    service = Service(get_chromedriver_path())
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+    
+    # Mask WebDriver to avoid detection
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    
+    # Observe paints, layout shifts and long tasks from the start of every page
+    web_vitals.install(driver)
+    
+    driver.implicitly_wait(10)  # Set implicit wait
+    return driver
+
+
+class BaseTest(unittest.TestCase):
+    """Base test class for all Selenium tests"""
+    
+    # Optional driver_pool.DriverPool; when set, tests borrow a session instead of starting Chrome
+    driver_pool = None
+    # Set by setUp; stays None when no session could be started, so tearDown has nothing to release
+    driver = None
+    # browser_profiles name for sessions this class starts
+    browser_profile = None
+    # Enable Chrome's DevTools performance log for sessions this class starts
+    performance_log = False
+    # Also record Chrome trace events in that log
+    trace = False
+    
+    def setUp(self):
+        """Set up test environment before each test method runs"""
+        print("Setting up the test environment...")
+        
+        if self.driver_pool is not None:
+            self.driver = self.driver_pool.acquire()
+        else:
+            self.driver = create_driver(performance_log=self.performance_log, profile=self.browser_profile,
+                                        trace=self.trace)
+    
+    def tearDown(self):
+        """Clean up test environment after each test method runs"""
+        print("Tearing down the test environment...")
+        if self.driver:
+            if self.driver_pool is not None:
+                self.driver_pool.release(self.driver)
+            else:
+                self.driver.quit()
+            self.driver = None
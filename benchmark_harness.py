@@ -0,0 +1,152 @@
+from oncore_performance_test_general import OncorePerformanceTestGeneral
+from mock_oncore_server import add_server_arguments, server_from_args
+from driver_pool import DriverPool
+from browser_profiles import get_profile, PROFILES
+from performance_sink import close_all_sinks
+from performance_results import read_performance_csv
+from run_config import RunConfig
+import argparse
+import json
+import os
+import statistics
+import time
+
+
+def run_benchmark(server, iterations=3, browser_mode=DriverPool.WARM, headless=True, fixed_waits=False,
+                  measure_login=False, results_dir="benchmark_results", browser_profile=None):
+    """Run the full protocol test against a mock server and return per-iteration and per-page overhead"""
+    if not os.path.exists(results_dir):
+        os.makedirs(results_dir)
+    
+    test_class = OncorePerformanceTestGeneral
+    test_class.PROTOCOL_RESULTS_FILE = os.path.join(results_dir, "benchmark_protocol.csv")
+    test_class.ADMIN_RESULTS_FILE = os.path.join(results_dir, "benchmark_admin.csv")
+    test_class.run_config = RunConfig(
+        environments=[server.url],
+        username="benchmark",
+        password=server.password or "benchmark",
+        targets=[{'protocol_no': "MOCK-001", 'protocol_id': "1", 'arm': server.arms[0],
+                  'subjects': [server.subjects[0]]}],
+        iterations=iterations,
+        browser_mode=browser_mode,
+        browser_profile=get_profile(browser_profile, headless).name,
+        fixed_waits=fixed_waits,
+        measure_login=measure_login,
+        interactive=False
+    )
+    test_class.setUpClass()
+    test_class.driver_pool = DriverPool(size=1, mode=browser_mode, origins=[server.url],
+                                        driver_factory=test_class.driver_factory())
+    
+    wall_times = {}
+    try:
+        for iteration in range(1, iterations + 1):
+            print(f"\n======= Benchmark iteration {iteration} of {iterations} =======\n")
+            test_instance = test_class("test_protocol_performance")
+            test_class.current_iteration = iteration
+            started = time.monotonic()
+            test_instance.setUp()
+            try:
+                test_instance.test_protocol_performance()
+            except Exception as e:
+                print(f"\n✗ Benchmark iteration {iteration} failed: {str(e)}")
+            finally:
+                test_instance.tearDown()
+            wall_times[iteration] = (time.monotonic() - started) * 1000
+    finally:
+        test_class.driver_pool.close()
+        close_all_sinks()
+        if test_class.screenshots is not None:
+            test_class.screenshots.close()
+    
+    rows = [row for row in read_performance_csv(test_class.PROTOCOL_RESULTS_FILE)
+            if row['run_id'] == test_class.run_id]
+    return summarize_overhead(rows, wall_times, server)
+
+
+def summarize_overhead(rows, wall_times, server):
+    """Split each iteration's wall time into measured page time and harness time between steps"""
+    measured = {}
+    # Failed and skipped steps have no load time
+    rows = [row for row in rows if row['load_time_ms'] is not None]
+    for row in rows:
+        measured[row['iteration']] = measured.get(row['iteration'], 0) + row['load_time_ms']
+    
+    iterations = []
+    for iteration, wall in sorted(wall_times.items()):
+        page_time = measured.get(iteration, 0)
+        iterations.append({
+            'iteration': iteration,
+            'wall_ms': wall,
+            'measured_ms': page_time,
+            'harness_ms': wall - page_time,
+            'harness_share': (wall - page_time) / wall if wall else None
+        })
+    
+    # With fixed latencies, whatever a step measures above the server's think time is browser and harness cost
+    server_time = {
+        'navigation': server.expected_latency('protocol'),
+        'soft': server.expected_latency('fragment')
+    }
+    pages = {}
+    for row in rows:
+        pages.setdefault((row['page'], row['transition']), []).append(row['load_time_ms'])
+    steps = []
+    for (page, transition), times in sorted(pages.items()):
+        expected = server_time.get(transition)
+        median = statistics.median(times)
+        steps.append({
+            'page': page,
+            'transition': transition,
+            'count': len(times),
+            'median_ms': median,
+            'server_ms': expected,
+            'above_server_ms': median - expected if expected is not None else None
+        })
+    
+    return {'iterations': iterations, 'steps': steps, 'server_requests': server.requests}
+
+
+def print_overhead(summary):
+    """Print the harness share of every iteration and the per-step cost above server latency"""
+    print("\n======= Harness Overhead =======")
+    print(f"{'Iteration':>9}{'wall ms':>12}{'measured ms':>14}{'harness ms':>13}{'harness %':>11}")
+    for item in summary['iterations']:
+        share = f"{100 * item['harness_share']:.1f}" if item['harness_share'] is not None else "n/a"
+        print(f"{item['iteration']:>9}{item['wall_ms']:>12.0f}{item['measured_ms']:>14.0f}"
+              f"{item['harness_ms']:>13.0f}{share:>11}")
+    
+    print(f"\n{'Step':<28}{'type':<12}{'n':>4}{'median ms':>11}{'server ms':>11}{'above ms':>10}")
+    for step in summary['steps']:
+        server = f"{step['server_ms']:.0f}" if step['server_ms'] is not None else "-"
+        above = f"{step['above_server_ms']:.0f}" if step['above_server_ms'] is not None else "-"
+        print(f"{step['page'][:27]:<28}{step['transition']:<12}{step['count']:>4}{step['median_ms']:>11.0f}"
+              f"{server:>11}{above:>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the harness's own overhead against a local mock OnCore")
+    add_server_arguments(parser)
+    # Fixed latencies and a random free port make CI runs repeatable and conflict free
+    parser.set_defaults(port=0, latency="fixed:100", seed=1)
+    parser.add_argument("--iterations", type=int, default=3, help="Iterations of the protocol test")
+    parser.add_argument("--browser-mode", choices=[DriverPool.COLD, DriverPool.WARM], default=DriverPool.WARM)
+    parser.add_argument("--headed", action="store_true", help="Show the browser instead of running headless")
+    parser.add_argument("--browser-profile", choices=list(PROFILES), default=None,
+                        help="Chrome settings to benchmark (default: measurement-faithful, run headless)")
+    parser.add_argument("--fixed-waits", action="store_true", help="Benchmark fixed sleeps instead of readiness waits")
+    parser.add_argument("--measure-login", action="store_true", help="Log in on every iteration")
+    parser.add_argument("--results-dir", default="benchmark_results", help="Directory for the benchmark's CSVs")
+    parser.add_argument("--output", default=None, help="Also write the summary as JSON to this file")
+    args = parser.parse_args()
+    
+    with server_from_args(args) as server:
+        print(f"Mock OnCore serving on {server.url}")
+        summary = run_benchmark(server, args.iterations, args.browser_mode, not args.headed, args.fixed_waits,
+                                args.measure_login, args.results_dir, args.browser_profile)
+    
+    print_overhead(summary)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"\nBenchmark summary written to {args.output}")
@@ -0,0 +1,103 @@
+import os
+import tempfile
+
+
+# Disk cache shared by every high-density session on this machine, so static assets are fetched once per runner
+SHARED_CACHE_DIR = os.path.join(tempfile.gettempdir(), "oncore-selenium-cache")
+
+
+class BrowserProfile:
+    """A named set of Chrome switches; the name is stored with every measurement taken under it"""
+    
+    def __init__(self, name, description, arguments=(), headless=False, window_size=None, maximized=False,
+                 shared_disk_cache=False, memory_cap_mb=None, renderer_process_limit=None):
+        self.name = name
+        self.description = description
+        self.arguments = list(arguments)
+        self.headless = headless
+        self.window_size = window_size
+        self.maximized = maximized
+        self.shared_disk_cache = shared_disk_cache
+        # Caps each renderer's JavaScript heap; pages that need more fail instead of swapping the runner
+        self.memory_cap_mb = memory_cap_mb
+        self.renderer_process_limit = renderer_process_limit
+    
+    def with_headless(self):
+        """This profile run headless, under its own name so the rows say so"""
+        if self.headless:
+            return self
+        return BrowserProfile(f"{self.name}+headless", f"{self.description}, headless", self.arguments,
+                              headless=True, window_size=self.window_size or (1920, 1080),
+                              shared_disk_cache=self.shared_disk_cache, memory_cap_mb=self.memory_cap_mb,
+                              renderer_process_limit=self.renderer_process_limit)
+    
+    def chrome_arguments(self):
+        """Command line switches for this profile"""
+        arguments = []
+        if self.headless:
+            arguments += ["--headless=new", "--no-sandbox", "--disable-dev-shm-usage"]
+        if self.maximized and not self.headless:
+            arguments.append("--start-maximized")
+        if self.window_size:
+            arguments.append(f"--window-size={self.window_size[0]},{self.window_size[1]}")
+        if self.shared_disk_cache:
+            arguments.append(f"--disk-cache-dir={SHARED_CACHE_DIR}")
+        if self.memory_cap_mb:
+            arguments.append(f"--js-flags=--max-old-space-size={self.memory_cap_mb}")
+        if self.renderer_process_limit:
+            arguments.append(f"--renderer-process-limit={self.renderer_process_limit}")
+        return arguments + self.arguments
+    
+    def apply(self, chrome_options):
+        """Add this profile's switches to a selenium Options object"""
+        for argument in self.chrome_arguments():
+            chrome_options.add_argument(argument)
+        return chrome_options
+
+
+MEASUREMENT_FAITHFUL = "measurement-faithful"
+HIGH_DENSITY_HEADLESS = "high-density-headless"
+
+PROFILES = {
+    # What a user sees: a visible, maximized browser with GPU, extensions and background work left alone
+    MEASUREMENT_FAITHFUL: BrowserProfile(
+        MEASUREMENT_FAITHFUL,
+        "Full, maximized Chrome as a user would run it",
+        maximized=True
+    ),
+    # Many sessions per runner: no UI, no GPU, nothing running in the background, shared cache, capped memory
+    HIGH_DENSITY_HEADLESS: BrowserProfile(
+        HIGH_DENSITY_HEADLESS,
+        "Headless Chrome trimmed for many concurrent sessions per runner",
+        arguments=[
+            "--disable-extensions",
+            "--disable-gpu",
+            "--disable-background-networking",
+            "--disable-component-update",
+            "--disable-default-apps",
+            "--disable-sync",
+            "--no-first-run",
+            "--mute-audio",
+            "--metrics-recording-only"
+        ],
+        headless=True,
+        window_size=(1366, 768),
+        shared_disk_cache=True,
+        memory_cap_mb=512,
+        renderer_process_limit=2
+    )
+}
+
+
+def get_profile(name=None, headless=False):
+    """Look up a profile by name (default measurement-faithful), optionally forcing it headless"""
+    name = name or MEASUREMENT_FAITHFUL
+    if isinstance(name, str) and name.endswith("+headless"):
+        name, headless = name[:-len("+headless")], True
+    if isinstance(name, BrowserProfile):
+        profile = name
+    elif name in PROFILES:
+        profile = PROFILES[name]
+    else:
+        raise ValueError(f"Unknown browser profile '{name}', expected one of: {', '.join(PROFILES)}")
+    return profile.with_headless() if headless else profile
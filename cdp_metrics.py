@@ -0,0 +1,99 @@
+from selenium.common.exceptions import WebDriverException
+from performance_results import CDP_METRIC_FIELDS
+from datetime import datetime
+import gzip
+import json
+import os
+import re
+import threading
+
+
+# Performance.getMetrics names and the columns they are stored in; durations are seconds of main-thread time
+CDP_METRICS = {
+    'ScriptDuration': 'script_ms',
+    'LayoutDuration': 'layout_ms',
+    'RecalcStyleDuration': 'recalc_style_ms',
+    'TaskDuration': 'task_ms'
+}
+
+
+def _safe(value):
+    """Keep a name usable as part of a file name"""
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", str(value)).strip("_") or "step"
+
+
+class CdpMetrics:
+    """Records Chrome's Performance.getMetrics for each measured step, and optionally saves the step's trace
+    
+    Durations are the main-thread time spent since the step started (mark) or since the previous
+    measurement in the same window, so client-side work can be told apart from server latency.
+    Traces need the DevTools performance log with trace categories (create_driver(trace=True)).
+    """
+    
+    def __init__(self, trace_dir=None):
+        # Folder for one gzipped trace per measured step, or None to only record the metrics
+        self.trace_dir = trace_dir
+        self._baselines = {}
+        self._enabled = set()
+        self._lock = threading.Lock()
+    
+    def _key(self, driver):
+        """Metrics are per page target, so baselines are kept per session and window"""
+        return driver.session_id, driver.current_window_handle
+    
+    def sample(self, driver):
+        """Current Performance.getMetrics values by name, or None when the browser does not support CDP"""
+        try:
+            key = self._key(driver)
+            if key not in self._enabled:
+                driver.execute_cdp_cmd("Performance.enable", {"timeDomain": "timeTicks"})
+                self._enabled.add(key)
+            result = driver.execute_cdp_cmd("Performance.getMetrics", {})
+        except (WebDriverException, AttributeError) as e:
+            print(f"Could not read CDP performance metrics: {str(e).splitlines()[0] if str(e) else e}")
+            return None
+        return {metric['name']: metric['value'] for metric in result.get('metrics', [])}
+    
+    def mark(self, driver):
+        """Start a step: later durations are measured from here"""
+        values = self.sample(driver)
+        if values is not None:
+            with self._lock:
+                self._baselines[self._key(driver)] = values
+    
+    def measure(self, driver):
+        """Columns for a measured step: JS heap in use now and the main-thread time spent since mark"""
+        row = dict.fromkeys(CDP_METRIC_FIELDS)
+        values = self.sample(driver)
+        if values is None:
+            return row
+        with self._lock:
+            baseline = self._baselines.get(self._key(driver), {})
+            self._baselines[self._key(driver)] = values
+        for name, column in CDP_METRICS.items():
+            if name not in values:
+                continue
+            spent = values[name] - baseline.get(name, 0)
+            # The counters start again when a navigation moves the page to a new renderer
+            if spent < 0:
+                spent = values[name]
+            row[column] = round(spent * 1000, 1)
+        if 'JSHeapUsedSize' in values:
+            row['js_heap_used_mb'] = round(values['JSHeapUsedSize'] / (1024 * 1024), 2)
+        return row
+    
+    def save_trace(self, events, page_name, run_id=None, iteration=None, worker_id=None):
+        """Write a step's trace events as a gzipped JSON trace that DevTools or Perfetto can open"""
+        if not events:
+            return None
+        parts = [f"i{iteration}"] if iteration is not None else []
+        if worker_id is not None:
+            parts.append(f"w{worker_id}")
+        parts.append(_safe(page_name))
+        parts.append(datetime.now().strftime("%H%M%S%f"))
+        directory = os.path.join(self.trace_dir, _safe(run_id or "adhoc"))
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, "-".join(parts) + ".json.gz")
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump({'traceEvents': events}, f)
+        return path
@@ -0,0 +1,65 @@
+from selenium.common.exceptions import WebDriverException
+import json
+
+
+# Trace categories chromedriver records into the performance log when step traces are enabled
+TRACE_CATEGORIES = "devtools.timeline,v8.execute,blink.user_timing,loading,disabled-by-default-devtools.timeline"
+
+
+def enable_performance_log(chrome_options, trace=False):
+    """Ask chromedriver to record DevTools events in the 'performance' log, and trace events if trace is set"""
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    if trace:
+        chrome_options.add_experimental_option("perfLoggingPrefs", {"traceCategories": TRACE_CATEGORIES})
+    return chrome_options
+
+
+def drain_events(driver):
+    """Return and clear the DevTools events logged since the last call, as (method, params) pairs"""
+    try:
+        entries = driver.get_log("performance")
+    except (WebDriverException, AttributeError):
+        # Not a Chrome session, or the performance log was not enabled
+        return []
+    
+    events = []
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        events.append((message.get("method"), message.get("params", {})))
+    return events
+
+
+def network_requests(events):
+    """Summarize Network.* events into one record per completed request, keyed by URL"""
+    requests = {}
+    by_id = {}
+    for method, params in events:
+        if method == "Network.responseReceived":
+            response = params.get("response", {})
+            record = {
+                'url': response.get('url'),
+                'status': response.get('status'),
+                'mime_type': response.get('mimeType'),
+                'from_cache': bool(response.get('fromDiskCache') or response.get('fromServiceWorker')),
+                'bytes': None
+            }
+            by_id[params.get("requestId")] = record
+        elif method == "Network.loadingFinished":
+            record = by_id.get(params.get("requestId"))
+            if record is not None:
+                record['bytes'] = params.get("encodedDataLength")
+                requests[record['url']] = record
+    return requests
+
+
+def trace_events(events):
+    """Chrome trace events from Tracing.dataCollected entries, in the format DevTools and Perfetto load"""
+    collected = []
+    for method, params in events:
+        if method == "Tracing.dataCollected":
+            # chromedriver logs one trace event per entry; the raw CDP event carries a list in 'value'
+            collected.extend(params["value"] if isinstance(params.get("value"), list) else [params])
+    return collected
@@ -0,0 +1,191 @@
+from base_test import create_driver
+from selenium.common.exceptions import WebDriverException
+from contextlib import contextmanager
+from urllib.parse import urlparse
+import threading
+import time
+
+
+class DriverPoolTimeout(Exception):
+    """Raised when no pooled browser session becomes available in time"""
+
+
+class DriverPool:
+    """Pool of reusable Chrome sessions that tests and iteration loops borrow from"""
+    
+    # Warm sessions stay open and are reset between checkouts; cold sessions are
+    # started on checkout and quit on release, so a first-launch browser is measured on purpose
+    WARM = "warm"
+    COLD = "cold"
+    
+    STORAGE_TYPES = "local_storage,session_storage,indexeddb,websql,cache_storage,service_workers"
+    
+    def __init__(self, size=1, mode=WARM, driver_factory=create_driver, origins=None,
+                 clear_http_cache=False, max_uses=None, acquire_timeout=600, prewarm=False):
+        if mode not in (self.WARM, self.COLD):
+            raise ValueError(f"Unknown browser mode '{mode}', expected '{self.WARM}' or '{self.COLD}'")
+        self.size = size
+        self.mode = mode
+        self.driver_factory = driver_factory
+        self.origins = [self._origin(url) for url in (origins or [])]
+        self.clear_http_cache = clear_http_cache
+        self.max_uses = max_uses
+        self.acquire_timeout = acquire_timeout
+        
+        self._condition = threading.Condition()
+        self._idle = []
+        self._checked_out = 0
+        self._uses = {}
+        self._closed = False
+        
+        if prewarm and mode == self.WARM:
+            for _ in range(size):
+                self._idle.append(self._new_driver())
+    
+    @staticmethod
+    def _origin(url):
+        """Reduce a URL to scheme://host[:port] for storage clearing"""
+        parsed = urlparse(url if "://" in url else "https://" + url)
+        return f"{parsed.scheme}://{parsed.netloc}"
+    
+    def add_origin(self, url):
+        """Register an origin whose storage is cleared when a session is reset"""
+        origin = self._origin(url)
+        if origin not in self.origins:
+            self.origins.append(origin)
+    
+    def _new_driver(self):
+        """Start a new browser session and start counting its checkouts"""
+        started = time.monotonic()
+        driver = self.driver_factory()
+        self._uses[id(driver)] = 0
+        print(f"Started new browser session in {time.monotonic() - started:.1f}s")
+        return driver
+    
+    def _discard(self, driver):
+        """Quit a session that is no longer wanted in the pool"""
+        self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except WebDriverException as e:
+            print(f"Error quitting browser session: {str(e)}")
+    
+    def is_healthy(self, driver):
+        """Check that a session still responds and has at least one window"""
+        try:
+            return bool(driver.window_handles) and driver.execute_script("return 1;") == 1
+        except WebDriverException:
+            return False
+    
+    def reset(self, driver):
+        """Return a session to a clean state: one blank window, no cookies or site storage"""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        
+        # Clear storage for whatever page is currently loaded before leaving it
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except WebDriverException:
+            pass
+        driver.delete_all_cookies()
+        
+        # Chrome can also clear cookies and storage for origins other than the current one
+        if hasattr(driver, "execute_cdp_cmd"):
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            for origin in self.origins:
+                driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                    "origin": origin,
+                    "storageTypes": self.STORAGE_TYPES
+                })
+            if self.clear_http_cache:
+                driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+        
+        driver.get("about:blank")
+        return driver
+    
+    def acquire(self):
+        """Borrow a session, starting or replacing browsers as needed"""
+        deadline = time.monotonic() + self.acquire_timeout
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Driver pool is closed")
+                if self._idle:
+                    driver = self._idle.pop()
+                    break
+                if self._checked_out < self.size:
+                    driver = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise DriverPoolTimeout(f"No browser session available after {self.acquire_timeout}s")
+                self._condition.wait(remaining)
+            # Reserve the slot before doing slow browser work outside the lock
+            self._checked_out += 1
+        
+        try:
+            if driver is not None and not self._prepare(driver):
+                driver = None
+            if driver is None:
+                driver = self._new_driver()
+        except Exception:
+            self._release_slot()
+            raise
+        
+        with self._condition:
+            self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+        return driver
+    
+    def _prepare(self, driver):
+        """Health check and reset an idle session, discarding it if either fails"""
+        if not self.is_healthy(driver):
+            print("Discarding unhealthy browser session")
+            self._discard(driver)
+            return False
+        try:
+            self.reset(driver)
+        except WebDriverException as e:
+            print(f"Discarding browser session that could not be reset: {str(e)}")
+            self._discard(driver)
+            return False
+        return True
+    
+    def _release_slot(self):
+        """Free a checkout slot and wake up one waiting borrower"""
+        with self._condition:
+            self._checked_out -= 1
+            self._condition.notify()
+    
+    def release(self, driver):
+        """Return a borrowed session; cold sessions and worn out or broken ones are quit"""
+        worn_out = self.max_uses is not None and self._uses.get(id(driver), 0) >= self.max_uses
+        if self.mode == self.COLD or self._closed or worn_out or not self.is_healthy(driver):
+            self._discard(driver)
+            self._release_slot()
+            return
+        
+        with self._condition:
+            self._checked_out -= 1
+            self._idle.append(driver)
+            self._condition.notify()
+    
+    @contextmanager
+    def session(self):
+        """Borrow a session for the duration of a with block"""
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+    
+    def close(self):
+        """Quit every idle session; sessions still borrowed are quit when released"""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        for driver in idle:
+            self._discard(driver)
@@ -0,0 +1,297 @@
+from performance_results import environment_name, error_summary, PASSED, FAILED
+from performance_sink import get_sink, close_all_sinks
+from run_config import RunConfig, add_run_arguments
+from scenario import render
+from datetime import datetime
+from requests.adapters import HTTPAdapter
+import page_timing
+import argparse
+import itertools
+import requests
+import statistics
+import threading
+import time
+
+
+# Probe rows are kept apart from the browser's measurements of the same pages
+PROBE_RESULTS_FILE = "oncore_probe_performance.csv"
+
+
+def probe_targets(scenario, context):
+    """The measured navigate steps of a scenario as (measurement name, absolute URL) pairs
+    
+    Clicks, scripts and popups need the browser, so only plain GETs of known servlets are probed.
+    """
+    targets = []
+    for step in scenario.steps:
+        if step.action == "navigate" and step.measure:
+            url = render(step.url, context)
+            if not url.startswith("http"):
+                url = f"{context['base_url']}{url}"
+            targets.append((render(step.measure, context), url))
+    return targets
+
+
+def browser_cookies(driver):
+    """Every cookie of a signed-in browser, including the single sign-on server's when DevTools is available"""
+    if hasattr(driver, "execute_cdp_cmd"):
+        return driver.execute_cdp_cmd("Network.getAllCookies", {})['cookies']
+    return driver.get_cookies()
+
+
+class HttpProbe:
+    """Times plain HTTP GETs of OnCore pages with a browser's authenticated cookies, many at a time
+    
+    Each request records its time to first byte (request_ms), the rest of the body (response_ms), the
+    total (load_time_ms), the status code and the body size. Rows use the transition 'probe' so they
+    are never mixed up with what a browser measured for the same page. A non-2xx response is a failed
+    row that keeps its timings; a request that got no response is a failed row without them.
+    """
+    
+    def __init__(self, cookies, base_url, user_agent=None, concurrency=8, timeout=30, run_id=None,
+                 sink=None, results_store=None, live_metrics=None):
+        self.base_url = base_url
+        self.environment = environment_name(base_url)
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.run_id = run_id
+        # Optional performance_sink.CsvPerformanceSink, results_store.SQLiteResultsStore and
+        # live_metrics.LiveMetrics for the rows
+        self.sink = sink
+        self.results_store = results_store
+        self.live_metrics = live_metrics
+        
+        # One session shares its connection pool and cookies between all probe threads
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if user_agent:
+            self.session.headers['User-Agent'] = user_agent
+        for cookie in cookies:
+            domain = cookie.get('domain') or ''
+            if domain and '.' not in domain.strip('.'):
+                # http.cookiejar files cookies of dotless hosts such as localhost under host.local
+                domain += '.local'
+            self.session.cookies.set(cookie['name'], cookie['value'], domain=domain,
+                                     path=cookie.get('path', '/'), secure=cookie.get('secure', False))
+        
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.rows = []
+        self.failures = 0
+        # Warm-up requests that got no response; they are reported but never written as rows
+        self.warm_up_failures = 0
+    
+    @classmethod
+    def from_page(cls, oncore_page, **options):
+        """A probe that reuses the session of a signed-in OncorePage"""
+        user_agent = oncore_page.driver.execute_script("return navigator.userAgent")
+        return cls(browser_cookies(oncore_page.driver), oncore_page.base_url, user_agent=user_agent,
+                   run_id=oncore_page.run_id, **options)
+    
+    def fetch(self, name, url):
+        """GET a URL once; returns (status, time to first byte, total time, body bytes) with times in ms"""
+        started = time.perf_counter()
+        # stream=True returns as soon as the headers are in, which marks the first byte
+        with self.session.get(url, stream=True, timeout=self.timeout, allow_redirects=False) as response:
+            first_byte = time.perf_counter()
+            body = response.content
+            finished = time.perf_counter()
+        if response.is_redirect and "login" in response.headers.get("Location", "").lower():
+            # Every later request would only time the redirect, so stop instead of recording noise
+            self._stop.set()
+            raise requests.RequestException(f"{name} redirected to the login page; the session has expired")
+        return response.status_code, (first_byte - started) * 1000, (finished - started) * 1000, len(body)
+    
+    def _new_row(self, name, sample, worker_id, status):
+        """A probe results row without timings"""
+        return {
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'page': name,
+            'load_time_ms': None,
+            'iteration': sample,
+            'worker_id': worker_id,
+            'transition': page_timing.PROBE,
+            'run_id': self.run_id,
+            'environment': self.environment,
+            'status': status
+        }
+    
+    def _record(self, name, sample, worker_id, status, ttfb, total, size):
+        """Store one probe as a results row, failed when the server did not answer with a 2xx status"""
+        passed = 200 <= status < 300
+        row = self._new_row(name, sample, worker_id, PASSED if passed else FAILED)
+        row.update({
+            'load_time_ms': round(total, 1),
+            'request_ms': round(ttfb, 1),
+            'response_ms': round(total - ttfb, 1),
+            'status_code': status,
+            'response_bytes': size
+        })
+        if not passed:
+            row['error'] = f"HTTP {status}"
+        self._store(row)
+    
+    def _record_failure(self, name, sample, worker_id, error):
+        """Store a request that got no response as a failed row"""
+        row = self._new_row(name, sample, worker_id, FAILED)
+        row['error'] = error_summary(error)
+        print(f"Probe {name} failed: {row['error']}")
+        self._store(row)
+    
+    def _store(self, row):
+        """Keep a row and pass it to the sink, results store and live metrics"""
+        with self._lock:
+            self.rows.append(row)
+            if row['status'] == FAILED:
+                self.failures += 1
+        if self.sink is not None:
+            self.sink.write(row)
+        if self.results_store is not None:
+            self.results_store.write(row)
+        if self.live_metrics is not None:
+            self.live_metrics.observe(row)
+    
+    def warm_up(self, targets):
+        """Request every URL once, in scenario order and unrecorded
+        
+        Opens the pooled connections, and lets pages that depend on the protocol chosen earlier in the
+        session (coverage analysis, billing grid) see it before the concurrent requests start. A request
+        that fails is printed and counted in warm_up_failures, but kept out of the results and summary.
+        """
+        for name, url in targets:
+            try:
+                self.fetch(name, url)
+            except requests.RequestException as e:
+                self.warm_up_failures += 1
+                print(f"Warm-up request for {name} failed: {error_summary(e)}")
+    
+    def run(self, targets, samples=20, duration=None):
+        """Request every target `samples` times (or round-robin for `duration` seconds) over the pool
+        
+        Returns the recorded rows; failed requests and non-2xx responses are counted in self.failures.
+        """
+        print(f"Probing {len(targets)} URL(s) on {self.environment} with {self.concurrency} concurrent requests")
+        self.warm_up(targets)
+        if duration is not None:
+            jobs = ((target, sample) for sample in itertools.count(1) for target in targets)
+            deadline = time.monotonic() + duration
+        else:
+            jobs = ((target, sample) for sample in range(1, samples + 1) for target in targets)
+            deadline = None
+        jobs_lock = threading.Lock()
+        
+        def next_job():
+            with jobs_lock:
+                return next(jobs, None)
+        
+        def worker(worker_id):
+            while not self._stop.is_set() and (deadline is None or time.monotonic() < deadline):
+                job = next_job()
+                if job is None:
+                    return
+                (name, url), sample = job
+                try:
+                    status, ttfb, total, size = self.fetch(name, url)
+                except requests.RequestException as e:
+                    self._record_failure(name, sample, worker_id, e)
+                    continue
+                self._record(name, sample, worker_id, status, ttfb, total, size)
+        
+        started = time.monotonic()
+        threads = [threading.Thread(target=worker, args=(worker_id,), name=f"probe-{worker_id}")
+                   for worker_id in range(1, self.concurrency + 1)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+        print(f"{len(self.rows)} request(s) in {elapsed:.1f}s ({len(self.rows) / max(elapsed, 0.001):.1f}/s), "
+              f"{self.failures} failed")
+        if self.warm_up_failures:
+            print(f"{self.warm_up_failures} warm-up request(s) failed and were not recorded")
+        return self.rows
+    
+    def print_summary(self):
+        """Median time to first byte and total time, and the body size, for each probed page"""
+        print(f"\n{'Page':<32}{'n':>6}{'TTFB p50':>10}{'total p50':>11}{'total max':>11}{'KB':>8}")
+        timed = [row for row in self.rows if row['load_time_ms'] is not None]
+        for name in sorted({row['page'] for row in timed}):
+            rows = [row for row in timed if row['page'] == name]
+            print(f"{name[:31]:<32}{len(rows):>6}{statistics.median(r['request_ms'] for r in rows):>10.0f}"
+                  f"{statistics.median(r['load_time_ms'] for r in rows):>11.0f}"
+                  f"{max(r['load_time_ms'] for r in rows):>11.0f}"
+                  f"{statistics.median(r['response_bytes'] for r in rows) / 1024:>8.0f}")
+    
+    def close(self):
+        """Close the pooled connections"""
+        self.session.close()
+
+
+def parse_args(argv=None):
+    """Parse command line options for a probe run"""
+    parser = argparse.ArgumentParser(
+        description="Measure OnCore page latency with plain HTTP requests that reuse a browser's login")
+    add_run_arguments(parser)
+    parser.add_argument("--samples", type=int, default=None, help="Requests per URL (default: 20)")
+    parser.add_argument("--duration", type=float, default=None,
+                        help="Seconds to keep probing instead of a fixed number of samples")
+    parser.add_argument("--concurrency", type=int, default=None, help="Requests in flight at once (default: 8)")
+    parser.add_argument("--results-file", default=PROBE_RESULTS_FILE,
+                        help=f"CSV the probe rows are appended to (default: {PROBE_RESULTS_FILE})")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    # Imported here so the probe classes can be used without pulling in the test module
+    from oncore_performance_test_general import OncorePerformanceTestGeneral
+    
+    args = parse_args()
+    test_class = OncorePerformanceTestGeneral
+    test_class.run_config = RunConfig.load_settings(args=args)
+    test_class.setUpClass()
+    config = test_class.run_config
+    
+    # Flags override the config file's probe section, which overrides the defaults
+    options = {name: value for name, value in config.probe.items() if value is not None}
+    for name in ["samples", "duration", "concurrency"]:
+        if getattr(args, name) is not None:
+            options[name] = getattr(args, name)
+    
+    sink = get_sink(args.results_file, **test_class.sink_options)
+    try:
+        for case in config.cases():
+            test_class.use_case(case)
+            # The browser only signs in; its login timings go to the usual results file
+            test = test_class("test_protocol_performance")
+            test.setUp()
+            probe = None
+            try:
+                page = test.new_page(test.driver, test_class.PROTOCOL_RESULTS_FILE)
+                test.sign_in(page)
+                context = test.scenario_context()
+                targets = probe_targets(test_class.protocol_scenario, context)
+                if config.admin:
+                    targets += probe_targets(test_class.admin_scenario, context)
+                probe = HttpProbe.from_page(page, concurrency=int(options.get("concurrency", 8)), sink=sink,
+                                            results_store=test_class.results_store,
+                                            live_metrics=test_class.live_metrics)
+                duration = float(options["duration"]) if options.get("duration") is not None else None
+                probe.run(targets, samples=int(options.get("samples", 20)), duration=duration)
+                probe.print_summary()
+            finally:
+                if probe is not None:
+                    probe.close()
+                test.tearDown()
+    except KeyboardInterrupt:
+        print("\nProbe run interrupted by user.")
+    finally:
+        close_all_sinks()
+        if test_class.results_store is not None:
+            test_class.results_store.close()
+        if test_class.screenshots is not None:
+            test_class.screenshots.close()
+        if test_class.live_metrics is not None:
+            test_class.live_metrics.close()
+    print(f"\nProbe results saved to {args.results_file}")
@@ -0,0 +1,100 @@
+import argparse
+import ast
+import os
+import sys
+
+
+# WebElement properties and methods that each cost one WebDriver HTTP round trip
+ELEMENT_CALLS = {'text', 'tag_name', 'get_attribute', 'get_dom_attribute', 'get_property', 'is_displayed',
+                 'is_enabled', 'is_selected', 'value_of_css_property', 'location', 'size', 'rect', 'accessible_name',
+                 'aria_role'}
+
+# Comment that accepts a loop as intentional, e.g. when it only runs after a failure
+ALLOW_PRAGMA = "lint: allow-chatty"
+
+# Directories never worth scanning
+SKIP_DIRS = {'.git', '__pycache__', 'venv', '.venv', 'node_modules'}
+
+
+def _loop_names(target):
+    """Names bound by a for-loop or comprehension target, e.g. idx and elem in enumerate()"""
+    return {node.id for node in ast.walk(target) if isinstance(node, ast.Name)}
+
+
+def _element_calls(body, names):
+    """Count the per-element WebDriver calls made on the loop variables inside a loop body"""
+    calls = []
+    for statement in body:
+        for node in ast.walk(statement):
+            if (isinstance(node, ast.Attribute) and node.attr in ELEMENT_CALLS
+                    and isinstance(node.value, ast.Name) and node.value.id in names):
+                calls.append(node.attr)
+    return calls
+
+
+def check_source(source, filename="<source>", threshold=1):
+    """Return (line, message) for each loop that reads element properties one element at a time"""
+    tree = ast.parse(source, filename)
+    lines = source.splitlines()
+    findings = []
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.For, ast.AsyncFor)):
+            loops = [(node.lineno, node.target, node.body)]
+        elif isinstance(node, (ast.ListComp, ast.SetComp, ast.GeneratorExp, ast.DictComp)):
+            element = [node.key, node.value] if isinstance(node, ast.DictComp) else [node.elt]
+            loops = [(node.lineno, generator.target, element + generator.ifs) for generator in node.generators]
+        else:
+            continue
+        for line, target, body in loops:
+            if ALLOW_PRAGMA in lines[line - 1]:
+                continue
+            calls = _element_calls(body, _loop_names(target))
+            if len(calls) >= threshold:
+                names = ", ".join(sorted(set(calls)))
+                findings.append((line, f"{len(calls)} WebDriver call(s) per element in a loop ({names}); "
+                                       f"use snapshot_elements() to read them in one round trip"))
+    return sorted(findings)
+
+
+def iter_python_files(paths):
+    """Yield every .py file under the given files and directories"""
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+            for name in sorted(files):
+                if name.endswith(".py"):
+                    yield os.path.join(root, name)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Flag test code that reads WebElement properties one element at a time inside a loop")
+    parser.add_argument("paths", nargs="*", default=["."], help="Files or directories to check (default: .)")
+    parser.add_argument("--threshold", type=int, default=1,
+                        help="Minimum per-element calls in one loop before it is reported (default: 1)")
+    args = parser.parse_args(argv)
+    
+    count = 0
+    for path in iter_python_files(args.paths):
+        with open(path, encoding="utf-8") as f:
+            source = f.read()
+        try:
+            findings = check_source(source, path, args.threshold)
+        except SyntaxError as e:
+            print(f"{path}:{e.lineno}: could not parse: {e.msg}")
+            count += 1
+            continue
+        for line, message in findings:
+            print(f"{path}:{line}: {message}")
+        count += len(findings)
+    
+    if count:
+        print(f"\n{count} chatty loop(s) found. Add '# {ALLOW_PRAGMA}' to a loop that is intentional.")
+    return 1 if count else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
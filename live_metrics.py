@@ -0,0 +1,298 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from performance_results import FAILED, SKIPPED
+from collections import deque
+import argparse
+import json
+import math
+import threading
+import time
+import urllib.request
+
+
+# Port of the local metrics endpoint when none is given
+DEFAULT_PORT = 9464
+# Cumulative bucket bounds (ms) for the Prometheus histogram; they line up with LatencyHistogram buckets
+PROMETHEUS_BUCKETS = [100, 250, 500, 1000, 2000, 3000, 5000, 8000, 13000, 20000, 30000, 60000]
+# Rolling p95 and throughput cover this many seconds, so a run that is getting slower shows it quickly
+ROLLING_WINDOW = 300
+
+
+class LatencyHistogram:
+    """HDR-style histogram: exact to 1 ms below 10**digits ms, then keeping `digits` significant digits
+    
+    Memory depends on the spread of the values, not on how many are recorded, so a multi-hour run keeps
+    full-resolution percentiles (within 1% at the default 3 digits) for every page.
+    """
+    
+    def __init__(self, significant_digits=3):
+        self.significant_digits = significant_digits
+        self.linear_limit = 10 ** significant_digits
+        self.counts = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+    
+    def _upper(self, value):
+        """Upper edge of the bucket holding value; buckets include their upper edge, like Prometheus' le"""
+        if value <= self.linear_limit:
+            return math.ceil(value)
+        width = 10 ** (math.floor(math.log10(value)) - self.significant_digits + 1)
+        return math.ceil(value / width) * width
+    
+    def record(self, value):
+        """Add one measurement in milliseconds"""
+        value = max(0.0, float(value))
+        upper = self._upper(value)
+        self.counts[upper] = self.counts.get(upper, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+    
+    def percentile(self, percentile):
+        """Highest value equivalent to the percentile (nearest rank), or None when nothing was recorded"""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(percentile / 100 * self.count))
+        seen = 0
+        for upper in sorted(self.counts):
+            seen += self.counts[upper]
+            if seen >= rank:
+                return min(upper, self.max)
+        return self.max
+    
+    def count_at_or_below(self, bound):
+        """Measurements in buckets whose upper edge is at or below bound (exact for bounds on bucket edges)"""
+        return sum(count for upper, count in self.counts.items() if upper <= bound)
+
+
+def _nearest_rank(values, percentile):
+    """Percentile of a small list of values by nearest rank"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percentile / 100 * len(ordered)) - 1)]
+
+
+def _by_key(mapping):
+    """Items of a dict keyed by tuples that may hold None, in a stable order"""
+    return sorted(mapping.items(), key=lambda item: [str(part) for part in item[0]])
+
+
+def _label(value):
+    """Escape a Prometheus label value"""
+    return str(value if value is not None else "").replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class LiveMetrics:
+    """In-process registry of page timings and failures for watching a run while it is in progress
+    
+    OncorePage feeds it every row it records. serve() exposes the registry on a local port: /metrics in
+    Prometheus text format and /snapshot as JSON for the terminal dashboard (python live_metrics.py).
+    """
+    
+    def __init__(self, window=ROLLING_WINDOW):
+        self.window = window
+        self.started = time.monotonic()
+        # (environment, page, transition) -> LatencyHistogram for the whole run
+        self.histograms = {}
+        # (environment, page, transition) -> deque of (monotonic time, ms) inside the rolling window
+        self.recent = {}
+        # (environment, page, status) -> failed or skipped steps
+        self.failures = {}
+        self._lock = threading.Lock()
+        self._server = None
+    
+    def _trim(self, recent, now):
+        """Drop measurements that have left the rolling window"""
+        while recent and recent[0][0] < now - self.window:
+            recent.popleft()
+    
+    def observe(self, row):
+        """Count one results row: a timing for measured steps, a failure for failed or skipped ones"""
+        status = row.get('status')
+        with self._lock:
+            if status in (FAILED, SKIPPED):
+                key = (row.get('environment'), row.get('page'), status)
+                self.failures[key] = self.failures.get(key, 0) + 1
+                return
+            if row.get('load_time_ms') is None:
+                return
+            key = (row.get('environment'), row.get('page'), row.get('transition'))
+            if key not in self.histograms:
+                self.histograms[key] = LatencyHistogram()
+                self.recent[key] = deque()
+            now = time.monotonic()
+            self.histograms[key].record(row['load_time_ms'])
+            self.recent[key].append((now, row['load_time_ms']))
+            self._trim(self.recent[key], now)
+    
+    def snapshot(self):
+        """Per-page counts, percentiles and failures, plus run totals, as plain data"""
+        now = time.monotonic()
+        uptime = now - self.started
+        # Throughput over the window, or over the run while it is younger than the window (at least 10 s)
+        span_minutes = max(min(uptime, self.window), 10) / 60
+        with self._lock:
+            failures = {}
+            for (environment, page, _), count in self.failures.items():
+                failures[(environment, page)] = failures.get((environment, page), 0) + count
+            pages = []
+            for key, histogram in _by_key(self.histograms):
+                environment, page, transition = key
+                self._trim(self.recent[key], now)
+                recent = [value for _, value in self.recent[key]]
+                pages.append({
+                    'environment': environment,
+                    'page': page,
+                    'transition': transition,
+                    'count': histogram.count,
+                    'p50_ms': histogram.percentile(50),
+                    'p95_ms': histogram.percentile(95),
+                    'p99_ms': histogram.percentile(99),
+                    'max_ms': histogram.max,
+                    'rolling_count': len(recent),
+                    'rolling_p95_ms': _nearest_rank(recent, 95),
+                    'failures': failures.get((environment, page), 0)
+                })
+            # Pages that have only failed so far still belong on the dashboard
+            measured = {(environment, page) for environment, page, _ in self.histograms}
+            for (environment, page), count in _by_key(failures):
+                if (environment, page) not in measured:
+                    pages.append({'environment': environment, 'page': page, 'transition': None, 'count': 0,
+                                  'p50_ms': None, 'p95_ms': None, 'p99_ms': None, 'max_ms': None,
+                                  'rolling_count': 0, 'rolling_p95_ms': None, 'failures': count})
+            rolling = sum(len(recent) for recent in self.recent.values())
+            return {
+                'uptime_s': round(uptime, 1),
+                'window_s': self.window,
+                'measurements': sum(histogram.count for histogram in self.histograms.values()),
+                'failures': sum(self.failures.values()),
+                'per_minute': round(rolling / span_minutes, 2),
+                'pages': pages
+            }
+    
+    def prometheus(self):
+        """The registry in Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = [
+            "# HELP oncore_page_load_milliseconds Page load and transition times measured by the run",
+            "# TYPE oncore_page_load_milliseconds histogram"
+        ]
+        with self._lock:
+            for (environment, page, transition), histogram in _by_key(self.histograms):
+                labels = f'environment="{_label(environment)}",page="{_label(page)}",transition="{_label(transition)}"'
+                for bound in PROMETHEUS_BUCKETS:
+                    lines.append(f'oncore_page_load_milliseconds_bucket{{{labels},le="{bound}"}} '
+                                 f'{histogram.count_at_or_below(bound)}')
+                lines.append(f'oncore_page_load_milliseconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f"oncore_page_load_milliseconds_sum{{{labels}}} {round(histogram.total, 1)}")
+                lines.append(f"oncore_page_load_milliseconds_count{{{labels}}} {histogram.count}")
+            
+            lines.append("# HELP oncore_step_failures_total Steps recorded as failed or skipped")
+            lines.append("# TYPE oncore_step_failures_total counter")
+            for (environment, page, status), count in _by_key(self.failures):
+                lines.append(f'oncore_step_failures_total{{environment="{_label(environment)}",page="{_label(page)}",'
+                             f'status="{_label(status)}"}} {count}')
+        
+        lines.append(f"# HELP oncore_page_load_rolling_p95_milliseconds 95th percentile over the last {self.window}s")
+        lines.append("# TYPE oncore_page_load_rolling_p95_milliseconds gauge")
+        for page in snapshot['pages']:
+            if page['rolling_p95_ms'] is not None:
+                lines.append(f'oncore_page_load_rolling_p95_milliseconds{{environment="{_label(page["environment"])}",'
+                             f'page="{_label(page["page"])}",transition="{_label(page["transition"])}"}} '
+                             f"{page['rolling_p95_ms']}")
+        lines.append(f"# HELP oncore_measurements_per_minute Measurements per minute over the last {self.window}s")
+        lines.append("# TYPE oncore_measurements_per_minute gauge")
+        lines.append(f"oncore_measurements_per_minute {snapshot['per_minute']}")
+        return "\n".join(lines) + "\n"
+    
+    def serve(self, port=DEFAULT_PORT, host="127.0.0.1"):
+        """Serve /metrics and /snapshot from a background thread; returns the URL"""
+        registry = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith("/metrics"):
+                    body, content_type = registry.prometheus(), "text/plain; version=0.0.4; charset=utf-8"
+                elif self.path.startswith("/snapshot"):
+                    body, content_type = json.dumps(registry.snapshot()), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            
+            def log_message(self, format, *args):
+                # Scrapes every few seconds would drown out the test output
+                pass
+        
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="oncore-live-metrics", daemon=True).start()
+        url = f"http://{host}:{self._server.server_address[1]}"
+        print(f"Live metrics at {url}/metrics (dashboard: python live_metrics.py --url {url})")
+        return url
+    
+    def close(self):
+        """Stop serving"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def render_dashboard(snapshot):
+    """Text for one screen of the dashboard, slowest pages of the rolling window first"""
+    def cell(value):
+        return f"{value:,.0f}" if value is not None else "-"
+    
+    lines = [
+        f"OnCore run: {snapshot['uptime_s'] / 60:.1f} min, {snapshot['measurements']} measurement(s), "
+        f"{snapshot['per_minute']:.1f}/min over the last {snapshot['window_s']}s, {snapshot['failures']} failed/skipped",
+        "",
+        f"{'Page':<30}{'Transition':<12}{'n':>6}{'p50':>9}{'p95':>9}{'p95 now':>9}{'max':>9}{'fail':>6}"
+    ]
+    pages = sorted(snapshot['pages'], key=lambda page: -(page['rolling_p95_ms'] or page['p95_ms'] or 0))
+    for page in pages:
+        # Flag pages whose recent p95 is well above the run's, the sign of a run going bad
+        slower = (page['rolling_p95_ms'] is not None and page['p95_ms']
+                  and page['rolling_p95_ms'] > 1.25 * page['p95_ms'])
+        name = page['page'] if not page['environment'] else f"{page['page']} ({page['environment']})"
+        lines.append(f"{name[:29]:<30}{(page['transition'] or '-'):<12}{page['count']:>6}{cell(page['p50_ms']):>9}"
+                     f"{cell(page['p95_ms']):>9}{cell(page['rolling_p95_ms']):>9}{cell(page['max_ms']):>9}"
+                     f"{page['failures']:>6}{' slower' if slower else ''}")
+    return "\n".join(lines)
+
+
+def watch(url, interval=5, once=False):
+    """Redraw the dashboard from a run's /snapshot endpoint until interrupted"""
+    while True:
+        try:
+            with urllib.request.urlopen(f"{url.rstrip('/')}/snapshot", timeout=10) as response:
+                screen = render_dashboard(json.load(response))
+        except OSError as e:
+            screen = f"Waiting for {url}: {str(e)}"
+        if once:
+            print(screen)
+            return
+        # Clear the terminal and draw from the top
+        print("\033[H\033[2J" + screen, flush=True)
+        time.sleep(interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Terminal dashboard for a run started with --metrics-port")
+    parser.add_argument("--url", default=f"http://127.0.0.1:{DEFAULT_PORT}", help="Base URL of the run's metrics endpoint")
+    parser.add_argument("--interval", type=float, default=5, help="Seconds between refreshes")
+    parser.add_argument("--once", action="store_true", help="Print the dashboard once and exit")
+    args = parser.parse_args()
+    try:
+        watch(args.url, args.interval, args.once)
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,230 @@
+from oncore_performance_test_general import OncorePerformanceTestGeneral
+from driver_pool import DriverPool
+from performance_sink import close_all_sinks
+from run_config import RunConfig, add_run_arguments
+from arrival_scheduler import ArrivalProfile, ArrivalScheduler
+import argparse
+import threading
+import time
+
+
+class LoadDriver:
+    """Runs OnCore test methods as several concurrent virtual users, each with its own browser
+    
+    With an arrival_scheduler.ArrivalProfile the run is open-loop instead: iterations start on the
+    profile's schedule for the duration, and concurrency only caps how many run at once.
+    """
+    
+    def __init__(self, test_class, test_methods=("test_protocol_performance",), concurrency=1,
+                 ramp_up=0, duration=None, iterations=None, think_time=0, arrivals=None):
+        self.test_class = test_class
+        self.test_methods = list(test_methods)
+        self.concurrency = concurrency
+        self.ramp_up = ramp_up
+        self.duration = duration
+        self.iterations = iterations
+        self.think_time = think_time
+        self.arrivals = arrivals
+        self.stop_event = threading.Event()
+        self.results = []
+        self._results_lock = threading.Lock()
+        self._deadline = None
+    
+    def start_delay(self, worker_id):
+        """Seconds to wait before a worker starts, spreading workers linearly over the ramp-up"""
+        if self.concurrency <= 1 or not self.ramp_up:
+            return 0
+        return self.ramp_up * (worker_id - 1) / (self.concurrency - 1)
+    
+    def _should_continue(self, completed):
+        """Check whether a worker should start another iteration"""
+        if self.stop_event.is_set():
+            return False
+        if self.iterations is not None and completed >= self.iterations:
+            return False
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            return False
+        return True
+    
+    def _record(self, worker_id, iteration, method_name, status, elapsed, error=None):
+        """Keep a summary line for every iteration a worker runs"""
+        with self._results_lock:
+            self.results.append({
+                'worker_id': worker_id,
+                'iteration': iteration,
+                'test': method_name,
+                'status': status,
+                'elapsed_s': elapsed,
+                'error': error
+            })
+    
+    def run_iteration(self, worker_id, iteration, method_name, start_lag_ms=None):
+        """Run one test method in a fresh test instance tagged with the worker id"""
+        test_instance = self.test_class(method_name)
+        test_instance.worker_id = worker_id
+        test_instance.worker_count = self.concurrency
+        test_instance.current_iteration = iteration
+        test_instance.start_lag_ms = start_lag_ms
+        
+        started = time.monotonic()
+        try:
+            # A browser that cannot be started or borrowed fails this iteration, not the worker
+            test_instance.setUp()
+            getattr(test_instance, method_name)()
+            self._record(worker_id, iteration, method_name, "passed", time.monotonic() - started)
+            print(f"\n✓ Worker {worker_id} iteration {iteration} ({method_name}) completed successfully")
+        except Exception as e:
+            # Failed steps and logins (LoginError) only end this iteration
+            self._record(worker_id, iteration, method_name, "failed", time.monotonic() - started, str(e))
+            print(f"\n✗ Worker {worker_id} iteration {iteration} ({method_name}) failed: {str(e)}")
+        finally:
+            try:
+                test_instance.tearDown()
+            except Exception as e:
+                print(f"Worker {worker_id} could not release its browser: {str(e)}")
+    
+    def _worker(self, worker_id):
+        """Loop over iterations for a single virtual user until the run ends"""
+        if self.stop_event.wait(self.start_delay(worker_id)):
+            return
+        print(f"Worker {worker_id} started")
+        
+        completed = 0
+        while self._should_continue(completed):
+            completed += 1
+            for method_name in self.test_methods:
+                if self.stop_event.is_set():
+                    break
+                self.run_iteration(worker_id, completed, method_name)
+            
+            if self.think_time and self._should_continue(completed):
+                self.stop_event.wait(self.think_time)
+        
+        print(f"Worker {worker_id} finished after {completed} iteration(s)")
+    
+    def _run_arrival(self, slot, sequence, start_lag_ms):
+        """Run every test method for one scheduled arrival of an open-loop run"""
+        for method_name in self.test_methods:
+            if self.stop_event.is_set():
+                break
+            self.run_iteration(slot, sequence, method_name, start_lag_ms)
+    
+    def run(self):
+        """Start all workers and block until they finish or the run is interrupted"""
+        if self.arrivals is not None:
+            if self.duration is None:
+                raise ValueError("An open-loop run needs a duration")
+            ArrivalScheduler(self.arrivals, self.duration, self.concurrency, self._run_arrival,
+                             stop_event=self.stop_event).run()
+            self.print_summary()
+            return self.results
+        
+        if self.iterations is None and self.duration is None:
+            raise ValueError("Either iterations or duration must be set for a load run")
+        
+        print(f"Starting {self.concurrency} virtual user(s) with a {self.ramp_up}s ramp-up")
+        if self.duration is not None:
+            self._deadline = time.monotonic() + self.ramp_up + self.duration
+        
+        threads = []
+        for worker_id in range(1, self.concurrency + 1):
+            thread = threading.Thread(target=self._worker, args=(worker_id,), name=f"oncore-worker-{worker_id}")
+            thread.start()
+            threads.append(thread)
+        
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=1)
+        except KeyboardInterrupt:
+            print("\nLoad run interrupted, waiting for workers to finish their current iteration...")
+            self.stop_event.set()
+            for thread in threads:
+                thread.join()
+        
+        self.print_summary()
+        return self.results
+    
+    def print_summary(self):
+        """Print per-worker pass/fail counts for the run"""
+        print("\n======= Load Run Summary =======")
+        for worker_id in range(1, self.concurrency + 1):
+            rows = [r for r in self.results if r['worker_id'] == worker_id]
+            passed = sum(1 for r in rows if r['status'] == "passed")
+            print(f"Worker {worker_id}: {passed} passed, {len(rows) - passed} failed")
+
+
+def parse_args(argv=None):
+    """Parse command line options for a load run"""
+    parser = argparse.ArgumentParser(description="Run the OnCore performance test with concurrent virtual users")
+    add_run_arguments(parser)
+    parser.add_argument("--users", type=int, default=None, help="Number of concurrent virtual users (default: 2)")
+    parser.add_argument("--ramp-up", type=float, default=None, help="Seconds over which the users are started")
+    parser.add_argument("--duration", type=float, default=None,
+                        help="Seconds to keep running after ramp-up (default: run a fixed number of iterations)")
+    parser.add_argument("--think-time", type=float, default=None, help="Seconds each user pauses between iterations")
+    parser.add_argument("--arrivals", default=None,
+                        help="Start iterations open-loop on a schedule instead, e.g. poisson:6 (per minute), "
+                             "constant:4, step:2,4,8:300 or spike:2:20:600:60; --users caps how many run at once")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    
+    test_class = OncorePerformanceTestGeneral
+    test_class.run_config = RunConfig.load_settings(args=args)
+    test_class.setUpClass()
+    config = test_class.run_config
+    
+    methods = ["test_protocol_performance"]
+    if config.admin:
+        methods.append("test_admin_performance")
+    
+    # Flags override the config file's load section, which overrides the defaults
+    load = {name: value for name, value in config.load.items() if value is not None}
+    for name in ["users", "ramp_up", "duration", "think_time", "arrivals"]:
+        if getattr(args, name) is not None:
+            load[name] = getattr(args, name)
+    users = int(load.get("users", 2))
+    duration = float(load["duration"]) if load.get("duration") is not None else None
+    iterations = None if duration is not None and args.iterations is None else test_class.iterations
+    arrivals = ArrivalProfile(load["arrivals"]) if load.get("arrivals") else None
+    if arrivals is not None and duration is None:
+        raise SystemExit("--arrivals needs --duration (or load.duration) to know when to stop")
+    
+    # One pooled session per virtual user and lane
+    test_class.driver_pool = DriverPool(size=users * test_class.lanes, mode=test_class.browser_mode, origins=[test_class.base_url],
+                                        driver_factory=test_class.driver_factory())
+    
+    cases = config.cases()
+    try:
+        for case_number, case in enumerate(cases, 1):
+            print(f"\n======= Case {case_number} of {len(cases)} =======\n")
+            test_class.use_case(case)
+            driver = LoadDriver(
+                test_class,
+                test_methods=methods,
+                concurrency=users,
+                ramp_up=float(load.get("ramp_up", 0)),
+                duration=duration,
+                iterations=iterations,
+                think_time=float(load.get("think_time", 0)),
+                arrivals=arrivals
+            )
+            driver.run()
+            if driver.stop_event.is_set():
+                break
+    finally:
+        test_class.driver_pool.close()
+        close_all_sinks()
+        if test_class.results_store is not None:
+            test_class.results_store.close()
+        if test_class.screenshots is not None:
+            test_class.screenshots.close()
+        if test_class.live_metrics is not None:
+            test_class.live_metrics.close()
+        if test_class.session_cache is not None:
+            cache = test_class.session_cache
+            print(f"Logged in {cache.logins} time(s) and reused the session {cache.reuses} time(s)")
+    print("\nLoad run complete.")
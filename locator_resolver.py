@@ -0,0 +1,103 @@
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from readiness import locator_to_query
+import threading
+import time
+
+
+# Tries every strategy in order inside the page and returns the first usable element, so a lookup
+# costs one round trip per poll instead of find_elements plus attribute reads for every candidate.
+# arguments[0] is a list of [kind, query] pairs; arguments[1] requires the element to be interactable.
+RESOLVE_JS = """
+var queries = arguments[0], interactable = arguments[1];
+function usable(element) {
+    if (!interactable) {
+        return true;
+    }
+    if (element.getClientRects().length === 0 || element.disabled) {
+        return false;
+    }
+    var style = window.getComputedStyle(element);
+    return style.visibility !== 'hidden' && style.pointerEvents !== 'none';
+}
+for (var i = 0; i < queries.length; i++) {
+    var kind = queries[i][0], value = queries[i][1], nodes = [];
+    try {
+        if (kind === 'xpath') {
+            var result = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (var j = 0; j < result.snapshotLength; j++) {
+                nodes.push(result.snapshotItem(j));
+            }
+        } else {
+            nodes = Array.prototype.slice.call(document.querySelectorAll(value));
+        }
+    } catch (e) {
+        continue;
+    }
+    for (var k = 0; k < nodes.length; k++) {
+        if (nodes[k].nodeType === 1 && usable(nodes[k])) {
+            return {index: i, element: nodes[k], matches: nodes.length, html: nodes[k].outerHTML.slice(0, 200)};
+        }
+    }
+}
+return null;
+"""
+
+
+class LocatorResolver:
+    """Finds an element with the first of several locator strategies that matches, one script call per poll"""
+    
+    # Winning strategy per (environment, lookup), shared by every page object in the process
+    _winners = {}
+    _winners_lock = threading.Lock()
+    
+    def __init__(self, driver, environment=None, timeout=10, poll_interval=0.2):
+        self.driver = driver
+        self.environment = environment
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+    
+    def _ordered(self, name, strategies):
+        """Put the strategy that won last time for this environment and lookup first"""
+        with self._winners_lock:
+            winner = self._winners.get((self.environment, name))
+        ordered = [s for s in strategies if s[0] == winner] + [s for s in strategies if s[0] != winner]
+        return ordered, winner
+    
+    def resolve(self, name, strategies, timeout=None, interactable=True):
+        """Return the element found by the first matching strategy
+        
+        strategies is a list of (description, (By, value)) pairs in order of preference. All of them
+        are evaluated together until one matches or the timeout (shared, not per strategy) runs out.
+        """
+        ordered, winner = self._ordered(name, strategies)
+        queries = [list(locator_to_query(locator)) for _, locator in ordered]
+        timeout = self.timeout if timeout is None else timeout
+        
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                match = self.driver.execute_script(RESOLVE_JS, queries, interactable)
+            except WebDriverException:
+                # The document is being replaced; try again on the next poll
+                match = None
+            if match:
+                description = ordered[match['index']][0]
+                with self._winners_lock:
+                    self._winners[(self.environment, name)] = description
+                cached = " (cached strategy)" if description == winner else ""
+                print(f"Found {name} using strategy: {description}{cached}, {match['matches']} match(es)")
+                print(f"- HTML: {match['html']}")
+                return match['element']
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(self.poll_interval)
+        
+        raise NoSuchElementException(f"Could not find {name} with any of {len(strategies)} strategies within {timeout}s")
+    
+    @classmethod
+    def forget(cls, environment=None):
+        """Drop remembered strategies, for one environment or all of them"""
+        with cls._winners_lock:
+            for key in list(cls._winners):
+                if environment is None or key[0] == environment:
+                    del cls._winners[key]
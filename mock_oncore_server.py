@@ -0,0 +1,455 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from html import escape
+import argparse
+import random
+import secrets
+import threading
+import time
+
+
+# Shared page script with the OnCore functions the tests call. Tabs and dialogs load their
+# content with XHR so soft transitions and readiness waits behave as they do on OnCore.
+ONCORE_JS = """
+function loadFragment(name, target, params) {
+    var xhr = new XMLHttpRequest();
+    xhr.open('GET', '/smrs/fragment?name=' + encodeURIComponent(name) + (params || ''));
+    xhr.onload = function () {
+        var element = document.getElementById(target);
+        element.innerHTML = xhr.responseText;
+        element.style.display = 'block';
+    };
+    xhr.send();
+}
+function setActiveTab(name, label) { loadFragment(name, 'content'); }
+function setTab(name, label) { loadFragment(name, 'content'); }
+function toInvoicableItems() { loadFragment('INVOICABLE_ITEMS', 'content'); }
+function toProcedureNotes(id) { loadFragment('PROCEDURE_NOTES', 'dialog', '&id=' + id); }
+function toProcedureDetails(id) { loadFragment('PROCEDURE_DETAILS', 'dialog', '&id=' + id); }
+function selectArm(select) { loadFragment('ARM_GRID', 'content', '&arm=' + encodeURIComponent(select.value)); }
+function closeDialog() {
+    var dialog = document.getElementById('dialog');
+    dialog.style.display = 'none';
+    dialog.innerHTML = '';
+}
+"""
+
+# Routes with their own latency setting; anything not listed uses the default distribution
+ROUTES = ['login', 'home', 'protocol', 'cra', 'subject', 'coverage', 'procedures', 'billing_grid',
+          'financials', 'setup', 'visits', 'admin', 'fragment', 'static']
+
+DEFAULT_LATENCY = 'lognormal:150:0.4'
+DEFAULT_STATIC_LATENCY = 'fixed:5'
+
+
+class LatencyDistribution:
+    """Server think time in milliseconds, e.g. 'fixed:100', 'uniform:50:300', 'normal:200:40',
+    'lognormal:150:0.4' (median and sigma) or 'exp:120' (mean)"""
+    
+    def __init__(self, spec, rng=None):
+        self.spec = spec
+        self.rng = rng or random.Random()
+        kind, _, args = spec.partition(":")
+        self.kind = kind.strip().lower()
+        try:
+            self.args = [float(value) for value in args.split(":")] if args else []
+        except ValueError:
+            raise ValueError(f"Invalid latency '{spec}'")
+        expected = {'fixed': 1, 'uniform': 2, 'normal': 2, 'lognormal': 2, 'exp': 1}
+        if expected.get(self.kind) != len(self.args):
+            raise ValueError(f"Invalid latency '{spec}'; use fixed:MS, uniform:LO:HI, normal:MEAN:SD, "
+                             "lognormal:MEDIAN:SIGMA or exp:MEAN")
+    
+    def sample(self):
+        """Draw one latency in milliseconds"""
+        if self.kind == 'fixed':
+            value = self.args[0]
+        elif self.kind == 'uniform':
+            value = self.rng.uniform(*self.args)
+        elif self.kind == 'normal':
+            value = self.rng.gauss(*self.args)
+        elif self.kind == 'lognormal':
+            median, sigma = self.args
+            value = median * self.rng.lognormvariate(0, sigma)
+        else:
+            value = self.rng.expovariate(1 / self.args[0]) if self.args[0] > 0 else 0
+        return max(0.0, value)
+
+
+class MockOncoreHandler(BaseHTTPRequestHandler):
+    """Serves the OnCore pages, tabs and dialogs used by OncorePerformanceTestGeneral"""
+    
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, format, *args):
+        """Only log requests when the server runs with --verbose"""
+        if self.server.verbose:
+            super().log_message(format, *args)
+    
+    def _session(self):
+        """Return the signed-in username for the request's session cookie, if it is still valid"""
+        for part in self.headers.get("Cookie", "").split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == "JSESSIONID":
+                return self.server.session_user(value)
+        return None
+    
+    def _send(self, route, body, status=200, content_type="text/html; charset=utf-8", headers=None):
+        """Sleep for the route's latency, then send the response"""
+        self.server.delay(route)
+        data = body.encode("utf-8") if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(data)
+    
+    def _redirect(self, route, location, headers=None):
+        """Send a 302 to another path on the mock server"""
+        headers = dict(headers or {})
+        headers["Location"] = location
+        self._send(route, "", status=302, headers=headers)
+    
+    def _page(self, route, title, body):
+        """Wrap page content with the shared script, the configured resources and padding"""
+        resources = []
+        for i in range(self.server.resources):
+            if i % 2:
+                resources.append(f'<link rel="stylesheet" href="/static/res{i}.css">')
+            else:
+                resources.append(f'<script src="/static/res{i}.js"></script>')
+        padding = "x" * (self.server.page_kb * 1024)
+        html = f"""<!DOCTYPE html>
+<html><head><title>{escape(title)} - OnCore</title>
+<script src="/static/oncore.js"></script>
+{''.join(resources)}
+</head><body>
+<h1>{escape(title)}</h1>
+{body}
+<div id="dialog" style="display:none"></div>
+<div style="display:none">{padding}</div>
+</body></html>"""
+        self._send(route, html)
+    
+    def _read_form(self):
+        """Parse a urlencoded POST body"""
+        length = int(self.headers.get("Content-Length") or 0)
+        data = self.rfile.read(length).decode("utf-8") if length else ""
+        return {name: values[0] for name, values in parse_qs(data).items()}
+    
+    def do_HEAD(self):
+        """Answer HEAD like GET without the body"""
+        self.do_GET()
+    
+    def do_GET(self):
+        """Route page, tab, dialog and resource requests; anything under /smrs needs a session"""
+        url = urlparse(self.path)
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        path = url.path
+        
+        if path.startswith("/static/"):
+            return self._static(path)
+        if path in ("/login", "/login/"):
+            return self._login_form()
+        if path == "/":
+            return self._redirect("home", "/smrs/SMRSHomePageServlet?hdn_function=WELCOME" if self._session() else "/login")
+        if self._session() is None:
+            return self._redirect("login", "/login")
+        
+        function = query.get("hdn_function", "")
+        if path == "/smrs/SMRSHomePageServlet":
+            return self._page("home", "Home", '<p>Welcome to OnCore</p><a href="/smrs/SMRSControlServlet?hdn_function=CRA_CONSOLE">CRA Console</a>')
+        if path == "/smrs/PRControlServlet":
+            return self._protocol(query)
+        if path == "/smrs/SMRSControlServlet" and function == "CRA_CONSOLE":
+            return self._cra_console()
+        if path == "/smrs/SMRSControlServlet" and function == "PROTOCOL_BUDGET":
+            return self._page("financials", "Financials Console", self._tabs(
+                [("setActiveTab('PROCEDURE', 'Procedure/Lab')", "Subject Related"),
+                 ("toInvoicableItems()", "Invoicable Items")]))
+        if path == "/smrs/SMRSControlServlet" and function == "STUDY_SETUP":
+            return self._specifications()
+        if path == "/smrs/SubjectVisit":
+            return self._page("subject", f"Subject {query.get('mrn', '')}", self._tabs(
+                [("setActiveTab('SUBJECT_CALENDAR')", "Calendar"), ("setActiveTab('SUBJECT_ONSTUDY')", "On Study")]))
+        if path == "/smrs/coverageAnalysisConsole/protocolSummary/details.do":
+            return self._page("coverage", "Coverage Analysis Summary", self._table("Summary", 20))
+        if path == "/smrs/coverageAnalysisConsole/procedures/all.do":
+            return self._page("procedures", "Procedures", self._procedures("toProcedureNotes"))
+        if path == "/smrs/coverageAnalysisConsole/billingGrid/display.do":
+            return self._page("billing_grid", "Billing Grid", self._table("Billing", 60))
+        if path.startswith("/smrs/rpeAdministration/"):
+            return self._page("admin", "RPE Administration", self._table("Protocol", 40))
+        if path == "/smrs/visits.do":
+            return self._page("visits", "Visits", '<form method="POST" action="/smrs/visits.do">'
+                              '<input type="text" name="visit_note" value="">'
+                              '<input type="submit" name="submit1" value="Submit"></form>')
+        if path == "/smrs/fragment":
+            return self._fragment(query)
+        self._send("default", "Not found", status=404, content_type="text/plain")
+    
+    def do_POST(self):
+        """Handle the sign-in steps and the Visits form"""
+        path = urlparse(self.path).path
+        form = self._read_form()
+        if path == "/login":
+            return self._login(form)
+        if self._session() is None:
+            return self._redirect("login", "/login")
+        if path == "/smrs/visits.do":
+            return self._page("visits", "Visits", "<p>Visit saved</p>")
+        self._send("default", "Not found", status=404, content_type="text/plain")
+    
+    def _login_form(self):
+        """First sign-in step: the username form"""
+        self._page("login", "Sign In", '<form method="POST" action="/login">'
+                   '<input type="text" id="username" name="username">'
+                   '<button type="submit" id="submitBtn">Next</button></form>')
+    
+    def _login(self, form):
+        """Two-step sign-in: the username step shows the password form, the password step signs in"""
+        username = form.get("username", "")
+        if "password" not in form:
+            return self._page("login", "Sign In", '<form method="POST" action="/login">'
+                              f'<input type="hidden" name="username" value="{escape(username)}">'
+                              '<input type="password" id="password" name="password">'
+                              '<button type="submit" name="submitBtn">Log In</button></form>')
+        if not username or not self.server.check_password(form["password"]):
+            return self._page("login", "Sign In", '<p class="error">Invalid username or password</p>'
+                              '<form method="POST" action="/login"><input type="text" id="username" name="username">'
+                              '<button type="submit" id="submitBtn">Next</button></form>')
+        token = self.server.new_session(username)
+        self._redirect("login", "/smrs/SMRSHomePageServlet?hdn_function=WELCOME",
+                       headers={"Set-Cookie": f"JSESSIONID={token}; Path=/; HttpOnly"})
+    
+    def _tabs(self, tabs):
+        """Tab links that call OnCore's JavaScript, followed by the tab content area"""
+        links = "".join(f'<tr><td class="oMTab"><a href="javascript:{script}">{escape(label)}</a></td></tr>'
+                        for script, label in tabs)
+        return f'<table id="tabs">{links}</table><div id="content">{self._table("Details", 10)}</div>'
+    
+    def _table(self, title, rows):
+        """A data table like OnCore's report grids"""
+        cells = "".join(f"<tr><td>{escape(title)} {i}</td><td>{i * 7 % 13}</td><td>Value {i}</td></tr>" for i in range(rows))
+        return f'<table class="report">{cells}</table>'
+    
+    def _protocol(self, query):
+        """Protocol page with the Management, Staff, Reviews and Annotations tabs"""
+        protocol_no = query.get("protocol_no", "")
+        return self._page("protocol", f"Protocol {protocol_no}", self._tabs(
+            [("setActiveTab('PROTOCOL_DETAILS')", "Management"), ("setActiveTab('PROTOCOL_STAFF')", "Staff"),
+             ("setActiveTab('PROTOCOL_REVIEWS')", "Reviews"), ("setActiveTab('ANNOTATION_INQUIRY')", "Annotations")]))
+    
+    def _cra_console(self):
+        """CRA Console with a subject list and the SAE and Deviations tabs"""
+        rows = "".join(f'<tr><td value="{escape(mrn)}"><a href="/smrs/SubjectVisit?mrn={escape(mrn)}">{escape(mrn)}</a></td>'
+                       f'<td>Subject {i + 1}</td></tr>' for i, mrn in enumerate(self.server.subjects))
+        tabs = self._tabs([("setTab('TOXICITIES', 'TOXICITIES')", "SAEs"), ("setTab('DEVIATIONS', 'DEVIATIONS')", "Deviations")])
+        return self._page("cra", "CRA Console", f'<table id="subjects">{rows}</table>{tabs}')
+    
+    def _procedures(self, function):
+        """Procedure grid with a Physical Exam link that opens a dialog through the given function"""
+        names = ["Blood Draw", "Physical Exam", "ECG", "CT Scan", "Vital Signs"]
+        rows = "".join(f'<tr><th class="report-field-data" style="width: 200px">'
+                       f'<input type="hidden" name="ordered_procedure" value="{i}">'
+                       f'<a href="javascript:{function}({i})">{name}</a></th><td>Covered</td></tr>'
+                       for i, name in enumerate(names))
+        return f'<table class="procedures">{rows}</table>'
+    
+    def _specifications(self):
+        """Specifications page with the arm selector and a procedure grid"""
+        options = "".join(f'<option value="{escape(arm)}">{escape(arm)}</option>' for arm in self.server.arms)
+        return self._page("setup", "Specifications",
+                          f'<select id="arm_selector" onchange="selectArm(this)"><option value="">Select an arm</option>{options}</select>'
+                          f'<div id="content">{self._procedures("toProcedureDetails")}</div>')
+    
+    def _fragment(self, query):
+        """Content loaded by tabs and dialogs"""
+        name = query.get("name", "")
+        if name == "PROCEDURE":
+            body = self._procedures("toProcedureDetails")
+        elif name == "ARM_GRID":
+            body = f"<p>Arm {escape(query.get('arm', ''))}</p>" + self._procedures("toProcedureDetails")
+        elif name in ("PROCEDURE_NOTES", "PROCEDURE_DETAILS"):
+            body = (f"<h2>Procedure {escape(query.get('id', ''))}</h2>{self._table('Note', 8)}"
+                    '<a href="/smrs/visits.do" target="_blank">Visits</a> '
+                    '<a href="javascript:closeDialog()">Close</a> '
+                    '<input type="button" name="close" value="Close" onclick="closeDialog()">')
+        else:
+            body = f"<h2>{escape(name)}</h2>{self._table(name.title(), 25)}"
+        self._send("fragment", body)
+    
+    def _static(self, path):
+        """The shared script and the padded resources each page references"""
+        name = path.rsplit("/", 1)[-1]
+        cache = "max-age=3600" if self.server.cacheable else "no-store"
+        if name == "oncore.js":
+            return self._send("static", ONCORE_JS, content_type="application/javascript", headers={"Cache-Control": cache})
+        padding = "x" * (self.server.resource_kb * 1024)
+        if name.endswith(".js"):
+            return self._send("static", f"/* {padding} */", content_type="application/javascript",
+                              headers={"Cache-Control": cache})
+        if name.endswith(".css"):
+            return self._send("static", f"/* {padding} */", content_type="text/css", headers={"Cache-Control": cache})
+        self._send("static", "Not found", status=404, content_type="text/plain")
+
+
+class MockOncoreServer(ThreadingHTTPServer):
+    """Local stand-in for OnCore with configurable latency and page weight"""
+    
+    daemon_threads = True
+    
+    def __init__(self, host="localhost", port=8765, latency=DEFAULT_LATENCY, route_latency=None,
+                 page_kb=50, resources=6, resource_kb=20, cacheable=True, subjects=("MOCK001",),
+                 arms=("BLD", "ARM A"), password=None, session_ttl=1800, seed=None, verbose=False):
+        super().__init__((host, port), MockOncoreHandler)
+        self.host = host
+        self.page_kb = page_kb
+        self.resources = resources
+        self.resource_kb = resource_kb
+        self.cacheable = cacheable
+        self.subjects = list(subjects)
+        self.arms = list(arms)
+        self.password = password
+        self.session_ttl = session_ttl
+        self.verbose = verbose
+        
+        rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.default_latency = LatencyDistribution(latency, rng)
+        self.route_latency = {'static': LatencyDistribution(DEFAULT_STATIC_LATENCY, rng)}
+        for route, spec in (route_latency or {}).items():
+            if route not in ROUTES:
+                raise ValueError(f"Unknown route '{route}'; routes are {', '.join(ROUTES)}")
+            self.route_latency[route] = LatencyDistribution(spec, rng)
+        
+        self._sessions = {}
+        self._sessions_lock = threading.Lock()
+        self.requests = {}
+        self._thread = None
+    
+    @property
+    def url(self):
+        """Base URL to use as the OnCore environment"""
+        # Keep the host name given so results are tagged with a readable environment
+        return f"http://{self.host}:{self.server_address[1]}"
+    
+    def delay(self, route):
+        """Sleep for a latency drawn from the route's distribution and count the request"""
+        distribution = self.route_latency.get(route, self.default_latency)
+        with self._rng_lock:
+            latency = distribution.sample()
+            stats = self.requests.setdefault(route, {'count': 0, 'latency_ms': 0.0})
+            stats['count'] += 1
+            stats['latency_ms'] += latency
+        time.sleep(latency / 1000)
+    
+    def expected_latency(self, route):
+        """Configured latency of a route when it is fixed, otherwise None"""
+        distribution = self.route_latency.get(route, self.default_latency)
+        return distribution.args[0] if distribution.kind == 'fixed' else None
+    
+    def check_password(self, password):
+        """Accept any password unless one was configured"""
+        return self.password is None or password == self.password
+    
+    def new_session(self, username):
+        """Start a session that expires after session_ttl seconds"""
+        token = secrets.token_hex(16)
+        with self._sessions_lock:
+            self._sessions[token] = (username, time.monotonic() + self.session_ttl)
+        return token
+    
+    def session_user(self, token):
+        """Return the username of a live session, dropping it once expired"""
+        with self._sessions_lock:
+            session = self._sessions.get(token)
+            if session is None or time.monotonic() > session[1]:
+                self._sessions.pop(token, None)
+                return None
+            return session[0]
+    
+    def expire_sessions(self):
+        """Sign everyone out, e.g. to exercise session re-authentication"""
+        with self._sessions_lock:
+            self._sessions.clear()
+    
+    def start(self):
+        """Serve from a background thread; returns the server so it can be used inline"""
+        self._thread = threading.Thread(target=self.serve_forever, name="mock-oncore-server", daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        """Stop serving and close the socket"""
+        self.shutdown()
+        self.server_close()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def add_server_arguments(parser):
+    """Flags that configure the mock server, shared with the harness benchmark"""
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", default=DEFAULT_LATENCY,
+                        help="Default server latency, e.g. fixed:100, uniform:50:300, lognormal:150:0.4, exp:120")
+    parser.add_argument("--route-latency", action="append", default=[], metavar="ROUTE=SPEC",
+                        help=f"Latency for one route ({', '.join(ROUTES)}); repeatable")
+    parser.add_argument("--page-kb", type=int, default=50, help="Padding added to every page, in KB")
+    parser.add_argument("--resources", type=int, default=6, help="Scripts/stylesheets referenced by every page")
+    parser.add_argument("--resource-kb", type=int, default=20, help="Size of each resource, in KB")
+    parser.add_argument("--no-cache", action="store_true", help="Serve resources with Cache-Control: no-store")
+    parser.add_argument("--subjects", default="MOCK001", help="Comma separated subject MRNs on the CRA Console")
+    parser.add_argument("--arms", default="BLD,ARM A", help="Comma separated arms in the arm selector")
+    parser.add_argument("--password", default=None, help="Password to accept (default: any)")
+    parser.add_argument("--session-ttl", type=float, default=1800, help="Seconds before a session expires")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for repeatable latencies")
+    return parser
+
+
+def server_from_args(args, verbose=False):
+    """Create (but do not start) a server from parsed add_server_arguments flags"""
+    route_latency = {}
+    for item in args.route_latency:
+        route, _, spec = item.partition("=")
+        route_latency[route.strip()] = spec.strip()
+    return MockOncoreServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        route_latency=route_latency,
+        page_kb=args.page_kb,
+        resources=args.resources,
+        resource_kb=args.resource_kb,
+        cacheable=not args.no_cache,
+        subjects=[s.strip() for s in args.subjects.split(",") if s.strip()],
+        arms=[a.strip() for a in args.arms.split(",") if a.strip()],
+        password=args.password,
+        session_ttl=args.session_ttl,
+        seed=args.seed,
+        verbose=verbose
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the OnCore pages used by the tests")
+    add_server_arguments(parser)
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+    
+    server = server_from_args(args, verbose=args.verbose)
+    print(f"Mock OnCore serving on {server.url} (subjects: {', '.join(server.subjects)}; arms: {', '.join(server.arms)})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping mock OnCore server.")
+    finally:
+        server.server_close()
@@ -0,0 +1,76 @@
+# JavaScript used by OncorePage to time page loads and in-page transitions
+
+# Transition types recorded with every measurement
+NAVIGATION = "navigation"
+SOFT = "soft"
+# Plain HTTP request timed by http_probe.py, without a browser
+PROBE = "probe"
+
+# The document's full PerformanceNavigationTiming entry
+NAVIGATION_TIMING_JS = """
+var entry = window.performance.getEntriesByType('navigation')[0];
+return entry ? entry.toJSON() : null;
+"""
+
+# Marks the start of an action and watches the DOM so the end can be found once it settles.
+# A beforeunload flags that the action started a real navigation instead. Web Vitals for the
+# step (web_vitals.py) are counted from here. The resource buffer (250 entries by default) is
+# raised, as resource_waterfall.py does, so a long-lived page keeps recording the step's requests.
+START_TRANSITION_JS = """
+var name = arguments[0];
+if (window.__oncoreVitals) {
+    window.__oncoreVitals.stepStart = performance.now();
+}
+if (window.__oncoreTransition && window.__oncoreTransition.observer) {
+    window.__oncoreTransition.observer.disconnect();
+}
+var transition = window.__oncoreTransition = {
+    name: name,
+    start: performance.now(),
+    lastMutation: null,
+    unloading: false
+};
+performance.setResourceTimingBufferSize(1000);
+transition.observer = new MutationObserver(function () {
+    transition.lastMutation = performance.now();
+});
+transition.observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+window.addEventListener('beforeunload', function () { transition.unloading = true; });
+performance.mark('oncore:' + name + ':start');
+"""
+
+# Reports whether the transition has settled: no DOM mutations, new resources or pending
+# XHR/fetch for the quiet window. On settle the end is marked and a performance.measure recorded.
+SETTLE_TRANSITION_JS = """
+var quietMs = arguments[0];
+var transition = window.__oncoreTransition;
+if (!transition) {
+    return {type: 'navigation'};
+}
+if (transition.unloading) {
+    return {type: 'pending'};
+}
+
+var end = transition.lastMutation || transition.start;
+// Requests are picked by start time, not buffer position, so a full or cleared buffer cannot hide them
+var resources = performance.getEntriesByType('resource');
+for (var i = 0; i < resources.length; i++) {
+    if (resources[i].startTime >= transition.start) {
+        end = Math.max(end, resources[i].responseEnd);
+    }
+}
+var readiness = window.__oncoreReadiness;
+var pending = readiness ? readiness.pending : 0;
+var now = performance.now();
+if (pending > 0 || now - end < quietMs) {
+    return {type: 'pending'};
+}
+
+transition.observer.disconnect();
+window.__oncoreTransition = null;
+var startMark = 'oncore:' + transition.name + ':start';
+var endMark = 'oncore:' + transition.name + ':end';
+performance.mark(endMark, {startTime: end});
+performance.measure(transition.name, startMark, endMark);
+return {type: 'soft', duration: end - transition.start};
+"""
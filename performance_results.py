@@ -0,0 +1,154 @@
+from datetime import datetime
+from urllib.parse import urlparse
+import csv
+import os
+
+
+# Navigation Timing phases stored for every navigation, in milliseconds
+NAVIGATION_TIMING_FIELDS = [
+    'redirect_ms',
+    'dns_ms',
+    'connect_ms',
+    'tls_ms',
+    'request_ms',
+    'response_ms',
+    'dom_interactive_ms',
+    'dom_content_loaded_ms',
+    'load_event_end_ms'
+]
+
+# Chrome Performance.getMetrics values for each measured step (cdp_metrics.py), when enabled
+CDP_METRIC_FIELDS = [
+    'js_heap_used_mb',
+    'script_ms',
+    'layout_ms',
+    'recalc_style_ms',
+    'task_ms'
+]
+
+# Core Web Vitals and long tasks for each measured step (web_vitals.py); CLS is a score, the rest milliseconds
+WEB_VITALS_FIELDS = [
+    'fcp_ms',
+    'lcp_ms',
+    'cls',
+    'tbt_ms',
+    'inp_ms',
+    'long_tasks'
+]
+
+# Outcome of a step in the status column; failed and skipped rows have no load time, and say why in error
+PASSED = "passed"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+# Longest error message kept in a results row
+MAX_ERROR_LENGTH = 300
+
+# Columns of a performance results file; older files only have the first four
+LEGACY_FIELDNAMES = ['timestamp', 'page', 'load_time_ms', 'iteration']
+FIELDNAMES = (LEGACY_FIELDNAMES + ['worker_id', 'transition'] + NAVIGATION_TIMING_FIELDS
+              + ['run_id', 'environment', 'browser_profile'] + CDP_METRIC_FIELDS + ['trace_file']
+              + WEB_VITALS_FIELDS + ['status_code', 'response_bytes', 'start_lag_ms', 'popup_open_ms', 'status', 'error'])
+
+# Columns converted to numbers when reading results back
+INTEGER_FIELDS = ['iteration', 'worker_id', 'long_tasks', 'status_code', 'response_bytes']
+FLOAT_FIELDS = (['load_time_ms', 'start_lag_ms', 'popup_open_ms'] + NAVIGATION_TIMING_FIELDS + CDP_METRIC_FIELDS
+                + [name for name in WEB_VITALS_FIELDS if name not in INTEGER_FIELDS])
+
+
+def new_run_id():
+    """Identify one invocation of the test so its rows can be told apart in long-running history"""
+    return f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+
+
+def error_summary(error):
+    """First line of an exception's message (WebDriver messages go on to a stack trace), for the error column"""
+    lines = str(error).strip().splitlines()
+    message = lines[0] if lines else ""
+    if message.startswith("Message:"):
+        message = message[len("Message:"):]
+    return (message.strip() or type(error).__name__)[:MAX_ERROR_LENGTH]
+
+
+def environment_name(base_url):
+    """Short environment name for an OnCore URL, e.g. 'crmsdev' for https://crmsdev.mednet.ucla.edu"""
+    host = urlparse(base_url if "://" in base_url else "https://" + base_url).hostname or ""
+    return host.split(".")[0]
+
+
+def navigation_breakdown(entry):
+    """Split a PerformanceNavigationTiming entry into per-phase durations"""
+    if not entry:
+        return {name: None for name in NAVIGATION_TIMING_FIELDS}
+    
+    def span(start, end):
+        # Phases that did not happen (no redirect, reused connection) report zeros
+        if not entry.get(start) or not entry.get(end):
+            return 0
+        return entry[end] - entry[start]
+    
+    secure_start = entry.get('secureConnectionStart') or 0
+    return {
+        'redirect_ms': span('redirectStart', 'redirectEnd'),
+        'dns_ms': span('domainLookupStart', 'domainLookupEnd'),
+        'connect_ms': span('connectStart', 'connectEnd'),
+        'tls_ms': entry['connectEnd'] - secure_start if secure_start > 0 else 0,
+        'request_ms': span('requestStart', 'responseStart'),
+        'response_ms': span('responseStart', 'responseEnd'),
+        'dom_interactive_ms': entry.get('domInteractive'),
+        'dom_content_loaded_ms': entry.get('domContentLoadedEventEnd'),
+        'load_event_end_ms': entry.get('loadEventEnd')
+    }
+
+
+def upgrade_csv_header(filename, fieldnames=FIELDNAMES):
+    """Rewrite an older results file once so its header includes every column in fieldnames
+    
+    Columns only the old file has are kept after them. Returns the file's header, which rows appended
+    to it must follow.
+    """
+    with open(filename, newline='') as csvfile:
+        reader = csv.DictReader(csvfile)
+        if reader.fieldnames is None:
+            return list(fieldnames)
+        missing = [name for name in fieldnames if name not in reader.fieldnames]
+        if not missing:
+            return reader.fieldnames
+        header = list(fieldnames) + [name for name in reader.fieldnames if name not in fieldnames]
+        rows = list(reader)
+    
+    # Existing rows get empty values for the new columns; cells beyond the old header are dropped
+    with open(filename, 'w', newline='') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=header, restval='', extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Upgraded {filename} with new columns: {', '.join(missing)}")
+    return header
+
+
+def _convert(value, converter):
+    """Convert a CSV cell, treating empty cells as missing"""
+    if value is None or value == '':
+        return None
+    try:
+        return converter(value)
+    except ValueError:
+        return None
+
+
+def read_performance_csv(filename):
+    """Read a results CSV of any format into rows with every FIELDNAMES column present"""
+    rows = []
+    with open(filename, newline='') as csvfile:
+        reader = csv.DictReader(csvfile)
+        for raw in reader:
+            row = {name: raw.get(name) or None for name in FIELDNAMES}
+            for name in INTEGER_FIELDS:
+                row[name] = _convert(row[name], lambda value: int(float(value)))
+            for name in FLOAT_FIELDS:
+                row[name] = _convert(row[name], float)
+            # Rows written before transitions were recorded always came from navigation timing
+            if row['transition'] is None:
+                row['transition'] = 'navigation'
+            rows.append(row)
+    return rows
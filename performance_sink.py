@@ -0,0 +1,140 @@
+from performance_results import FIELDNAMES, upgrade_csv_header
+import atexit
+import csv
+import io
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def _lock_file(fd):
+    """Take an exclusive lock on an open file so other processes wait for our write"""
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+
+
+def _unlock_file(fd):
+    """Release a lock taken with _lock_file"""
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class CsvPerformanceSink:
+    """Appends measurements to a results CSV as they are taken, in buffered batches"""
+    
+    def __init__(self, filename, fieldnames=FIELDNAMES, batch_size=20, flush_interval=5.0, fsync_interval=30.0):
+        self.filename = filename
+        self.fieldnames = fieldnames
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._last_fsync = time.monotonic()
+        # Header of the file, checked on the first flush; rows are written in its column order
+        self._header = None
+        self._closed = False
+        # O_APPEND keeps every batch at the end of the file even with several writer processes
+        self._fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically, name=f"sink-{filename}", daemon=True)
+        self._flusher.start()
+    
+    def write(self, row):
+        """Buffer one measurement and flush once a full batch is waiting"""
+        with self._lock:
+            if self._closed:
+                raise ValueError(f"Performance sink for {self.filename} is closed")
+            self._buffer.append(row)
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self.flush()
+    
+    def _flush_periodically(self):
+        """Background flush so buffered rows reach the file even when measurements are sparse"""
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+    
+    def _format(self, rows, header):
+        """Render rows (and optionally the header) as CSV text in a single string"""
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=self._header, restval='', extrasaction='ignore')
+        if header:
+            writer.writeheader()
+        writer.writerows(rows)
+        return output.getvalue().encode('utf-8')
+    
+    def flush(self, fsync=False):
+        """Write buffered rows in one locked append, syncing to disk when the interval has passed"""
+        with self._lock:
+            if self._closed and not self._buffer:
+                return
+            rows, self._buffer = self._buffer, []
+            if not rows and not fsync:
+                return
+            
+            _lock_file(self._fd)
+            try:
+                empty = os.fstat(self._fd).st_size == 0
+                if empty:
+                    self._header = self.fieldnames
+                elif self._header is None:
+                    # Older files are upgraded once, while no other process can append
+                    self._header = upgrade_csv_header(self.filename, self.fieldnames)
+                if rows:
+                    os.write(self._fd, self._format(rows, header=empty))
+                if fsync or time.monotonic() - self._last_fsync >= self.fsync_interval:
+                    os.fsync(self._fd)
+                    self._last_fsync = time.monotonic()
+            finally:
+                _unlock_file(self._fd)
+    
+    def close(self):
+        """Flush and fsync everything buffered, then close the file"""
+        self._stop.set()
+        self.flush(fsync=True)
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                os.close(self._fd)
+
+
+# One sink per results file, shared by every OncorePage in the process
+_sinks = {}
+_sinks_lock = threading.Lock()
+
+
+def get_sink(filename, **options):
+    """Return the process-wide sink for a results file, opening it on first use"""
+    key = os.path.abspath(filename)
+    with _sinks_lock:
+        sink = _sinks.get(key)
+        if sink is None or sink._closed:
+            sink = _sinks[key] = CsvPerformanceSink(filename, **options)
+        return sink
+
+
+def close_all_sinks():
+    """Flush and close every open sink"""
+    with _sinks_lock:
+        sinks = list(_sinks.values())
+        _sinks.clear()
+    for sink in sinks:
+        sink.close()
+
+
+atexit.register(close_all_sinks)
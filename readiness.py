@@ -0,0 +1,164 @@
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import WebDriverException
+import time
+import weakref
+
+
+# Counts in-flight XHR/fetch requests and remembers when the page last saw network activity.
+# Guarded so it is safe to run on every poll and from Page.addScriptToEvaluateOnNewDocument.
+INSTRUMENTATION_JS = """
+(function () {
+    if (window.__oncoreReadiness) { return; }
+    var state = window.__oncoreReadiness = {pending: 0, lastActivity: Date.now()};
+    function begin() { state.pending += 1; state.lastActivity = Date.now(); }
+    function end() { state.pending = Math.max(0, state.pending - 1); state.lastActivity = Date.now(); }
+    
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        var xhr = this, done = false;
+        function finish() { if (!done) { done = true; end(); } }
+        begin();
+        xhr.addEventListener('loadend', finish);
+        try {
+            return send.apply(xhr, arguments);
+        } catch (e) {
+            finish();
+            throw e;
+        }
+    };
+    
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function () {
+            begin();
+            return fetch.apply(this, arguments).then(
+                function (response) { end(); return response; },
+                function (error) { end(); throw error; }
+            );
+        };
+    }
+})();
+"""
+
+# One round trip per poll: installs the instrumentation if a new document replaced it,
+# then reports document state, pending requests, the last network activity and the locator
+CHECK_JS = INSTRUMENTATION_JS + """
+var kind = arguments[0], value = arguments[1];
+var state = window.__oncoreReadiness;
+var lastActivity = state.lastActivity;
+var origin = performance.timeOrigin || performance.timing.navigationStart;
+var resources = performance.getEntriesByType('resource');
+for (var i = 0; i < resources.length; i++) {
+    lastActivity = Math.max(lastActivity, origin + resources[i].responseEnd);
+}
+
+var found = true;
+if (kind) {
+    var element = null;
+    if (kind === 'xpath') {
+        element = document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    } else {
+        element = document.querySelector(value);
+    }
+    found = !!element && element.getClientRects().length > 0;
+}
+
+return {
+    readyState: document.readyState,
+    pending: state.pending,
+    lastActivity: lastActivity,
+    now: Date.now(),
+    found: found
+};
+"""
+
+
+def locator_to_query(locator):
+    """Translate a Selenium (By, value) locator into a CSS selector or XPath for CHECK_JS"""
+    if locator is None:
+        return None, None
+    by, value = locator
+    if by == By.XPATH:
+        return "xpath", value
+    if by == By.CSS_SELECTOR:
+        return "css", value
+    if by == By.ID:
+        return "xpath", f"//*[@id={xpath_literal(value)}]"
+    if by == By.NAME:
+        return "xpath", f"//*[@name={xpath_literal(value)}]"
+    if by == By.CLASS_NAME:
+        return "xpath", f"//*[contains(concat(' ', normalize-space(@class), ' '), {xpath_literal(' ' + value + ' ')})]"
+    if by == By.TAG_NAME:
+        return "css", value
+    if by == By.LINK_TEXT:
+        return "xpath", f"//a[normalize-space(.)={xpath_literal(value)}]"
+    if by == By.PARTIAL_LINK_TEXT:
+        return "xpath", f"//a[contains(., {xpath_literal(value)})]"
+    raise ValueError(f"Unsupported locator strategy: {by}")
+
+
+def xpath_literal(value):
+    """Quote a string for use inside an XPath expression"""
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    parts = value.split("'")
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in parts) + ")"
+
+
+class PageReadiness:
+    """Waits until the browser reports a page as ready instead of sleeping for a fixed time"""
+    
+    # Drivers that already carry the instrumentation for every new document
+    _instrumented = weakref.WeakSet()
+    
+    def __init__(self, driver, quiet_period=0.5, timeout=30, poll_interval=0.1):
+        self.driver = driver
+        self.quiet_period = quiet_period
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+    
+    def install(self):
+        """Register the request instrumentation so it also sees requests made while a page loads"""
+        if self.driver in self._instrumented:
+            return
+        if hasattr(self.driver, "execute_cdp_cmd"):
+            try:
+                self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": INSTRUMENTATION_JS})
+            except WebDriverException as e:
+                print(f"Could not register readiness instrumentation, injecting per page instead: {str(e)}")
+        self._instrumented.add(self.driver)
+    
+    def check(self, locator=None):
+        """Return the current readiness state of the page in a single script call"""
+        kind, value = locator_to_query(locator)
+        return self.driver.execute_script(CHECK_JS, kind, value)
+    
+    def wait_until_ready(self, locator=None, quiet_period=None, timeout=None):
+        """Wait for readyState complete, no pending XHR/fetch, a quiet network and the locator"""
+        self.install()
+        quiet_ms = (self.quiet_period if quiet_period is None else quiet_period) * 1000
+        timeout = self.timeout if timeout is None else timeout
+        
+        started = time.monotonic()
+        # Browser clock reference, so a page that was idle before the wait began does not count as settled
+        since = None
+        state = None
+        while time.monotonic() - started < timeout:
+            try:
+                state = self.check(locator)
+            except WebDriverException:
+                # The document is being replaced by a navigation; keep polling
+                state = None
+            if state is not None:
+                if since is None:
+                    since = state['now']
+                idle_for = state['now'] - max(state['lastActivity'], since)
+                if (state['readyState'] == 'complete' and state['pending'] == 0
+                        and idle_for >= quiet_ms and state['found']):
+                    return time.monotonic() - started
+            time.sleep(self.poll_interval)
+        
+        print(f"Page not ready after {timeout}s (last state: {state}), continuing")
+        return None
@@ -0,0 +1,380 @@
+from performance_results import WEB_VITALS_FIELDS
+import numpy as np
+import argparse
+import csv
+import fnmatch
+import itertools
+import os
+import sqlite3
+
+
+# Columns loaded from result files; the rest of FIELDNAMES is not needed for the report
+REPORT_COLUMNS = ['page', 'load_time_ms', 'transition', 'run_id', 'environment', 'browser_profile'] + WEB_VITALS_FIELDS
+# Columns read as numbers; missing values become NaN
+NUMERIC_COLUMNS = ['load_time_ms'] + WEB_VITALS_FIELDS
+PERCENTILES = [50, 90, 95, 99]
+# Web Vitals are conventionally judged at the 75th percentile
+VITALS_PERCENTILE = 75
+
+# Upper bound on elements in one resample matrix so bootstraps over millions of rows stay in memory
+MAX_RESAMPLE_ELEMENTS = 20_000_000
+# Upper bound on elements resampled in total; very large inputs get fewer (but at least MIN_RESAMPLES)
+# resamples, which still gives stable intervals at that size
+MAX_RESAMPLING_WORK = 200_000_000
+MIN_RESAMPLES = 200
+
+
+def _csv_columns(filename):
+    """Read a results CSV straight into column arrays, whatever generation of header it has"""
+    with open(filename, newline='') as csvfile:
+        reader = csv.reader(csvfile)
+        header = next(reader, None) or []
+        # Transpose in C rather than building a dict per row; zip_longest pads short rows (a run killed
+        # mid-write) with '' where zip() would cut every column to the shortest row
+        columns = list(itertools.zip_longest(*reader, fillvalue=''))
+    
+    length = len(columns[0]) if columns else 0
+    data = {}
+    for name in REPORT_COLUMNS:
+        if name in header and header.index(name) < len(columns):
+            data[name] = np.array(columns[header.index(name)], dtype=object)
+        else:
+            data[name] = np.full(length, '', dtype=object)
+    
+    # Blank lines come through as rows of '' in every column; drop them, as csv.DictReader does
+    if columns:
+        keep = np.array(columns[0], dtype=object) != ''
+        for name in REPORT_COLUMNS:
+            keep |= data[name] != ''
+        if not keep.all():
+            data = {name: values[keep] for name, values in data.items()}
+    
+    for name in NUMERIC_COLUMNS:
+        raw = data[name].astype(str)
+        data[name] = np.where(raw == '', 'nan', raw).astype(float)
+    # Rows written before transitions were recorded always came from navigation timing
+    data['transition'] = np.where(data['transition'] == '', 'navigation', data['transition'])
+    return data
+
+
+def _sqlite_columns(filename):
+    """Read the measurements table of a results database into column arrays"""
+    connection = sqlite3.connect(f"file:{filename}?mode=ro", uri=True)
+    try:
+        # Databases written by older versions lack the newer columns
+        present = {row[1] for row in connection.execute("PRAGMA table_info(measurements)")}
+        selected = [name if name in present else f"NULL AS {name}" for name in REPORT_COLUMNS]
+        rows = connection.execute(f"SELECT {', '.join(selected)} FROM measurements").fetchall()
+    finally:
+        connection.close()
+    
+    columns = list(zip(*rows)) if rows else [()] * len(REPORT_COLUMNS)
+    data = {name: np.array(values, dtype=object) for name, values in zip(REPORT_COLUMNS, columns)}
+    for name in NUMERIC_COLUMNS:
+        # NULLs become NaN
+        data[name] = np.array(columns[REPORT_COLUMNS.index(name)], dtype=float)
+    for name in ['transition', 'run_id', 'environment', 'browser_profile']:
+        data[name] = np.where(data[name] == None, '', data[name])  # noqa: E711 - elementwise comparison
+    return data
+
+
+def load_results(paths):
+    """Load result CSVs and SQLite databases into one set of column arrays, plus a 'source' column"""
+    parts = []
+    for path in paths:
+        if path.endswith(('.db', '.sqlite', '.sqlite3')):
+            data = _sqlite_columns(path)
+        else:
+            data = _csv_columns(path)
+        data['source'] = np.full(len(data['page']), os.path.basename(path), dtype=object)
+        parts.append(data)
+    
+    results = {name: np.concatenate([part[name] for part in parts]) for name in REPORT_COLUMNS + ['source']}
+    results['page'] = results['page'].astype(str)
+    for name in NUMERIC_COLUMNS:
+        results[name] = results[name].astype(float)
+    # Rows without a load time (failed or partial writes) carry no measurement
+    keep = ~np.isnan(results['load_time_ms'])
+    return {name: values[keep] for name, values in results.items()}
+
+
+def select(results, **filters):
+    """Keep rows whose columns match every given value; page accepts a glob such as '*Proc'"""
+    keep = np.ones(len(results['page']), dtype=bool)
+    for name, value in filters.items():
+        if value is None:
+            continue
+        column = results[name]
+        if name == 'page' and any(c in value for c in "*?["):
+            names = np.unique(column)
+            matching = [page for page in names if fnmatch.fnmatchcase(page, value)]
+            keep &= np.isin(column, matching)
+        else:
+            keep &= column.astype(str) == value
+    return {name: values[keep] for name, values in results.items()}
+
+
+def _group_sorted(pages, values):
+    """Sort values by page then value; returns the sorted values, page names, group starts and counts"""
+    order = np.lexsort((values, pages))
+    sorted_pages = pages[order]
+    names, starts, counts = np.unique(sorted_pages, return_index=True, return_counts=True)
+    return values[order], order, names, starts, counts
+
+
+def _group_percentiles(sorted_values, starts, counts, percentiles):
+    """Linearly interpolated percentiles for every group of an already sorted array at once
+    
+    sorted_values may be 2-D (resamples x rows); percentiles are taken along the last axis.
+    Returns an array shaped (..., groups, percentiles).
+    """
+    q = np.asarray(percentiles, dtype=float) / 100
+    position = starts[:, None] + q[None, :] * (counts[:, None] - 1)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, (starts + counts - 1)[:, None])
+    fraction = position - lower
+    low_values = sorted_values[..., lower]
+    high_values = sorted_values[..., upper]
+    return low_values + (high_values - low_values) * fraction
+
+
+def _group_means(values, starts, counts):
+    """Mean of every contiguous group along the last axis"""
+    return np.add.reduceat(values, starts, axis=-1) / counts
+
+
+def bootstrap_intervals(sorted_values, starts, counts, percentile=95, resamples=1000, confidence=0.95, seed=None):
+    """Bootstrap confidence intervals of each group's mean and a percentile, all groups per resample
+    
+    Each resample draws row indexes inside every group's own range. Because the data is sorted
+    within groups and groups are contiguous, sorting the drawn indexes row-wise also sorts every
+    resampled group, so percentiles come straight from positions without a per-group loop.
+    """
+    rng = np.random.default_rng(seed)
+    total = len(sorted_values)
+    resamples = min(resamples, max(MIN_RESAMPLES, MAX_RESAMPLING_WORK // max(total, 1)))
+    group_of_row = np.repeat(np.arange(len(starts)), counts)
+    row_starts = starts[group_of_row]
+    row_counts = counts[group_of_row]
+    
+    means, tails = [], []
+    chunk = max(1, min(resamples, MAX_RESAMPLE_ELEMENTS // max(total, 1)))
+    done = 0
+    while done < resamples:
+        size = min(chunk, resamples - done)
+        drawn = row_starts + (rng.random((size, total)) * row_counts).astype(np.int64)
+        drawn.sort(axis=1)
+        resampled = sorted_values[drawn]
+        means.append(_group_means(resampled, starts, counts))
+        tails.append(_group_percentiles(resampled, starts, counts, [percentile])[..., 0])
+        done += size
+    
+    alpha = (1 - confidence) / 2
+    bounds = [100 * alpha, 100 * (1 - alpha)]
+    mean_ci = np.percentile(np.concatenate(means), bounds, axis=0).T
+    tail_ci = np.percentile(np.concatenate(tails), bounds, axis=0).T
+    return mean_ci, tail_ci
+
+
+def summarize(results, percentiles=PERCENTILES, resamples=1000, confidence=0.95, ci_percentile=95, seed=None):
+    """Per-page count, mean, std, percentiles, Tukey outliers and bootstrap intervals in one pass
+    
+    Returns (summary, outliers): summary maps page name to its statistics and outliers is a
+    boolean array aligned with the rows of results flagging values outside 1.5 IQR.
+    """
+    pages = results['page']
+    values = results['load_time_ms']
+    if len(values) == 0:
+        return {}, np.zeros(0, dtype=bool)
+    
+    sorted_values, order, names, starts, counts = _group_sorted(pages, values)
+    group_of_row = np.repeat(np.arange(len(names)), counts)
+    means = _group_means(sorted_values, starts, counts)
+    deviations = np.add.reduceat((sorted_values - means[group_of_row]) ** 2, starts)
+    stds = np.sqrt(deviations / np.maximum(counts - 1, 1))
+    levels = _group_percentiles(sorted_values, starts, counts, list(percentiles) + [25, 75])
+    
+    # Tukey fences per page, broadcast back to every row
+    q1, q3 = levels[:, -2], levels[:, -1]
+    iqr = q3 - q1
+    low_fence = (q1 - 1.5 * iqr)[group_of_row]
+    high_fence = (q3 + 1.5 * iqr)[group_of_row]
+    sorted_outliers = (sorted_values < low_fence) | (sorted_values > high_fence)
+    outliers = np.empty(len(values), dtype=bool)
+    outliers[order] = sorted_outliers
+    outlier_counts = np.add.reduceat(sorted_outliers.astype(np.int64), starts)
+    
+    mean_ci = tail_ci = None
+    if resamples:
+        mean_ci, tail_ci = bootstrap_intervals(sorted_values, starts, counts, ci_percentile,
+                                               resamples, confidence, seed)
+    
+    summary = {}
+    for i, name in enumerate(names):
+        stats = {
+            'count': int(counts[i]),
+            'mean': float(means[i]),
+            'std': float(stds[i]),
+            'outliers': int(outlier_counts[i])
+        }
+        for j, p in enumerate(percentiles):
+            stats[f'p{p}'] = float(levels[i, j])
+        if mean_ci is not None:
+            stats['mean_ci'] = tuple(float(v) for v in mean_ci[i])
+            stats[f'p{ci_percentile}_ci'] = tuple(float(v) for v in tail_ci[i])
+        summary[str(name)] = stats
+    return summary, outliers
+
+
+def summarize_vitals(results, percentile=VITALS_PERCENTILE):
+    """Per-page percentile of load_time_ms and each Web Vital, over the rows where it was recorded
+    
+    Returns {page: {'count': rows with vitals, 'load_time_ms': value, 'fcp_ms': value or None, ...}};
+    pages measured before vitals were collected are left out.
+    """
+    pages = results['page']
+    summary = {}
+    for name in ['load_time_ms'] + WEB_VITALS_FIELDS:
+        values = results[name]
+        recorded = ~np.isnan(values)
+        if not recorded.any():
+            continue
+        sorted_values, _, names, starts, counts = _group_sorted(pages[recorded], values[recorded])
+        levels = _group_percentiles(sorted_values, starts, counts, [percentile])
+        for i, page in enumerate(names):
+            stats = summary.setdefault(str(page), dict.fromkeys(['count', 'load_time_ms'] + WEB_VITALS_FIELDS))
+            stats[name] = float(levels[i, 0])
+            if name == 'cls':
+                # Every row with vitals has a CLS, so its count is the number of rows with vitals
+                stats['count'] = int(counts[i])
+    return {page: stats for page, stats in summary.items() if stats['count']}
+
+
+def permutation_test(a, b, permutations=10000, seed=None):
+    """Two-sided permutation test on the difference in means; returns (difference, p_value)"""
+    rng = np.random.default_rng(seed)
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    combined = np.concatenate([a, b])
+    permutations = min(permutations, max(MIN_RESAMPLES, MAX_RESAMPLING_WORK // len(combined)))
+    observed = b.mean() - a.mean()
+    
+    # Only the first group's sum is needed: sum(b) = total - sum(a)
+    total = combined.sum()
+    extreme = 0
+    chunk = max(1, min(permutations, MAX_RESAMPLE_ELEMENTS // len(combined)))
+    done = 0
+    while done < permutations:
+        size = min(chunk, permutations - done)
+        shuffled = rng.permuted(np.broadcast_to(combined, (size, len(combined))), axis=1)
+        sum_a = shuffled[:, :len(a)].sum(axis=1)
+        differences = (total - sum_a) / len(b) - sum_a / len(a)
+        extreme += int(np.count_nonzero(np.abs(differences) >= abs(observed) - 1e-9))
+        done += size
+    return observed, (extreme + 1) / (permutations + 1)
+
+
+def compare(results, field, baseline, candidate, permutations=10000, seed=None):
+    """Compare every page measured in two runs, environments or source files"""
+    column = results[field].astype(str)
+    base_mask = column == baseline
+    candidate_mask = column == candidate
+    pages = results['page']
+    values = results['load_time_ms']
+    
+    comparison = {}
+    for page in np.intersect1d(pages[base_mask], pages[candidate_mask]):
+        on_page = pages == page
+        a = values[on_page & base_mask]
+        b = values[on_page & candidate_mask]
+        if len(a) < 2 or len(b) < 2:
+            continue
+        difference, p_value = permutation_test(a, b, permutations, seed)
+        comparison[str(page)] = {
+            'baseline_count': len(a),
+            'candidate_count': len(b),
+            'baseline_median': float(np.median(a)),
+            'candidate_median': float(np.median(b)),
+            'mean_difference': float(difference),
+            'change_percent': float(100 * difference / a.mean()) if a.mean() else None,
+            'p_value': float(p_value)
+        }
+    return comparison
+
+
+def print_summary(summary, percentiles=PERCENTILES, ci_percentile=95, confidence=0.95):
+    """Print one line of statistics per page"""
+    columns = ''.join(f"{'p' + str(p):>9}" for p in percentiles)
+    print(f"\n{'Page':<32}{'n':>7}{'mean':>9}{'std':>9}{columns}{'outl':>6}  mean CI / p{ci_percentile} CI ({confidence:.0%})")
+    for page, stats in sorted(summary.items()):
+        line = f"{page[:31]:<32}{stats['count']:>7}{stats['mean']:>9.0f}{stats['std']:>9.0f}"
+        line += ''.join(f"{stats[f'p{p}']:>9.0f}" for p in percentiles)
+        line += f"{stats['outliers']:>6}"
+        if 'mean_ci' in stats:
+            low, high = stats['mean_ci']
+            tail_low, tail_high = stats[f'p{ci_percentile}_ci']
+            line += f"  [{low:.0f}, {high:.0f}] / [{tail_low:.0f}, {tail_high:.0f}]"
+        print(line)
+
+
+def print_vitals(vitals, percentile=VITALS_PERCENTILE):
+    """Print the Web Vitals of each page next to its load time"""
+    if not vitals:
+        return
+    
+    def cell(value, digits=0):
+        return f"{value:.{digits}f}" if value is not None else "-"
+    
+    print(f"\nWeb Vitals (p{percentile}; FCP and LCP for navigations only)")
+    print(f"{'Page':<32}{'n':>7}{'load':>9}{'FCP':>9}{'LCP':>9}{'CLS':>8}{'TBT':>9}{'INP':>9}{'long':>6}")
+    for page, stats in sorted(vitals.items()):
+        print(f"{page[:31]:<32}{stats['count']:>7}{cell(stats['load_time_ms']):>9}{cell(stats['fcp_ms']):>9}"
+              f"{cell(stats['lcp_ms']):>9}{cell(stats['cls'], 3):>8}{cell(stats['tbt_ms']):>9}"
+              f"{cell(stats['inp_ms']):>9}{cell(stats['long_tasks']):>6}")
+
+
+def print_comparison(comparison, field, baseline, candidate, alpha=0.05):
+    """Print per-page changes between two runs or environments, marking significant ones"""
+    print(f"\nComparing {field} '{candidate}' against '{baseline}' (permutation test on the mean)")
+    print(f"{'Page':<32}{'n base':>8}{'n cand':>8}{'median base':>13}{'median cand':>13}{'change':>9}{'p':>9}")
+    for page, stats in sorted(comparison.items()):
+        change = f"{stats['change_percent']:+.1f}%" if stats['change_percent'] is not None else 'n/a'
+        flag = '  *' if stats['p_value'] < alpha else ''
+        print(f"{page[:31]:<32}{stats['baseline_count']:>8}{stats['candidate_count']:>8}"
+              f"{stats['baseline_median']:>13.0f}{stats['candidate_median']:>13.0f}"
+              f"{change:>9}{stats['p_value']:>9.4f}{flag}")
+    print(f"* p < {alpha}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize OnCore performance results and compare runs")
+    parser.add_argument("files", nargs="+", help="Results CSVs and/or SQLite results databases")
+    parser.add_argument("--page", default=None, help="Only report pages matching this name or glob")
+    parser.add_argument("--transition", default=None, choices=["navigation", "soft", "probe"],
+                        help="Only report navigations, soft transitions or HTTP probes")
+    parser.add_argument("--environment", default=None, help="Only report one environment")
+    parser.add_argument("--run", default=None, help="Only report one run_id")
+    parser.add_argument("--profile", default=None, help="Only report one browser profile")
+    parser.add_argument("--bootstrap", type=int, default=1000, help="Bootstrap resamples, 0 to skip intervals")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Confidence level of the intervals")
+    parser.add_argument("--compare", nargs=3, metavar=("FIELD", "BASELINE", "CANDIDATE"), default=None,
+                        help="Compare two values of run_id, environment, browser_profile or source (file name)")
+    parser.add_argument("--permutations", type=int, default=10000, help="Permutations for the comparison test")
+    parser.add_argument("--alpha", type=float, default=0.05, help="Significance level for the comparison")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for repeatable intervals")
+    args = parser.parse_args()
+    
+    results = select(load_results(args.files), page=args.page, transition=args.transition,
+                     environment=args.environment, run_id=args.run, browser_profile=args.profile)
+    print(f"Loaded {len(results['page'])} measurements from {len(args.files)} file(s)")
+    
+    summary, outliers = summarize(results, resamples=args.bootstrap, confidence=args.confidence, seed=args.seed)
+    print_summary(summary, confidence=args.confidence)
+    print_vitals(summarize_vitals(results))
+    
+    if args.compare:
+        field, baseline, candidate = args.compare
+        if field not in ['run_id', 'environment', 'browser_profile', 'source']:
+            parser.error("--compare FIELD must be run_id, environment, browser_profile or source")
+        comparison = compare(results, field, baseline, candidate, args.permutations, args.seed)
+        print_comparison(comparison, field, baseline, candidate, args.alpha)
@@ -0,0 +1,197 @@
+from devtools_log import drain_events, network_requests
+from datetime import datetime
+import argparse
+import gzip
+import json
+import os
+import statistics
+import threading
+
+
+# Returns the page's resource timing entries as compact rows, then clears the buffer so the
+# next step only sees its own requests. arguments[0] adds the document request itself.
+RESOURCE_ENTRIES_JS = """
+var includeNavigation = arguments[0];
+var rows = [];
+function ttfb(e) { return e.responseStart > 0 && e.requestStart > 0 ? e.responseStart - e.requestStart : null; }
+var nav = performance.getEntriesByType('navigation')[0];
+if (includeNavigation && nav) {
+    rows.push([nav.name, 'navigation', 0, nav.duration, ttfb(nav), nav.transferSize, nav.decodedBodySize]);
+}
+var entries = performance.getEntriesByType('resource');
+for (var i = 0; i < entries.length; i++) {
+    var e = entries[i];
+    rows.push([e.name, e.initiatorType, e.startTime, e.duration, ttfb(e), e.transferSize, e.decodedBodySize]);
+}
+performance.clearResourceTimings();
+performance.setResourceTimingBufferSize(1000);
+return rows;
+"""
+
+# Columns of a waterfall file; string columns are stored as indexes into a shared string table.
+# The file is gzipped JSON lines, one chunk per save, each carrying the strings added since the last one.
+STRING_COLUMNS = ['page', 'url', 'initiator']
+COLUMNS = ['page', 'iteration', 'worker_id', 'url', 'initiator', 'start_ms', 'duration_ms', 'ttfb_ms',
+           'transfer_bytes', 'body_bytes', 'status', 'network_bytes']
+
+
+class ResourceWaterfall:
+    """Collects per-step resource timings for a run and stores them as a compact columnar file"""
+    
+    def __init__(self, filename=None, directory="waterfalls"):
+        if filename is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = os.path.join(directory, f"resources_{timestamp}.json.gz")
+        self.filename = filename
+        self.columns = {name: [] for name in COLUMNS}
+        self.strings = []
+        self._string_index = {}
+        # Strings already written to the file; later chunks only carry the ones after them
+        self._saved_strings = 0
+        self._started = False
+        self._lock = threading.Lock()
+    
+    def _intern(self, value):
+        """Return the string table index for a value, adding it if needed"""
+        value = value or ""
+        if value not in self._string_index:
+            self._string_index[value] = len(self.strings)
+            self.strings.append(value)
+        return self._string_index[value]
+    
+    def capture(self, driver, page_name, iteration, worker_id=None, navigation=False, events=None):
+        """Read the resources loaded for a measured step, plus DevTools network data when logged
+        
+        events are DevTools events the caller already drained from the performance log, e.g. for a trace.
+        """
+        rows = driver.execute_script(RESOURCE_ENTRIES_JS, navigation) or []
+        network = network_requests(drain_events(driver) if events is None else events)
+        
+        with self._lock:
+            seen = set()
+            for url, initiator, start, duration, ttfb, transfer, body in rows:
+                seen.add(url)
+                self._append(page_name, iteration, worker_id, url, initiator, start, duration, ttfb,
+                             transfer, body, network.get(url))
+            # Requests DevTools saw but resource timing did not, e.g. cross-origin or dropped entries
+            for url, record in network.items():
+                if url not in seen:
+                    self._append(page_name, iteration, worker_id, url, 'network', None, None, None,
+                                 None, None, record)
+        return len(rows)
+    
+    def _append(self, page_name, iteration, worker_id, url, initiator, start, duration, ttfb,
+                transfer, body, network_record):
+        """Add one resource row to the columns"""
+        values = {
+            'page': self._intern(page_name),
+            'iteration': iteration,
+            'worker_id': worker_id,
+            'url': self._intern(url),
+            'initiator': self._intern(initiator),
+            'start_ms': start,
+            'duration_ms': duration,
+            'ttfb_ms': ttfb,
+            'transfer_bytes': transfer,
+            'body_bytes': body,
+            'status': network_record['status'] if network_record else None,
+            'network_bytes': network_record['bytes'] if network_record else None
+        }
+        for name in COLUMNS:
+            self.columns[name].append(values[name])
+    
+    def save(self):
+        """Append the rows captured since the last save to the run's waterfall file and drop them from memory"""
+        directory = os.path.dirname(self.filename)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        
+        with self._lock:
+            count = len(self.columns['page'])
+            if not count and self._started:
+                return self.filename
+            data = {'version': 2, 'strings': self.strings[self._saved_strings:], 'columns': self.columns}
+            # The first save starts the file; later ones add a gzip member, which readers see as more lines
+            with gzip.open(self.filename, 'at' if self._started else 'wt', encoding='utf-8') as f:
+                f.write(json.dumps(data, separators=(',', ':')) + "\n")
+            self._started = True
+            self._saved_strings = len(self.strings)
+            self.columns = {name: [] for name in COLUMNS}
+        print(f"{count} resource row(s) appended to {self.filename}")
+        return self.filename
+
+
+def load_waterfall(filename):
+    """Load a waterfall file back into a list of row dictionaries with strings resolved"""
+    strings = []
+    rows = []
+    with gzip.open(filename, 'rt', encoding='utf-8') as f:
+        # Version 1 files are a single chunk holding the whole string table
+        for line in f:
+            if not line.strip():
+                continue
+            data = json.loads(line)
+            strings.extend(data['strings'])
+            columns = data['columns']
+            for i in range(len(columns['page'])):
+                row = {name: columns[name][i] for name in COLUMNS}
+                for name in STRING_COLUMNS:
+                    row[name] = strings[row[name]]
+                rows.append(row)
+    return rows
+
+
+def rank_resources(rows, top=10):
+    """Rank each page's resources by median duration and by size across iterations"""
+    grouped = {}
+    for row in rows:
+        stats = grouped.setdefault(row['page'], {}).setdefault(row['url'], {'durations': [], 'bytes': []})
+        if row['duration_ms'] is not None:
+            stats['durations'].append(row['duration_ms'])
+        size = row['network_bytes'] if row['network_bytes'] else row['transfer_bytes']
+        if size:
+            stats['bytes'].append(size)
+    
+    report = {}
+    for page, resources in grouped.items():
+        summary = []
+        for url, stats in resources.items():
+            durations = stats['durations']
+            summary.append({
+                'url': url,
+                'count': max(len(durations), len(stats['bytes'])),
+                'median_ms': statistics.median(durations) if durations else None,
+                'max_ms': max(durations) if durations else None,
+                'mean_bytes': statistics.mean(stats['bytes']) if stats['bytes'] else None
+            })
+        report[page] = {
+            'slowest': sorted((s for s in summary if s['median_ms'] is not None),
+                              key=lambda s: s['median_ms'], reverse=True)[:top],
+            'largest': sorted((s for s in summary if s['mean_bytes'] is not None),
+                              key=lambda s: s['mean_bytes'], reverse=True)[:top]
+        }
+    return report
+
+
+def print_report(report):
+    """Print the slowest and largest resources for each page"""
+    for page in sorted(report):
+        print(f"\n======= {page} =======")
+        print("Slowest resources (median / max ms, samples):")
+        for s in report[page]['slowest']:
+            print(f"  {s['median_ms']:9.1f} / {s['max_ms']:9.1f}  x{s['count']:<4} {s['url']}")
+        print("Largest resources (mean bytes, samples):")
+        for s in report[page]['largest']:
+            print(f"  {s['mean_bytes']:12.0f}  x{s['count']:<4} {s['url']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rank the slowest and largest resources per OnCore page")
+    parser.add_argument("files", nargs="+", help="Waterfall files written during performance runs")
+    parser.add_argument("--top", type=int, default=10, help="Resources to list per page")
+    args = parser.parse_args()
+    
+    all_rows = []
+    for path in args.files:
+        all_rows.extend(load_waterfall(path))
+    print_report(rank_resources(all_rows, args.top))
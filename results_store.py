@@ -0,0 +1,206 @@
+from performance_results import FIELDNAMES, NAVIGATION_TIMING_FIELDS, CDP_METRIC_FIELDS, WEB_VITALS_FIELDS, read_performance_csv, environment_name
+from datetime import datetime, timedelta
+import argparse
+import math
+import os
+import sqlite3
+import threading
+
+
+# Column types for the measurements table; everything else in FIELDNAMES is text
+COLUMN_TYPES = {
+    'load_time_ms': 'REAL',
+    'iteration': 'INTEGER',
+    'worker_id': 'INTEGER',
+    'start_lag_ms': 'REAL',
+    'popup_open_ms': 'REAL'
+}
+COLUMN_TYPES.update({name: 'REAL' for name in NAVIGATION_TIMING_FIELDS + CDP_METRIC_FIELDS + WEB_VITALS_FIELDS})
+COLUMN_TYPES.update({name: 'INTEGER' for name in ['long_tasks', 'status_code', 'response_bytes']})
+
+INDEXES = {
+    'idx_measurements_page_env_time': '(page, environment, timestamp)',
+    'idx_measurements_env_time': '(environment, timestamp)',
+    'idx_measurements_time': '(timestamp)',
+    'idx_measurements_run': '(run_id)'
+}
+
+
+class SQLiteResultsStore:
+    """Indexed SQLite backend for performance history, written to like a performance sink"""
+    
+    def __init__(self, path="oncore_results.db", batch_size=50):
+        self.path = path
+        self.batch_size = batch_size
+        self._buffer = []
+        self._lock = threading.Lock()
+        # Shared across worker threads; writes are serialized by self._lock
+        self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        # WAL lets several worker processes write while reports read
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self._create_schema()
+    
+    def _create_schema(self):
+        """Create the measurements table, its indexes, and columns added since the file was created"""
+        columns = ", ".join(f"{name} {COLUMN_TYPES.get(name, 'TEXT')}" for name in FIELDNAMES)
+        with self.connection:
+            self.connection.execute(f"CREATE TABLE IF NOT EXISTS measurements (id INTEGER PRIMARY KEY, {columns})")
+            existing = {row[1] for row in self.connection.execute("PRAGMA table_info(measurements)")}
+            for name in FIELDNAMES:
+                if name not in existing:
+                    self.connection.execute(f"ALTER TABLE measurements ADD COLUMN {name} {COLUMN_TYPES.get(name, 'TEXT')}")
+            for index, columns in INDEXES.items():
+                self.connection.execute(f"CREATE INDEX IF NOT EXISTS {index} ON measurements {columns}")
+            # CSVs brought in by import_csv and how many of their rows are already in measurements
+            self.connection.execute("CREATE TABLE IF NOT EXISTS imports (path TEXT PRIMARY KEY, row_count INTEGER)")
+    
+    def write(self, row):
+        """Buffer one measurement and insert once a full batch is waiting"""
+        with self._lock:
+            self._buffer.append(row)
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self.flush()
+    
+    def flush(self):
+        """Insert every buffered measurement in one transaction"""
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+            self._insert(rows)
+    
+    def write_rows(self, rows):
+        """Insert many measurements at once"""
+        with self._lock:
+            self._insert(rows)
+    
+    def _insert(self, rows):
+        """Insert rows in a single transaction; caller holds the lock"""
+        if not rows:
+            return
+        with self.connection:
+            self._execute_insert(rows)
+    
+    def _execute_insert(self, rows):
+        """Insert rows inside the caller's transaction"""
+        placeholders = ", ".join("?" for _ in FIELDNAMES)
+        values = [tuple(row.get(name) for name in FIELDNAMES) for row in rows]
+        self.connection.executemany(
+            f"INSERT INTO measurements ({', '.join(FIELDNAMES)}) VALUES ({placeholders})", values
+        )
+    
+    def close(self):
+        """Insert anything still buffered and close the database"""
+        self.flush()
+        self.connection.close()
+    
+    def import_csv(self, filename, environment, run_id=None):
+        """Import the rows of a results CSV that are not in the database yet; returns how many were imported
+        
+        The number of rows imported from each file is kept, so importing a file again only adds the rows
+        appended to it since, whatever run_id those rows carry.
+        """
+        path = os.path.abspath(filename)
+        run_id = run_id or f"import:{os.path.basename(filename)}"
+        rows = read_performance_csv(filename)
+        with self._lock:
+            known = self.connection.execute("SELECT row_count FROM imports WHERE path = ?", (path,)).fetchone()
+            if known is not None:
+                imported = known[0]
+            else:
+                # Files imported before the imports table existed are only known by their default run_id
+                imported = self.connection.execute(
+                    "SELECT COUNT(*) FROM measurements WHERE run_id = ?", (run_id,)
+                ).fetchone()[0]
+            if len(rows) < imported:
+                print(f"{filename} has fewer rows than the {imported} already imported from it, skipping")
+                return 0
+            
+            new_rows = rows[imported:]
+            for row in new_rows:
+                # Older files carry no run or environment columns
+                row['run_id'] = row['run_id'] or run_id
+                row['environment'] = row['environment'] or environment
+            with self.connection:
+                self._execute_insert(new_rows)
+                self.connection.execute("INSERT OR REPLACE INTO imports (path, row_count) VALUES (?, ?)",
+                                        (path, len(rows)))
+        if imported:
+            print(f"{imported} rows of {filename} were imported before")
+        print(f"Imported {len(new_rows)} rows from {filename}")
+        return len(new_rows)
+    
+    def _where(self, page=None, environment=None, since=None, until=None, run_id=None):
+        """Build a WHERE clause that the indexes can serve"""
+        clauses, params = [], []
+        if page is not None:
+            # Glob patterns such as '*Proc' match one step across protocols
+            clauses.append("page GLOB ?" if any(c in page for c in "*?[") else "page = ?")
+            params.append(page)
+        if environment is not None:
+            clauses.append("environment = ?")
+            params.append(environment)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(until)
+        if run_id is not None:
+            clauses.append("run_id = ?")
+            params.append(run_id)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+    
+    def query(self, page=None, environment=None, since=None, until=None, run_id=None):
+        """Return matching measurements as dictionaries, oldest first"""
+        where, params = self._where(page, environment, since, until, run_id)
+        cursor = self.connection.execute(
+            f"SELECT {', '.join(FIELDNAMES)} FROM measurements{where} ORDER BY timestamp", params
+        )
+        return [dict(zip(FIELDNAMES, values)) for values in cursor]
+    
+    def percentile(self, page, percentile=95, days=None, environment=None):
+        """Nearest-rank percentile of load_time_ms for a page, optionally over the last N days"""
+        since = None
+        if days is not None:
+            since = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
+        where, params = self._where(page, environment, since)
+        where += (" AND" if where else " WHERE") + " load_time_ms IS NOT NULL"
+        
+        count = self.connection.execute(f"SELECT COUNT(*) FROM measurements{where}", params).fetchone()[0]
+        if count == 0:
+            return None
+        rank = max(1, math.ceil(percentile / 100 * count))
+        return self.connection.execute(
+            f"SELECT load_time_ms FROM measurements{where} ORDER BY load_time_ms LIMIT 1 OFFSET ?",
+            params + [rank - 1]
+        ).fetchone()[0]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import and query the OnCore performance history database")
+    parser.add_argument("--db", default="oncore_results.db", help="SQLite database file")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    import_parser = commands.add_parser("import", help="Import existing results CSVs")
+    import_parser.add_argument("files", nargs="+")
+    import_parser.add_argument("--environment", required=True,
+                               help="Environment the CSVs were recorded on, e.g. crmsdev or an OnCore URL")
+    
+    percentile_parser = commands.add_parser("percentile", help="Percentile of a page's load time")
+    percentile_parser.add_argument("page", help="Page name, or a glob such as '*Proc'")
+    percentile_parser.add_argument("--p", type=float, default=95, help="Percentile to compute")
+    percentile_parser.add_argument("--days", type=float, default=None, help="Only use the last N days")
+    percentile_parser.add_argument("--environment", default=None)
+    
+    args = parser.parse_args()
+    store = SQLiteResultsStore(args.db)
+    try:
+        if args.command == "import":
+            environment = environment_name(args.environment) if "." in args.environment else args.environment
+            for path in args.files:
+                store.import_csv(path, environment)
+        else:
+            value = store.percentile(args.page, args.p, args.days, args.environment)
+            print(f"p{args.p:g} of {args.page}: {value} ms" if value is not None else "No matching measurements")
+    finally:
+        store.close()
@@ -0,0 +1,56 @@
+import json
+import os
+
+
+class RunCheckpoint:
+    """Remembers which iterations of a run have finished, so an interrupted run can resume where it stopped
+    
+    The file is replaced after every finished iteration (written next to it, then renamed), so an
+    interruption never leaves it half-written. It is removed once the whole run completes.
+    """
+    
+    DEFAULT_FILE = "oncore_checkpoint.json"
+    
+    def __init__(self, path=DEFAULT_FILE, run_id=None):
+        self.path = path
+        # The resumed run keeps its run_id, so its rows group with those written before the interruption
+        self.run_id = run_id
+        self.completed = set()
+    
+    @classmethod
+    def load(cls, path=DEFAULT_FILE):
+        """The checkpoint an interrupted run left behind, or None when there is none"""
+        if not os.path.isfile(path):
+            return None
+        with open(path) as f:
+            data = json.load(f)
+        checkpoint = cls(path, data.get('run_id'))
+        checkpoint.completed = {tuple(key) for key in data.get('completed', [])}
+        return checkpoint
+    
+    @staticmethod
+    def key(case, test_name, iteration):
+        """Identify one iteration of a test for a case; the admin test passes a case with only base_url"""
+        return (case.get('base_url'), case.get('protocol_no'), case.get('subject_mrn'), case.get('arm_name'),
+                test_name, iteration)
+    
+    def is_done(self, key):
+        """Check whether an iteration finished before the run was interrupted"""
+        return tuple(key) in self.completed
+    
+    def mark_done(self, key):
+        """Record that an iteration finished, whether it passed or failed"""
+        self.completed.add(tuple(key))
+        self.save()
+    
+    def save(self):
+        """Write the checkpoint, replacing the previous one in a single rename"""
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w") as f:
+            json.dump({'run_id': self.run_id, 'completed': sorted(self.completed, key=str)}, f, indent=2)
+        os.replace(temporary, self.path)
+    
+    def remove(self):
+        """Delete the checkpoint once the run has completed"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,527 @@
+from driver_pool import DriverPool
+from browser_profiles import get_profile, PROFILES
+from screenshot_service import ScreenshotService, MODES as SCREENSHOT_MODES, ON_FAILURE
+import argparse
+import getpass
+import json
+import os
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+try:
+    import yaml
+except ImportError:  # PyYAML is only needed for YAML run configs
+    yaml = None
+
+
+class RunConfigError(ValueError):
+    """Raised when a run config cannot be read or leaves a required setting unset"""
+
+
+# ONCORE_* environment variables and the settings they override
+ENVIRONMENT_VARIABLES = {
+    'ONCORE_URL': 'environments',
+    'ONCORE_USERNAME': 'username',
+    'ONCORE_PASSWORD': 'password',
+    'ONCORE_PROTOCOL_NO': 'protocol_no',
+    'ONCORE_PROTOCOL_ID': 'protocol_id',
+    'ONCORE_SUBJECT_MRN': 'subjects',
+    'ONCORE_ARM': 'arm',
+    'ONCORE_ITERATIONS': 'iterations',
+    'ONCORE_BROWSER_MODE': 'browser_mode',
+    'ONCORE_BROWSER_PROFILE': 'browser_profile',
+    'ONCORE_FIXED_WAITS': 'fixed_waits',
+    'ONCORE_CAPTURE_RESOURCES': 'capture_resources',
+    'ONCORE_CDP_METRICS': 'cdp_metrics',
+    'ONCORE_TRACES': 'traces',
+    'ONCORE_RESULTS_DB': 'results_db',
+    'ONCORE_ADMIN': 'admin',
+    'ONCORE_MEASURE_LOGIN': 'measure_login',
+    'ONCORE_SCENARIO': 'scenario',
+    'ONCORE_STEPS': 'steps',
+    'ONCORE_SHARD': 'shard',
+    'ONCORE_LANES': 'lanes',
+    'ONCORE_SCREENSHOTS': 'screenshots',
+    'ONCORE_METRICS_PORT': 'metrics_port',
+    'ONCORE_SINK_BATCH_SIZE': 'sink_batch_size',
+    'ONCORE_SINK_FSYNC_INTERVAL': 'sink_fsync_interval'
+}
+
+# Options for load_driver.py runs; anything left unset uses load_driver's defaults
+LOAD_OPTIONS = ['users', 'ramp_up', 'duration', 'think_time', 'arrivals']
+
+# Options for http_probe.py runs
+PROBE_OPTIONS = ['samples', 'duration', 'concurrency']
+
+# Options for the screenshots section; see screenshot_service.ScreenshotService
+SCREENSHOT_OPTIONS = ['mode', 'sample_rate', 'directory', 'format', 'max_files', 'max_mb', 'max_age_days']
+
+# Options for the sink section; see performance_sink.CsvPerformanceSink
+SINK_OPTIONS = ['batch_size', 'fsync_interval']
+
+TARGET_FIELDS = ['protocol_no', 'protocol_id', 'arm']
+
+
+def _normalize_url(url):
+    """Add the https:// scheme the prompts have always assumed"""
+    url = str(url).strip().rstrip("/")
+    return url if url.startswith("http") else "https://" + url
+
+
+def _as_list(value):
+    """Accept a single value, a comma separated string or a list"""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [part.strip() for part in value.split(",") if part.strip()]
+    if isinstance(value, (list, tuple)):
+        return [str(part).strip() for part in value]
+    return [str(value)]
+
+
+def _as_bool(value):
+    """Read yes/no style values from config files and environment variables"""
+    if isinstance(value, bool) or value is None:
+        return value
+    return str(value).strip().lower() in ("1", "y", "yes", "true", "on")
+
+
+def _number(value, converter, name):
+    """Convert a numeric setting, naming the setting or variable it came from when that fails"""
+    try:
+        return converter(value)
+    except (TypeError, ValueError):
+        raise RunConfigError(f"{name} must be a number, not {value!r}")
+
+
+def read_config_file(path):
+    """Read a YAML, TOML or JSON run config into a dictionary"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".yaml", ".yml"):
+        if yaml is None:
+            raise RunConfigError(f"Reading {path} needs PyYAML (pip install pyyaml), or use a TOML config")
+        with open(path) as f:
+            data = yaml.safe_load(f)
+    elif extension == ".toml":
+        if tomllib is None:
+            raise RunConfigError(f"Reading {path} needs Python 3.11+, or use a YAML config")
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    elif extension == ".json":
+        with open(path) as f:
+            data = json.load(f)
+    else:
+        raise RunConfigError(f"Unknown run config format for {path}; use .yaml, .toml or .json")
+    
+    if not isinstance(data, dict):
+        raise RunConfigError(f"{path} must contain a mapping of settings")
+    return data
+
+
+class RunConfig:
+    """Settings for one run: environments, credentials, the protocol/subject/arm matrix and run options"""
+    
+    def __init__(self, environments=None, username=None, password=None, targets=None, iterations=None,
+                 browser_mode=None, browser_profile=None, fixed_waits=None, capture_resources=None,
+                 cdp_metrics=None, traces=None, results_db=None, admin=None, measure_login=None, scenario=None,
+                 steps=None, shard=None, lanes=None, load=None, probe=None, screenshots=None, metrics_port=None,
+                 sink=None, interactive=True, source=None):
+        self.environments = [_normalize_url(url) for url in environments or []]
+        self.username = username
+        self.password = password
+        # Each target is {'protocol_no', 'protocol_id', 'arm', 'subjects': [MRN, ...]}
+        self.targets = targets or []
+        self.iterations = iterations
+        self.browser_mode = browser_mode
+        # browser_profiles name: measurement-faithful (default) or high-density-headless
+        self.browser_profile = browser_profile
+        self.fixed_waits = fixed_waits
+        self.capture_resources = capture_resources
+        # Chrome Performance.getMetrics per step, and a trace file per step (which implies the metrics)
+        self.cdp_metrics = cdp_metrics
+        self.traces = traces
+        self.results_db = results_db
+        self.admin = admin
+        # Log in (and time it) on every iteration instead of reusing one authenticated session
+        self.measure_login = measure_login
+        # Protocol scenario file (default scenarios/protocol.json), the steps or tags to keep, and an "I/N" shard
+        self.scenario = scenario
+        self.steps = _as_list(steps)
+        self.shard = shard
+        # Browsers per test that measure independent chains of steps at the same time
+        self.lanes = lanes
+        self.load = dict.fromkeys(LOAD_OPTIONS)
+        self.load.update(load or {})
+        self.probe = dict.fromkeys(PROBE_OPTIONS)
+        self.probe.update(probe or {})
+        # When screenshots are taken (always, on-failure, sampled, off) and how many are kept
+        self.screenshots = dict.fromkeys(SCREENSHOT_OPTIONS)
+        self.screenshots.update(screenshots or {})
+        # Local port for the live metrics endpoint (live_metrics.py), or None to not serve one
+        self.metrics_port = metrics_port
+        # Rows per batch appended to the results CSV, and seconds between fsyncs of it
+        self.sink = dict.fromkeys(SINK_OPTIONS)
+        self.sink.update(sink or {})
+        # Prompt for missing settings only when no config file was given
+        self.interactive = interactive
+        self.source = source
+    
+    @classmethod
+    def from_file(cls, path):
+        """Build a config from a YAML, TOML or JSON file"""
+        data = read_config_file(path)
+        
+        environments = _as_list(data.get('environments') or data.get('environment'))
+        credentials = data.get('credentials') or {}
+        if 'password' in credentials:
+            raise RunConfigError(f"{path}: keep the password out of the config file; "
+                                 "use credentials.password_env or credentials.password_file")
+        username = credentials.get('username')
+        if username is None and credentials.get('username_env'):
+            username = os.environ.get(credentials['username_env'])
+        password = None
+        if credentials.get('password_env'):
+            password = os.environ.get(credentials['password_env'])
+        if password is None and credentials.get('password_file'):
+            with open(os.path.expanduser(credentials['password_file'])) as f:
+                password = f.read().strip()
+        
+        targets = []
+        for entry in data.get('targets') or []:
+            target = {name: str(entry[name]) if entry.get(name) is not None else None for name in TARGET_FIELDS}
+            target['subjects'] = _as_list(entry.get('subjects') or entry.get('subject_mrn'))
+            targets.append(target)
+        
+        load = data.get('load') or {}
+        unknown = set(load) - set(LOAD_OPTIONS)
+        if unknown:
+            raise RunConfigError(f"{path}: unknown load options {', '.join(sorted(unknown))}")
+        probe = data.get('probe') or {}
+        unknown = set(probe) - set(PROBE_OPTIONS)
+        if unknown:
+            raise RunConfigError(f"{path}: unknown probe options {', '.join(sorted(unknown))}")
+        screenshots = data.get('screenshots') or {}
+        if isinstance(screenshots, str):
+            screenshots = {'mode': screenshots}
+        unknown = set(screenshots) - set(SCREENSHOT_OPTIONS)
+        if unknown:
+            raise RunConfigError(f"{path}: unknown screenshots options {', '.join(sorted(unknown))}")
+        sink = data.get('sink') or {}
+        unknown = set(sink) - set(SINK_OPTIONS)
+        if unknown:
+            raise RunConfigError(f"{path}: unknown sink options {', '.join(sorted(unknown))}")
+        
+        return cls(
+            environments=environments,
+            username=username,
+            password=password,
+            targets=targets,
+            iterations=data.get('iterations'),
+            browser_mode=data.get('browser_mode'),
+            browser_profile=data.get('browser_profile'),
+            fixed_waits=_as_bool(data.get('fixed_waits')),
+            capture_resources=_as_bool(data.get('capture_resources')),
+            cdp_metrics=_as_bool(data.get('cdp_metrics')),
+            traces=_as_bool(data.get('traces')),
+            results_db=data.get('results_db'),
+            admin=_as_bool(data.get('admin')),
+            measure_login=_as_bool(data.get('measure_login')),
+            scenario=data.get('scenario'),
+            steps=data.get('steps'),
+            shard=data.get('shard'),
+            lanes=data.get('lanes'),
+            load=load,
+            probe=probe,
+            screenshots=screenshots,
+            metrics_port=data.get('metrics_port'),
+            sink=sink,
+            interactive=False,
+            source=path
+        )
+    
+    @classmethod
+    def load_settings(cls, path=None, args=None, environ=None):
+        """Combine a config file, ONCORE_* variables and command line flags, later ones winning"""
+        environ = os.environ if environ is None else environ
+        path = path or (getattr(args, 'config', None) if args is not None else None) or environ.get('ONCORE_CONFIG')
+        config = cls.from_file(path) if path else cls()
+        
+        config.update({setting: environ[name] for name, setting in ENVIRONMENT_VARIABLES.items() if environ.get(name)},
+                      sources={setting: name for name, setting in ENVIRONMENT_VARIABLES.items()})
+        if args is not None:
+            config.update({
+                'environments': getattr(args, 'url', None),
+                'username': getattr(args, 'username', None),
+                'protocol_no': getattr(args, 'protocol_no', None),
+                'protocol_id': getattr(args, 'protocol_id', None),
+                'subjects': getattr(args, 'subject_mrn', None),
+                'arm': getattr(args, 'arm', None),
+                'iterations': getattr(args, 'iterations', None),
+                'browser_mode': getattr(args, 'browser_mode', None),
+                'browser_profile': getattr(args, 'browser_profile', None),
+                'fixed_waits': getattr(args, 'fixed_waits', None) or None,
+                'capture_resources': getattr(args, 'capture_resources', None) or None,
+                'cdp_metrics': getattr(args, 'cdp_metrics', None) or None,
+                'traces': getattr(args, 'traces', None) or None,
+                'results_db': getattr(args, 'results_db', None),
+                'admin': getattr(args, 'admin', None),
+                'measure_login': getattr(args, 'measure_login', None) or None,
+                'scenario': getattr(args, 'scenario', None),
+                'steps': getattr(args, 'steps', None),
+                'shard': getattr(args, 'shard', None),
+                'lanes': getattr(args, 'lanes', None),
+                'screenshots': getattr(args, 'screenshots', None),
+                'screenshot_sample_rate': getattr(args, 'screenshot_sample_rate', None),
+                'metrics_port': getattr(args, 'metrics_port', None),
+                'sink_batch_size': getattr(args, 'sink_batch_size', None),
+                'sink_fsync_interval': getattr(args, 'sink_fsync_interval', None)
+            })
+            if getattr(args, 'no_prompt', False):
+                config.interactive = False
+        return config
+    
+    def update(self, values, sources=None):
+        """Override settings; protocol, subject and arm values apply to every target in the matrix
+        
+        sources maps a setting to the variable it was read from, so a bad value is reported by that name.
+        """
+        values = {name: value for name, value in values.items() if value is not None}
+        sources = sources or {}
+        
+        def number(name, converter=int):
+            return _number(values[name], converter, sources.get(name, name))
+        
+        if 'environments' in values:
+            self.environments = [_normalize_url(url) for url in _as_list(values['environments'])]
+        for name in ('username', 'password', 'browser_mode', 'browser_profile', 'results_db', 'scenario', 'shard'):
+            if name in values:
+                setattr(self, name, values[name])
+        if 'iterations' in values:
+            self.iterations = number('iterations')
+        if 'lanes' in values:
+            self.lanes = number('lanes')
+        if 'metrics_port' in values:
+            self.metrics_port = number('metrics_port')
+        if 'steps' in values:
+            self.steps = _as_list(values['steps'])
+        if 'screenshots' in values:
+            self.screenshots['mode'] = values['screenshots']
+        if 'screenshot_sample_rate' in values:
+            self.screenshots['sample_rate'] = number('screenshot_sample_rate', float)
+        if 'sink_batch_size' in values:
+            self.sink['batch_size'] = number('sink_batch_size')
+        if 'sink_fsync_interval' in values:
+            self.sink['fsync_interval'] = number('sink_fsync_interval', float)
+        for name in ('fixed_waits', 'capture_resources', 'cdp_metrics', 'traces', 'admin', 'measure_login'):
+            if name in values:
+                setattr(self, name, _as_bool(values[name]))
+        
+        overrides = {name: str(values[name]) for name in TARGET_FIELDS if name in values}
+        if 'subjects' in values:
+            overrides['subjects'] = _as_list(values['subjects'])
+        if overrides:
+            if not self.targets:
+                self.targets = [{'protocol_no': None, 'protocol_id': None, 'arm': None, 'subjects': []}]
+            for target in self.targets:
+                target.update(overrides)
+    
+    def prompt_for_missing(self):
+        """Ask for anything still unset when interactive; otherwise fail fast or use defaults"""
+        if self.interactive:
+            self._prompt()
+        
+        missing = []
+        if not self.environments:
+            missing.append("environment URL (environments / ONCORE_URL)")
+        if not self.username:
+            missing.append("username (credentials.username / ONCORE_USERNAME)")
+        if not self.password:
+            missing.append("password (credentials.password_env / ONCORE_PASSWORD)")
+        if not self.targets:
+            missing.append("protocol targets (targets / ONCORE_PROTOCOL_NO)")
+        for target in self.targets:
+            for name in TARGET_FIELDS:
+                if not target.get(name):
+                    missing.append(f"{name} for protocol {target.get('protocol_no')}")
+            if not target.get('subjects'):
+                missing.append(f"subjects for protocol {target.get('protocol_no')}")
+        if missing:
+            where = f" in {self.source}" if self.source else ""
+            raise RunConfigError(f"Run config{where} is missing: " + "; ".join(missing))
+        
+        # Options nobody set fall back to the same defaults the prompts offer
+        self.iterations = _number(1 if self.iterations is None else self.iterations, int, "iterations")
+        if self.iterations < 1:
+            raise RunConfigError("iterations must be a positive number")
+        self.lanes = _number(self.lanes or 1, int, "lanes")
+        if self.lanes < 1:
+            raise RunConfigError("lanes must be a positive number")
+        self.browser_mode = self.browser_mode or DriverPool.COLD
+        if self.browser_mode not in (DriverPool.COLD, DriverPool.WARM):
+            raise RunConfigError(f"browser_mode must be '{DriverPool.COLD}' or '{DriverPool.WARM}'")
+        try:
+            self.browser_profile = get_profile(self.browser_profile).name
+        except ValueError as e:
+            raise RunConfigError(str(e))
+        self.fixed_waits = bool(self.fixed_waits)
+        self.capture_resources = bool(self.capture_resources)
+        self.traces = bool(self.traces)
+        self.cdp_metrics = bool(self.cdp_metrics) or self.traces
+        self.measure_login = bool(self.measure_login)
+        # Every entry point runs the admin test unless the config, ONCORE_ADMIN or --no-admin turns it off
+        self.admin = True if self.admin is None else bool(self.admin)
+        self.screenshots['mode'] = self.screenshots['mode'] or ON_FAILURE
+        if self.screenshots['mode'] not in SCREENSHOT_MODES:
+            raise RunConfigError(f"screenshots must be one of: {', '.join(SCREENSHOT_MODES)}")
+        if self.sink['batch_size'] is not None:
+            self.sink['batch_size'] = _number(self.sink['batch_size'], int, "sink batch_size")
+            if self.sink['batch_size'] < 1:
+                raise RunConfigError("sink batch_size must be a positive number")
+        if self.sink['fsync_interval'] is not None:
+            self.sink['fsync_interval'] = _number(self.sink['fsync_interval'], float, "sink fsync_interval")
+            if self.sink['fsync_interval'] < 0:
+                raise RunConfigError("sink fsync_interval must not be negative")
+        return self
+    
+    def _prompt(self):
+        """The original interactive prompts, asked only for settings that are still unset"""
+        # Prompt for the number of iterations
+        while self.iterations is None:
+            try:
+                self.iterations = int(input("Enter the number of times to repeat each test: "))
+                if self.iterations <= 0:
+                    print("Please enter a positive number.")
+                    self.iterations = None
+            except ValueError:
+                print("Please enter a valid number.")
+        
+        # Prompt for the testing environment URL
+        if not self.environments:
+            self.environments = [_normalize_url(input("Enter the OnCore environment URL (e.g., https://crmsdev.mednet.ucla.edu): "))]
+        
+        # Prompt for login credentials once
+        if not self.username:
+            self.username = input("Enter your OnCore username: ")
+        if not self.password:
+            self.password = getpass.getpass("Enter your OnCore password: ")
+        
+        # Prompt for the protocol, subject and arm
+        if not self.targets:
+            self.targets = [{'protocol_no': None, 'protocol_id': None, 'arm': None, 'subjects': []}]
+        for target in self.targets:
+            if not target.get('protocol_no'):
+                target['protocol_no'] = input("Enter the protocol number (e.g., 16-000265): ")
+            if not target.get('protocol_id'):
+                target['protocol_id'] = input("Enter the protocol ID: ")
+            if not target.get('subjects'):
+                target['subjects'] = _as_list(input("Enter the test subject MRN: "))
+            if not target.get('arm'):
+                target['arm'] = input("Enter the arm name (e.g., BLD): ")
+        
+        # Prompt for browser mode so cold vs. warm browser timings are a deliberate choice
+        while self.browser_mode is None:
+            mode = input("Browser mode - 'cold' starts Chrome per iteration, 'warm' reuses a pooled session [cold]: ").strip().lower() or DriverPool.COLD
+            if mode in (DriverPool.COLD, DriverPool.WARM):
+                self.browser_mode = mode
+            else:
+                print("Please enter 'cold' or 'warm'.")
+        
+        # Readiness waits are the default; fixed sleeps remain available as a fallback
+        if self.fixed_waits is None:
+            self.fixed_waits = input("Use fixed sleeps between actions instead of readiness waits? [y/N]: ").strip().lower() in ("y", "yes")
+        
+        # Session reuse is the default; a fresh, measured login every iteration is opt-in
+        if self.measure_login is None:
+            self.measure_login = input("Log in and measure the login on every iteration instead of reusing the session? [y/N]: ").strip().lower() in ("y", "yes")
+        
+        # Optionally keep an indexed history alongside the CSV files
+        if self.results_db is None:
+            self.results_db = input("SQLite results database to also write to (blank for none): ").strip() or None
+        
+        # Resource capture adds a request per step, so it is opt-in
+        if self.capture_resources is None:
+            self.capture_resources = input("Capture a resource waterfall for each measured step? [y/N]: ").strip().lower() in ("y", "yes")
+    
+    def screenshot_service(self):
+        """The ScreenshotService described by the screenshots settings"""
+        options = {name: value for name, value in self.screenshots.items() if value is not None}
+        if 'format' in options:
+            options['image_format'] = options.pop('format')
+        try:
+            return ScreenshotService(**options)
+        except ValueError as e:
+            raise RunConfigError(str(e))
+    
+    def cases(self):
+        """Expand the matrix into one case per environment, protocol and subject"""
+        cases = []
+        for base_url in self.environments:
+            for target in self.targets:
+                for subject_mrn in target['subjects']:
+                    cases.append({
+                        'base_url': base_url,
+                        'protocol_no': target['protocol_no'],
+                        'protocol_id': target['protocol_id'],
+                        'subject_mrn': subject_mrn,
+                        'arm_name': target['arm']
+                    })
+        return cases
+
+
+def add_run_arguments(parser):
+    """Add the flags shared by every entry point that starts a run"""
+    parser.add_argument("--config", default=None,
+                        help="YAML, TOML or JSON run config (default: $ONCORE_CONFIG)")
+    parser.add_argument("--url", action="append", default=None,
+                        help="OnCore environment URL; repeat to sweep several environments")
+    parser.add_argument("--username", default=None, help="OnCore username (the password comes from ONCORE_PASSWORD)")
+    parser.add_argument("--protocol-no", default=None, help="Protocol number, e.g. 16-000265")
+    parser.add_argument("--protocol-id", default=None, help="Protocol ID")
+    parser.add_argument("--subject-mrn", action="append", default=None,
+                        help="Test subject MRN; repeat to sweep several subjects")
+    parser.add_argument("--arm", default=None, help="Arm name, e.g. BLD")
+    parser.add_argument("--iterations", type=int, default=None, help="Times to repeat each test per case")
+    parser.add_argument("--browser-mode", choices=[DriverPool.COLD, DriverPool.WARM], default=None,
+                        help="Start a new Chrome per iteration (cold) or reuse pooled sessions (warm)")
+    parser.add_argument("--browser-profile", choices=list(PROFILES), default=None,
+                        help="Chrome settings: measurement-faithful (default) or high-density-headless for more "
+                             "sessions per runner")
+    parser.add_argument("--fixed-waits", action="store_true",
+                        help="Sleep a fixed time between actions instead of waiting for readiness")
+    parser.add_argument("--capture-resources", action="store_true",
+                        help="Save a resource waterfall for every measured step")
+    parser.add_argument("--cdp-metrics", action="store_true",
+                        help="Record JS heap size and script, layout and task time for every measured step")
+    parser.add_argument("--traces", action="store_true",
+                        help="Also save a Chrome trace of every measured step to traces/ (implies --cdp-metrics)")
+    parser.add_argument("--results-db", default=None, help="SQLite results database to also write to")
+    parser.add_argument("--admin", action=argparse.BooleanOptionalAction, default=None,
+                        help="Run the admin performance test too (default: yes); --no-admin skips it")
+    parser.add_argument("--measure-login", action="store_true",
+                        help="Log in and measure the login on every iteration instead of reusing the session")
+    parser.add_argument("--scenario", default=None,
+                        help="Scenario file or name for the protocol test (default: scenarios/protocol.json)")
+    parser.add_argument("--steps", default=None,
+                        help="Comma separated steps or tags to run; the steps they require are added")
+    parser.add_argument("--shard", default=None,
+                        help="Run one shard of the scenario's independent step chains, e.g. 2/3, or 'workers' "
+                             "to give each load_driver worker its own shard")
+    parser.add_argument("--lanes", type=int, default=None,
+                        help="Browsers per test that measure independent steps at the same time (default: 1)")
+    parser.add_argument("--screenshots", choices=SCREENSHOT_MODES, default=None,
+                        help="When to take scenario screenshots (default: on-failure)")
+    parser.add_argument("--screenshot-sample-rate", type=float, default=None,
+                        help="Share of screenshot points captured in sampled mode (default: 0.1)")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Serve live metrics (Prometheus /metrics and a dashboard feed) on this local port, "
+                             "e.g. 9464")
+    parser.add_argument("--sink-batch-size", type=int, default=None,
+                        help="Rows buffered before each append to the results CSV (default: 20)")
+    parser.add_argument("--sink-fsync-interval", type=float, default=None,
+                        help="Seconds between fsyncs of the results CSV; 0 syncs every batch (default: 30)")
+    parser.add_argument("--no-prompt", action="store_true",
+                        help="Fail instead of prompting when a setting is missing")
+    return parser
@@ -0,0 +1,350 @@
+from selenium.webdriver.support.ui import Select
+from page_objects.oncore_page import OncorePage
+from performance_results import PASSED, FAILED, SKIPPED
+import json
+import os
+import re
+
+
+# Scenarios shipped with the framework
+SCENARIO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenarios")
+
+# Fields each action needs; anything else on a step is optional
+ACTIONS = {
+    'navigate': ['url'],
+    'script': ['script'],
+    'click': [],
+    'select': ['locator', 'text'],
+    'switch_window': [],
+    'close_window': []
+}
+
+STEP_FIELDS = {'name', 'action', 'measure', 'url', 'script', 'locator', 'locators', 'find', 'function', 'text',
+               'ready', 'requires', 'optional', 'timeout', 'tags', 'screenshot', 'error_screenshot', 'description'}
+
+# Named lookups for elements that need several fallback strategies (see OncorePage)
+FINDERS = {
+    'subject': lambda page, step, context: page.find_subject_link(context['subject_mrn'], step.timeout),
+    'physical_exam': lambda page, step, context: page.find_physical_exam_link(
+        step.name, step.function or "toProcedureDetails", step.timeout)
+}
+
+PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+
+class ScenarioError(ValueError):
+    """Raised when a scenario file is malformed or refers to an unknown step, locator or placeholder"""
+
+
+class Step:
+    """One measured (or unmeasured) action of a scenario"""
+    
+    def __init__(self, data, source="scenario"):
+        unknown = set(data) - STEP_FIELDS
+        if unknown:
+            raise ScenarioError(f"{source}: unknown step fields {', '.join(sorted(unknown))}")
+        self.name = data.get('name')
+        self.action = data.get('action')
+        if not self.name or self.action not in ACTIONS:
+            raise ScenarioError(f"{source}: every step needs a name and one of the actions {', '.join(ACTIONS)}")
+        for field in ACTIONS[self.action]:
+            if data.get(field) is None:
+                raise ScenarioError(f"{source}: step {self.name} ({self.action}) needs '{field}'")
+        if self.action == 'click' and not (data.get('locator') or data.get('locators') or data.get('find')):
+            raise ScenarioError(f"{source}: click step {self.name} needs a locator, locators or find")
+        if data.get('find') is not None and data['find'] not in FINDERS:
+            raise ScenarioError(f"{source}: step {self.name} has unknown finder {data['find']}")
+        
+        # Measurement name template, e.g. "{protocol_no}CRA2"; steps without one are not recorded
+        self.measure = data.get('measure')
+        self.url = data.get('url')
+        self.script = data.get('script')
+        self.locator = data.get('locator')
+        self.locators = data.get('locators') or []
+        self.find = data.get('find')
+        self.function = data.get('function')
+        self.text = data.get('text')
+        # Element the page must show before the step counts as loaded
+        self.ready = data.get('ready')
+        # Steps that must have succeeded first because this one acts on the page they opened
+        self.requires = list(data.get('requires') or [])
+        # A failed optional step is logged and its dependents skipped instead of failing the run
+        self.optional = bool(data.get('optional', False))
+        self.timeout = data.get('timeout', 10)
+        self.tags = list(data.get('tags') or [])
+        self.screenshot = data.get('screenshot')
+        self.error_screenshot = data.get('error_screenshot')
+        self.description = data.get('description')
+    
+    def __repr__(self):
+        return f"Step({self.name!r}, {self.action!r})"
+
+
+class Scenario:
+    """An ordered list of steps loaded from a JSON scenario file"""
+    
+    def __init__(self, name, steps, description=None, source=None):
+        self.name = name
+        self.steps = steps
+        self.description = description
+        self.source = source
+        self._by_name = {}
+        for step in steps:
+            if step.name in self._by_name:
+                raise ScenarioError(f"{source or name}: duplicate step name {step.name}")
+            for required in step.requires:
+                if required not in self._by_name:
+                    raise ScenarioError(f"{source or name}: step {step.name} requires {required}, "
+                                        "which is not an earlier step")
+            self._by_name[step.name] = step
+    
+    @classmethod
+    def from_dict(cls, data, source=None):
+        """Build a scenario from its parsed JSON"""
+        source = source or data.get('name', "scenario")
+        steps = [Step(entry, source) for entry in data.get('steps') or []]
+        if not steps:
+            raise ScenarioError(f"{source}: a scenario needs at least one step")
+        return cls(data.get('name') or os.path.splitext(os.path.basename(source))[0], steps,
+                   data.get('description'), source)
+    
+    @classmethod
+    def load(cls, path):
+        """Read a scenario file; bare names such as "protocol" are looked up in scenarios/"""
+        if not os.path.exists(path) and not os.path.splitext(path)[1]:
+            path = os.path.join(SCENARIO_DIR, f"{path}.json")
+        with open(path) as f:
+            try:
+                data = json.load(f)
+            except ValueError as e:
+                raise ScenarioError(f"{path}: {str(e)}")
+        return cls.from_dict(data, path)
+    
+    def step(self, name):
+        """Return a step by name"""
+        if name not in self._by_name:
+            raise ScenarioError(f"{self.source or self.name} has no step {name}")
+        return self._by_name[name]
+    
+    def names(self):
+        """Step names in run order"""
+        return [step.name for step in self.steps]
+    
+    def failed_required(self, results):
+        """Names of the steps that are not optional and failed in a run's results"""
+        return [step.name for step in self.steps if not step.optional and results.get(step.name) == FAILED]
+    
+    def requirements(self, names):
+        """The given steps plus every step they transitively require"""
+        needed = set()
+        pending = list(names)
+        while pending:
+            step = self.step(pending.pop())
+            if step.name not in needed:
+                needed.add(step.name)
+                pending.extend(step.requires)
+        return needed
+    
+    def select(self, names_or_tags):
+        """Keep only the named (or tagged) steps and the steps they need, in their original order"""
+        wanted = set(names_or_tags)
+        unknown = wanted - set(self._by_name) - {tag for step in self.steps for tag in step.tags}
+        if unknown:
+            raise ScenarioError(f"{self.source or self.name} has no steps or tags {', '.join(sorted(unknown))}")
+        chosen = [step.name for step in self.steps if step.name in wanted or wanted & set(step.tags)]
+        needed = self.requirements(chosen)
+        return Scenario(self.name, [step for step in self.steps if step.name in needed], self.description,
+                        self.source)
+    
+    def chains(self):
+        """Group steps that share page state (linked through requires) into independent chains"""
+        chain_of = {}
+        chains = []
+        for step in self.steps:
+            linked = {id(chain_of[name]): chain_of[name] for name in step.requires}
+            if not linked:
+                chain = []
+                chains.append(chain)
+            else:
+                # A step that needs several chains joins them into one
+                merged = list(linked.values())
+                chain = merged[0]
+                for other in merged[1:]:
+                    chain.extend(other)
+                    chains.remove(other)
+                    for member in other:
+                        chain_of[member.name] = chain
+                chain.sort(key=self.steps.index)
+            chain.append(step)
+            chain_of[step.name] = chain
+        return chains
+    
+    def shard(self, index, count):
+        """Return shard index (1-based) of count, splitting whole chains so no step loses its page state"""
+        if count < 1 or not 1 <= index <= count:
+            raise ScenarioError(f"Shard {index}/{count} is out of range")
+        # Deal out the longest chains first so shards end up with similar step counts
+        loads = [[] for _ in range(count)]
+        for chain in sorted(self.chains(), key=len, reverse=True):
+            min(loads, key=len).extend(chain)
+        kept = {step.name for step in loads[index - 1]}
+        return Scenario(self.name, [step for step in self.steps if step.name in kept], self.description,
+                        self.source)
+
+
+def parse_shard(value):
+    """Read a shard written as "I/N", e.g. "2/3" for the second of three shards"""
+    try:
+        index, count = (int(part) for part in str(value).split("/"))
+    except ValueError:
+        raise ScenarioError(f"Shard must look like 2/3, not {value}")
+    if count < 1 or not 1 <= index <= count:
+        raise ScenarioError(f"Shard {value} is out of range")
+    return index, count
+
+
+def render(template, context):
+    """Fill {placeholders} in a step's URL, script or name from a case's context"""
+    if template is None:
+        return None
+    
+    def replace(match):
+        name = match.group(1)
+        if name not in context:
+            raise ScenarioError(f"Unknown placeholder {{{name}}} in {template}")
+        return str(context[name])
+    return PLACEHOLDER.sub(replace, template)
+
+
+class ScenarioRunner:
+    """Runs a scenario's steps on an OncorePage, filling URL, script and name templates from a context"""
+    
+    def __init__(self, oncore_page, context):
+        self.page = oncore_page
+        self.driver = oncore_page.driver
+        # base_url, protocol_no, protocol_id, subject_mrn and arm_name for the case being measured
+        self.context = context
+        self.results = {}
+    
+    def render(self, template):
+        """Fill {placeholders} from the context, leaving other braces (e.g. in scripts) alone"""
+        return render(template, self.context)
+    
+    def locator(self, value):
+        """Turn ["xpath", "..."] or an OncorePage locator name such as "CLOSE_BUTTON" into a (By, value) tuple"""
+        if value is None:
+            return None
+        if isinstance(value, str):
+            locator = getattr(OncorePage, value, None)
+            if not isinstance(locator, tuple):
+                raise ScenarioError(f"OncorePage has no locator {value}")
+            return locator
+        by, query = value
+        return by, self.render(query)
+    
+    def run(self, scenario):
+        """Run every step in order; returns {step name: passed/failed/skipped}
+        
+        A failed step is recorded with its error and the scenario goes on; only the steps that require
+        it are skipped, so one broken page does not cost the measurements of the independent ones.
+        """
+        print(f"Running scenario {scenario.name} ({len(scenario.steps)} steps)")
+        # Windows already open are not popups of this scenario
+        self.page.windows.refresh()
+        try:
+            for step in scenario.steps:
+                self.run_step(step)
+        finally:
+            self.return_to_main_window()
+        return self.results
+    
+    def _row_name(self, step):
+        """Name a failed or skipped step's row after its measurement, so it lines up with the timings"""
+        try:
+            return self._measure_name(step) or step.name
+        except ScenarioError:
+            return step.name
+    
+    def run_step(self, step):
+        """Run one step unless a step it requires did not pass; a failure is recorded instead of raised"""
+        blocked = [name for name in step.requires if self.results.get(name, PASSED) != PASSED]
+        if blocked:
+            print(f"Skipping {step.name}: {', '.join(blocked)} did not complete")
+            self.results[step.name] = SKIPPED
+            self.page.record_failure(self._row_name(step), f"Requires {', '.join(blocked)}", status=SKIPPED)
+            return SKIPPED
+        
+        print(f"{self.render(step.description) or step.name}...")
+        if step.screenshot:
+            self.page.screenshot(step.screenshot, step=step.name)
+        try:
+            getattr(self, f"_{step.action}")(step)
+        except Exception as e:
+            self.results[step.name] = FAILED
+            print(f"Error in step {step.name}: {str(e)}")
+            if step.error_screenshot or self.page.screenshots is not None:
+                self.page.screenshot(step.error_screenshot or f"{step.name}_failed.png", step=step.name, failure=True)
+            self.page.record_failure(self._row_name(step), e)
+            if step.optional:
+                print(f"{step.name} is optional, continuing with the scenario")
+            return FAILED
+        self.results[step.name] = PASSED
+        return PASSED
+    
+    def return_to_main_window(self):
+        """Switch back to the window the scenario started in, e.g. after a popup step failed"""
+        self.page.windows.return_to_first()
+    
+    def _measure_name(self, step):
+        return self.render(step.measure)
+    
+    def _find(self, step):
+        """Find the element a click step acts on"""
+        if step.find:
+            return FINDERS[step.find](self.page, step, self.context)
+        if step.locators:
+            locators = [self.locator(value) for value in step.locators]
+            strategies = [(f"{by}={query}", (by, query)) for by, query in locators]
+            return self.page.locators.resolve(step.name, strategies, timeout=step.timeout)
+        return self.page.wait_for_clickable(self.locator(step.locator), timeout=step.timeout)
+    
+    def _navigate(self, step):
+        self.page.navigate_to(self.render(step.url), ready_locator=self.locator(step.ready))
+        if step.measure:
+            self.page.measure_page_load(self._measure_name(step))
+    
+    def _script(self, step):
+        script = self.render(step.script)
+        if step.measure:
+            self.page.measure_script(self._measure_name(step), script, self.locator(step.ready))
+        else:
+            self.page.execute_script(script, self.locator(step.ready))
+    
+    def _click(self, step):
+        element = self._find(step)
+        if step.measure:
+            self.page.measure_action(self._measure_name(step), lambda: self.page.click_with_fallback(element),
+                                     self.locator(step.ready))
+        else:
+            self.page.click_with_fallback(element)
+            self.page.wait_between_actions(locator=self.locator(step.ready))
+    
+    def _select(self, step):
+        dropdown = Select(self.page.wait_for_element(self.locator(step.locator), timeout=step.timeout))
+        text = self.render(step.text)
+        if step.measure:
+            self.page.measure_action(self._measure_name(step), lambda: dropdown.select_by_visible_text(text),
+                                     self.locator(step.ready))
+        else:
+            dropdown.select_by_visible_text(text)
+            self.page.wait_between_actions(locator=self.locator(step.ready))
+    
+    def _switch_window(self, step):
+        # Timed from the step that opened the window; the window may already be open by now
+        measure_name = self._measure_name(step) if step.measure else None
+        self.page.handle_new_window(measure_name, self.locator(step.ready), timeout=step.timeout)
+    
+    def _close_window(self, step):
+        if not self.page.windows.openers:
+            raise ScenarioError(f"Step {step.name} has no window to return to")
+        self.page.close_and_return(ready_locator=self.locator(step.ready))
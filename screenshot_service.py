@@ -0,0 +1,243 @@
+from datetime import datetime
+import atexit
+import base64
+import csv
+import io
+import os
+import queue
+import random
+import re
+import threading
+import time
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is only needed to store screenshots as JPEG
+    Image = None
+
+
+# When screenshots are taken: every request, only when a step fails, a random share of requests, or never
+ALWAYS = "always"
+ON_FAILURE = "on-failure"
+SAMPLED = "sampled"
+OFF = "off"
+MODES = [ALWAYS, ON_FAILURE, SAMPLED, OFF]
+
+# Columns of the index that links every file to its run, iteration and step
+INDEX_FIELDNAMES = ['timestamp', 'run_id', 'iteration', 'worker_id', 'step', 'name', 'reason', 'path', 'bytes']
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+
+def _safe(value):
+    """Keep a name usable as part of a file name"""
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", str(value)).strip("_") or "screenshot"
+
+
+class ScreenshotService:
+    """Takes screenshots without writing them on the test's thread, and keeps the directory within limits
+    
+    The browser has to be asked for the image on the calling thread, but decoding, optional JPEG
+    encoding, the disk write, the index entry and retention all happen on a background thread.
+    """
+    
+    def __init__(self, directory="screenshots", mode=ON_FAILURE, sample_rate=0.1, image_format="png",
+                 jpeg_quality=70, max_files=None, max_mb=None, max_age_days=None, queue_size=32, seed=None,
+                 retention_interval=10):
+        if mode not in MODES:
+            raise ValueError(f"Unknown screenshot mode '{mode}', expected one of: {', '.join(MODES)}")
+        if image_format not in ("png", "jpeg"):
+            raise ValueError("image_format must be 'png' or 'jpeg'")
+        if image_format == "jpeg" and Image is None:
+            print("Pillow is not installed (pip install pillow); saving screenshots as PNG")
+            image_format = "png"
+        self.directory = directory
+        self.mode = mode
+        self.sample_rate = sample_rate
+        self.image_format = image_format
+        self.jpeg_quality = jpeg_quality
+        self.max_files = max_files
+        self.max_mb = max_mb
+        self.max_age_days = max_age_days
+        # Retention walks the whole directory, so only check it every few writes (and on close)
+        self.retention_interval = retention_interval
+        self.index_file = os.path.join(directory, "index.csv")
+        self._random = random.Random(seed)
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._counter_lock = threading.Lock()
+        self.taken = 0
+        self.skipped = 0
+        self.dropped = 0
+    
+    def should_capture(self, failure=False):
+        """Decide whether a screenshot is wanted in the current mode"""
+        if self.mode == OFF:
+            return False
+        if failure or self.mode == ALWAYS:
+            return True
+        if self.mode == SAMPLED:
+            with self._counter_lock:
+                return self._random.random() < self.sample_rate
+        return False
+    
+    def path_for(self, name, run_id=None, iteration=None, worker_id=None, step=None):
+        """File the screenshot will be written to: one folder per run, names prefixed by iteration and step"""
+        parts = []
+        if iteration is not None:
+            parts.append(f"i{iteration:03d}" if isinstance(iteration, int) else f"i{iteration}")
+        if worker_id is not None:
+            parts.append(f"w{worker_id}")
+        if step:
+            parts.append(_safe(step))
+        parts.append(datetime.now().strftime("%H%M%S%f"))
+        parts.append(_safe(os.path.splitext(os.path.basename(name))[0]))
+        extension = ".jpg" if self.image_format == "jpeg" else ".png"
+        return os.path.join(self.directory, _safe(run_id or "adhoc"), "-".join(parts) + extension)
+    
+    def capture(self, driver, name, run_id=None, iteration=None, worker_id=None, step=None, failure=False):
+        """Grab a screenshot if the mode wants one and queue it for writing; returns the future path or None"""
+        if not self.should_capture(failure):
+            with self._counter_lock:
+                self.skipped += 1
+            return None
+        # Only the transfer from the browser happens here; the base64 text is decoded in the background
+        data = driver.get_screenshot_as_base64()
+        path = self.path_for(name, run_id, iteration, worker_id, step)
+        job = {
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'run_id': run_id,
+            'iteration': iteration,
+            'worker_id': worker_id,
+            'step': step,
+            'name': name,
+            'reason': "failure" if failure else self.mode,
+            'path': path,
+            'data': data
+        }
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            # Never let a slow disk hold up the test; losing a debug screenshot is the cheaper failure
+            with self._counter_lock:
+                self.dropped += 1
+            print(f"Screenshot queue is full, dropped {name}")
+            return None
+        with self._counter_lock:
+            self.taken += 1
+        return path
+    
+    def _ensure_started(self):
+        """Start the writer thread on first use"""
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._write_loop, name="screenshot-writer", daemon=True)
+                self._thread.start()
+    
+    def _write_loop(self):
+        """Write queued screenshots until close() sends None"""
+        written = 0
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    self.apply_retention()
+                    return
+                self._write(job)
+                written += 1
+                if written % self.retention_interval == 0:
+                    self.apply_retention()
+            except Exception as e:
+                print(f"Could not save screenshot {job.get('path') if job else ''}: {str(e)}")
+            finally:
+                self._queue.task_done()
+    
+    def _write(self, job):
+        """Decode, optionally re-encode, save and index one screenshot"""
+        image = base64.b64decode(job.pop('data'))
+        if self.image_format == "jpeg":
+            output = io.BytesIO()
+            Image.open(io.BytesIO(image)).convert("RGB").save(output, "JPEG", quality=self.jpeg_quality, optimize=True)
+            image = output.getvalue()
+        os.makedirs(os.path.dirname(job['path']), exist_ok=True)
+        with open(job['path'], "wb") as f:
+            f.write(image)
+        job['bytes'] = len(image)
+        
+        write_header = not os.path.exists(self.index_file)
+        with open(self.index_file, "a", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=INDEX_FIELDNAMES)
+            if write_header:
+                writer.writeheader()
+            writer.writerow(job)
+    
+    def _files(self):
+        """Every screenshot under the directory as (modified time, size, path), oldest first"""
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.lower().endswith(IMAGE_EXTENSIONS):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, path))
+        return sorted(files)
+    
+    def apply_retention(self):
+        """Delete the oldest screenshots beyond the age, count and size limits; returns how many were removed"""
+        if self.max_files is None and self.max_mb is None and self.max_age_days is None:
+            return 0
+        files = self._files()
+        doomed = []
+        if self.max_age_days is not None:
+            cutoff = time.time() - self.max_age_days * 86400
+            doomed = [entry for entry in files if entry[0] < cutoff]
+            files = files[len(doomed):]
+        total = sum(size for _, size, _ in files)
+        while files and ((self.max_files is not None and len(files) > self.max_files)
+                         or (self.max_mb is not None and total > self.max_mb * 1024 * 1024)):
+            entry = files.pop(0)
+            total -= entry[1]
+            doomed.append(entry)
+        for _, _, path in doomed:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        return len(doomed)
+    
+    def flush(self):
+        """Wait until every queued screenshot is on disk"""
+        if self._thread is not None:
+            self._queue.join()
+    
+    def close(self):
+        """Write what is still queued, stop the writer thread and print a short summary"""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self._thread = None
+        if self.taken or self.dropped:
+            print(f"Screenshots: {self.taken} saved to {self.directory}, {self.skipped} skipped ({self.mode}), "
+                  f"{self.dropped} dropped")
+
+
+# Shared service for ad-hoc screenshots such as SeleniumUtils.take_timestamped_screenshot. It has its own
+# directory and index, so its retention never deletes a run's screenshots and the two never write one index.
+ADHOC_DIRECTORY = os.path.join("screenshots", "adhoc")
+_default_service = None
+_default_lock = threading.Lock()
+
+
+def default_service():
+    """A process-wide service that always captures and keeps the newest 200 files in screenshots/adhoc/"""
+    global _default_service
+    with _default_lock:
+        if _default_service is None:
+            _default_service = ScreenshotService(ADHOC_DIRECTORY, mode=ALWAYS, max_files=200)
+            atexit.register(_default_service.close)
+        return _default_service
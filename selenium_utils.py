@@ -1,54 +1,109 @@
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.action_chains import ActionChains
-import os
-import datetime
-
-
-class SeleniumUtils:
-    """Utility class for common Selenium operations"""
-    
-    def __init__(self, driver):
-        self.driver = driver
-        self.wait = WebDriverWait(self.driver, 10)
-        self.actions = ActionChains(self.driver)
-    
-    def wait_for_element(self, locator, timeout=10):
-        """Wait for an element to be present and visible"""
-        wait = WebDriverWait(self.driver, timeout)
-        return wait.until(EC.visibility_of_element_located(locator))
-    
-    def wait_for_clickable(self, locator, timeout=10):
-        """Wait for an element to be clickable"""
-        wait = WebDriverWait(self.driver, timeout)
-        return wait.until(EC.element_to_be_clickable(locator))
-    
-    def safe_click(self, locator, timeout=10):
-        """Safely click on an element after ensuring it's clickable"""
-        element = self.wait_for_clickable(locator, timeout)
-        element.click()
-        return element
-    
-    def take_timestamped_screenshot(self, prefix="screenshot"):
-        """Take a screenshot with a timestamp in the filename"""
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        screenshots_dir = "screenshots"
-        
-        # Create screenshots directory if it doesn't exist
-        if not os.path.exists(screenshots_dir):
-            os.makedirs(screenshots_dir)
-        
-        # Generate the filename with timestamp
-        filename = f"{screenshots_dir}/{prefix}_{timestamp}.png"
-        self.driver.save_screenshot(filename)
-        return filename
-    
-    def scroll_to_element(self, element):
-        """Scroll to an element to make it visible"""
-        self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
-        return element
-    
-    def hover_over_element(self, element):
-        """Hover over an element"""
-        self.actions.move_to_element(element).perform()
-        return element
\ No newline at end of file
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.common.action_chains import ActionChains
+from readiness import locator_to_query
+from screenshot_service import default_service
+
+
+# Describes many elements in one round trip instead of one WebDriver call per property per element.
+# arguments[0] is a list of elements, or null to query arguments[1] ([kind, query]) inside the page.
+SNAPSHOT_JS = """
+var elements = arguments[0], query = arguments[1], limit = arguments[2];
+if (elements === null) {
+    elements = [];
+    if (query[0] === 'xpath') {
+        var result = document.evaluate(query[1], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        for (var i = 0; i < result.snapshotLength; i++) {
+            if (result.snapshotItem(i).nodeType === 1) {
+                elements.push(result.snapshotItem(i));
+            }
+        }
+    } else {
+        elements = Array.prototype.slice.call(document.querySelectorAll(query[1]));
+    }
+}
+return elements.map(function (element) {
+    var style = window.getComputedStyle(element);
+    return {
+        element: element,
+        tag: element.tagName.toLowerCase(),
+        text: (element.innerText || element.textContent || '').trim().slice(0, limit),
+        html: element.outerHTML.slice(0, limit),
+        href: element.getAttribute('href'),
+        onclick: element.getAttribute('onclick'),
+        value: element.value === undefined ? null : String(element.value),
+        displayed: element.getClientRects().length > 0 && style.visibility !== 'hidden' && style.display !== 'none',
+        enabled: !element.disabled
+    };
+});
+"""
+
+
+def snapshot_elements(driver, target, limit=300):
+    """Return tag, text, HTML, href, onclick, value, displayed and enabled for many elements in one call
+    
+    target is a (By, value) locator, looked up inside the page, or a list of WebElements already found.
+    Each snapshot keeps the element under 'element' so it can still be clicked. Text and HTML are cut
+    to limit characters; displayed is the browser's layout check, close to but cheaper than is_displayed().
+    """
+    if isinstance(target, tuple):
+        return driver.execute_script(SNAPSHOT_JS, None, list(locator_to_query(target)), limit)
+    if not target:
+        return []
+    return driver.execute_script(SNAPSHOT_JS, list(target), None, limit)
+
+
+def format_snapshot(snapshot):
+    """Render a snapshot as the indented debug lines the tests print"""
+    lines = [f"- Tag: {snapshot['tag']}", f"- Text content: {snapshot['text']}", f"- HTML: {snapshot['html']}"]
+    for name in ('href', 'onclick', 'value'):
+        if snapshot[name]:
+            lines.append(f"- {name}: {snapshot[name]}")
+    lines.append(f"- Is displayed: {snapshot['displayed']}, is enabled: {snapshot['enabled']}")
+    return "\n".join(lines)
+
+
+class SeleniumUtils:
+    """Utility class for common Selenium operations"""
+    
+    def __init__(self, driver, screenshots=None):
+        self.driver = driver
+        # screenshot_service.ScreenshotService; the shared default keeps screenshots/adhoc/ to its newest 200 files
+        self.screenshots = screenshots
+        self.wait = WebDriverWait(self.driver, 10)
+        self.actions = ActionChains(self.driver)
+    
+    def wait_for_element(self, locator, timeout=10):
+        """Wait for an element to be present and visible"""
+        wait = WebDriverWait(self.driver, timeout)
+        return wait.until(EC.visibility_of_element_located(locator))
+    
+    def wait_for_clickable(self, locator, timeout=10):
+        """Wait for an element to be clickable"""
+        wait = WebDriverWait(self.driver, timeout)
+        return wait.until(EC.element_to_be_clickable(locator))
+    
+    def safe_click(self, locator, timeout=10):
+        """Safely click on an element after ensuring it's clickable"""
+        element = self.wait_for_clickable(locator, timeout)
+        element.click()
+        return element
+    
+    def take_timestamped_screenshot(self, prefix="screenshot"):
+        """Take a screenshot with a timestamp in the filename; it is written in the background"""
+        service = self.screenshots or default_service()
+        return service.capture(self.driver, prefix, failure=True)
+    
+    def scroll_to_element(self, element):
+        """Scroll to an element to make it visible"""
+        self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
+        return element
+    
+    def hover_over_element(self, element):
+        """Hover over an element"""
+        self.actions.move_to_element(element).perform()
+        return element
+    
+    def snapshot_elements(self, target, limit=300):
+        """Describe every element matching a locator, or a list of elements, in one round trip"""
+        return snapshot_elements(self.driver, target, limit)
@@ -0,0 +1,172 @@
+from selenium.common.exceptions import WebDriverException
+import threading
+import time
+
+
+# Returns the current origin's localStorage and sessionStorage as plain objects
+STORAGE_SNAPSHOT_JS = """
+function dump(storage) {
+    var items = {};
+    for (var i = 0; i < storage.length; i++) {
+        var key = storage.key(i);
+        items[key] = storage.getItem(key);
+    }
+    return items;
+}
+return {local: dump(window.localStorage), session: dump(window.sessionStorage)};
+"""
+
+# Writes a storage snapshot back into the current origin
+STORAGE_RESTORE_JS = """
+var snapshot = arguments[0];
+Object.keys(snapshot.local).forEach(function (key) { window.localStorage.setItem(key, snapshot.local[key]); });
+Object.keys(snapshot.session).forEach(function (key) { window.sessionStorage.setItem(key, snapshot.session[key]); });
+"""
+
+# Cookie fields accepted by the DevTools Network.setCookies command
+COOKIE_PARAMS = ['name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'sameSite', 'expires']
+
+
+class SessionCache:
+    """Logs in once per environment, user and slot, then replays the authenticated session into later drivers
+    
+    A slot is one simulated user, e.g. a load worker or a lane. Replaying one login into browsers that run
+    at the same time would make them share a single OnCore server session: they would overwrite each
+    other's protocol and subject selection and contend for it, so concurrent slots each log in once.
+    """
+    
+    # Unmeasured page used to confirm a restored session is still signed in
+    CHECK_PATH = "/smrs/SMRSHomePageServlet?hdn_function=WELCOME"
+    
+    def __init__(self, max_age=None, check_path=CHECK_PATH):
+        self.max_age = max_age
+        self.check_path = check_path
+        self._sessions = {}
+        self._login_locks = {}
+        self._lock = threading.Lock()
+        self.logins = 0
+        self.reuses = 0
+    
+    def _login_lock(self, key):
+        """One lock per cache key so a slot never logs in twice at once"""
+        with self._lock:
+            return self._login_locks.setdefault(key, threading.Lock())
+    
+    def _get(self, key):
+        """Return the cached snapshot for an (environment, username, slot) key, if any"""
+        with self._lock:
+            return self._sessions.get(key)
+    
+    def invalidate(self, base_url, username, slot=None):
+        """Forget the cached session so the next caller logs in again"""
+        with self._lock:
+            self._sessions.pop((base_url, username, slot), None)
+    
+    def is_expired(self, snapshot):
+        """Check the snapshot's age and cookie expiry without touching a browser"""
+        now = time.time()
+        if self.max_age is not None and now - snapshot['captured_at'] > self.max_age:
+            return True
+        return snapshot['expires_at'] is not None and now >= snapshot['expires_at']
+    
+    def capture(self, driver, base_url, username, slot=None):
+        """Save the cookies and storage of a driver that has just logged in"""
+        if hasattr(driver, "execute_cdp_cmd"):
+            # DevTools sees the cookies of every domain, including the single sign-on server's
+            cookies = driver.execute_cdp_cmd("Network.getAllCookies", {})['cookies']
+            via_devtools = True
+        else:
+            cookies = driver.get_cookies()
+            via_devtools = False
+        storage = driver.execute_script(STORAGE_SNAPSHOT_JS) or {'local': {}, 'session': {}}
+        
+        # Persistent cookies report an expiry; session cookies (-1 or missing) last as long as the server allows
+        expiries = [c.get('expires', c.get('expiry')) for c in cookies]
+        expiries = [e for e in expiries if e is not None and e > 0]
+        snapshot = {
+            'cookies': cookies,
+            'via_devtools': via_devtools,
+            'storage': storage,
+            'captured_at': time.time(),
+            'expires_at': min(expiries) if expiries else None
+        }
+        with self._lock:
+            self._sessions[(base_url, username, slot)] = snapshot
+        return snapshot
+    
+    def restore(self, driver, base_url, snapshot):
+        """Load a captured session into a driver; returns False when the driver could not take it"""
+        try:
+            if snapshot['via_devtools']:
+                cookies = []
+                for cookie in snapshot['cookies']:
+                    params = {name: cookie[name] for name in COOKIE_PARAMS if name in cookie}
+                    if params.get('expires', -1) <= 0:
+                        params.pop('expires', None)
+                    cookies.append(params)
+                driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+            else:
+                # Without DevTools cookies can only be added for the page currently loaded
+                driver.get(base_url)
+                for cookie in snapshot['cookies']:
+                    driver.add_cookie(cookie)
+        except WebDriverException as e:
+            print(f"Could not restore the cached session: {str(e)}")
+            return False
+        return True
+    
+    def clear(self, driver):
+        """Drop restored cookies that turned out to be stale before logging in from scratch"""
+        if hasattr(driver, "execute_cdp_cmd"):
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        else:
+            driver.delete_all_cookies()
+    
+    def is_signed_in(self, oncore_page):
+        """Open the home page and check OnCore did not send us back to the login page"""
+        oncore_page.navigate_to(f"{oncore_page.base_url}{self.check_path}")
+        return "login" not in oncore_page.driver.current_url.lower()
+    
+    def _try_reuse(self, oncore_page, snapshot):
+        """Restore a snapshot and confirm it is still signed in, restoring storage once on the origin"""
+        if snapshot is None or self.is_expired(snapshot):
+            return False
+        driver = oncore_page.driver
+        if not self.restore(driver, oncore_page.base_url, snapshot) or not self.is_signed_in(oncore_page):
+            return False
+        storage = snapshot['storage']
+        if storage['local'] or storage['session']:
+            driver.execute_script(STORAGE_RESTORE_JS, storage)
+        with self._lock:
+            self.reuses += 1
+        return True
+    
+    def sign_in(self, oncore_page, username, login, slot=None):
+        """Reuse the cached session for this environment and user, calling login() only when needed
+        
+        login is the full, measured login sequence; it runs on the first call and again whenever
+        the cached session has expired. slot keeps the sessions of concurrent users apart.
+        Returns True when a cached session was reused.
+        """
+        key = (oncore_page.base_url, username, slot)
+        snapshot = self._get(key)
+        if self._try_reuse(oncore_page, snapshot):
+            print(f"Reused authenticated session for {username}")
+            return True
+        
+        with self._login_lock(key):
+            # Another iteration of this slot may have logged in while we waited for the lock
+            current = self._get(key)
+            if current is not None and current is not snapshot and self._try_reuse(oncore_page, current):
+                print(f"Reused authenticated session for {username}")
+                return True
+            
+            if snapshot is not None or current is not None:
+                print(f"Cached session for {username} has expired, logging in again")
+                self.clear(oncore_page.driver)
+            self.invalidate(*key)
+            login()
+            self.capture(oncore_page.driver, *key)
+            with self._lock:
+                self.logins += 1
+        return False
@@ -0,0 +1,108 @@
+from scenario import Scenario, ScenarioRunner
+import threading
+import time
+
+
+class StepScheduler:
+    """Measures a scenario's independent step chains at the same time, one authenticated browser per lane
+    
+    Steps linked through `requires` (e.g. SubjectVisit -> Calendar -> OnStudy) form a chain that runs in
+    order in one browser; chains that share no page state are spread over the lanes. open_lane(lane) returns
+    a signed-in OncorePage for a lane number starting at 1, and close_lane(lane, page) hands it back.
+    """
+    
+    # Seconds each chain took last time, keyed by (scenario, first step), so the longest chains start first
+    _durations = {}
+    _durations_lock = threading.Lock()
+    
+    def __init__(self, open_lane, close_lane, context, lanes=2):
+        self.open_lane = open_lane
+        self.close_lane = close_lane
+        self.context = context
+        self.lanes = lanes
+    
+    def _estimate(self, scenario, chain):
+        """Last observed duration of a chain, or its step count times the average step time seen so far"""
+        with self._durations_lock:
+            known = self._durations.get((scenario.name, chain[0].name))
+            per_step = [seconds / steps for seconds, steps in self._durations.values()]
+        if known is not None:
+            return known[0]
+        return len(chain) * (sum(per_step) / len(per_step) if per_step else 1.0)
+    
+    def plan(self, scenario):
+        """Order the scenario's chains longest first, so no lane is left with one long chain at the end"""
+        return sorted(scenario.chains(), key=lambda chain: self._estimate(scenario, chain), reverse=True)
+    
+    def run(self, scenario):
+        """Run every chain across the lanes; returns {step name: status}, raising only when chains could not run"""
+        pending = self.plan(scenario)
+        lanes = max(1, min(self.lanes, len(pending)))
+        print(f"Scheduling {len(scenario.steps)} steps as {len(pending)} independent chain(s) on {lanes} lane(s)")
+        
+        lock = threading.Lock()
+        results = {}
+        errors = []
+        lane_errors = []
+        busy_seconds = []
+        
+        def next_chain():
+            with lock:
+                return pending.pop(0) if pending else None
+        
+        def lane_worker(lane):
+            try:
+                page = self.open_lane(lane)
+            except Exception as e:
+                # The other lanes pick up this lane's share of the chains
+                print(f"Lane {lane} could not start: {str(e)}")
+                with lock:
+                    lane_errors.append(e)
+                return
+            try:
+                while True:
+                    chain = next_chain()
+                    if chain is None:
+                        break
+                    runner = ScenarioRunner(page, self.context)
+                    started = time.monotonic()
+                    try:
+                        runner.run(Scenario(scenario.name, chain, scenario.description, scenario.source))
+                    except Exception as e:
+                        # A chain starts from a fresh navigation, so the lane can carry on with the next one
+                        print(f"Lane {lane}: chain starting at {chain[0].name} failed: {str(e)}")
+                        with lock:
+                            errors.append(e)
+                    else:
+                        with self._durations_lock:
+                            self._durations[(scenario.name, chain[0].name)] = (time.monotonic() - started, len(chain))
+                    finally:
+                        with lock:
+                            results.update(runner.results)
+                            busy_seconds.append(time.monotonic() - started)
+            finally:
+                try:
+                    self.close_lane(lane, page)
+                except Exception as e:
+                    # An exception escaping here would end the thread with only a traceback; log it and keep the results
+                    print(f"Lane {lane} could not be closed: {str(e)}")
+                    with lock:
+                        lane_errors.append(e)
+        
+        started = time.monotonic()
+        threads = [threading.Thread(target=lane_worker, args=(lane,), name=f"oncore-lane-{lane}")
+                   for lane in range(1, lanes + 1)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+        
+        print(f"Ran {len(busy_seconds)} chain(s) in {elapsed:.1f}s of wall-clock time "
+              f"({sum(busy_seconds):.1f}s if run one after another)")
+        if pending:
+            print(f"{len(pending)} chain(s) were not run because no lane could start")
+            errors.extend(lane_errors or [RuntimeError(f"{len(pending)} chain(s) were not run")])
+        if errors:
+            raise errors[0]
+        return results
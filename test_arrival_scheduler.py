@@ -0,0 +1,56 @@
+from arrival_scheduler import ArrivalProfile, ArrivalScheduler
+import unittest
+
+
+class ArrivalProfileTest(unittest.TestCase):
+    """Start offsets of open-loop arrival profiles (rates are per minute)"""
+    
+    def test_constant(self):
+        """Evenly spaced starts, the first one at the beginning of the run"""
+        self.assertEqual(ArrivalProfile("constant:60").arrivals(5), [0, 1, 2, 3, 4])
+        self.assertEqual(ArrivalProfile("constant:30").arrivals(5), [0, 2, 4])
+    
+    def test_step(self):
+        """Each rate is held for the step length, the last one until the end"""
+        self.assertEqual(ArrivalProfile("step:60,120:2").arrivals(4), [0, 1, 2, 2.5, 3, 3.5])
+    
+    def test_spike(self):
+        """The peak rate applies only inside the spike"""
+        profile = ArrivalProfile("spike:60:120:2:1")
+        self.assertEqual(profile.arrivals(5), [0, 1, 2, 2.5, 3, 4])
+        self.assertEqual([profile.rate_at(offset) for offset in (0, 2, 2.9, 3)], [60, 120, 120, 60])
+    
+    def test_poisson(self):
+        """Random starts average the requested rate and repeat for the same seed"""
+        arrivals = ArrivalProfile("poisson:60", seed=3).arrivals(1000)
+        self.assertEqual(arrivals, ArrivalProfile("poisson:60", seed=3).arrivals(1000))
+        self.assertAlmostEqual(len(arrivals), 1000, delta=100)
+        self.assertEqual(arrivals, sorted(arrivals))
+    
+    def test_invalid(self):
+        """Unknown kinds, malformed specs and rates that never start anything are rejected"""
+        for spec in ["linear:60", "constant", "constant:fast", "step:60:2:3", "constant:0", "constant:-5"]:
+            with self.assertRaises(ValueError, msg=spec):
+                ArrivalProfile(spec)
+
+
+class ArrivalSchedulerTest(unittest.TestCase):
+    """Dispatching arrivals to slots"""
+    
+    def test_failed_arrival_keeps_its_slot(self):
+        """An arrival that raises is recorded as failed and the slot goes on to the next one"""
+        ran = []
+        
+        def run_arrival(slot, sequence, start_lag_ms):
+            ran.append(sequence)
+            if sequence == 1:
+                raise RuntimeError("no browser")
+        
+        scheduler = ArrivalScheduler(ArrivalProfile("constant:6000"), 0.025, 1, run_arrival)
+        scheduler.run()
+        self.assertEqual(ran, [1, 2, 3])
+        self.assertEqual(scheduler.failures, [(1, "no browser")])
+
+
+if __name__ == "__main__":
+    unittest.main()
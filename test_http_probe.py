@@ -0,0 +1,66 @@
+from http_probe import HttpProbe
+from performance_results import PASSED, FAILED
+import http.server
+import socket
+import threading
+import unittest
+
+
+class StatusHandler(http.server.BaseHTTPRequestHandler):
+    """Answers /status/CODE with that status code and a short body"""
+    
+    def do_GET(self):
+        status = int(self.path.rsplit("/", 1)[-1])
+        self.send_response(status)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def unused_port():
+    """A local port nothing listens on"""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class HttpProbeTest(unittest.TestCase):
+    """Status of probe rows, and requests that get no response"""
+    
+    def setUp(self):
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StatusHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        self.probe = HttpProbe([], self.base_url, concurrency=2)
+        self.addCleanup(self.probe.close)
+    
+    def test_status_from_http_code(self):
+        """2xx responses pass; other codes fail but keep their timings"""
+        rows = self.probe.run([("Home", f"{self.base_url}/status/200"), ("Broken", f"{self.base_url}/status/500")],
+                              samples=2)
+        by_page = {}
+        for row in rows:
+            by_page.setdefault(row['page'], []).append(row)
+        self.assertEqual([row['status'] for row in by_page['Home']], [PASSED, PASSED])
+        self.assertEqual([row['status'] for row in by_page['Broken']], [FAILED, FAILED])
+        self.assertEqual(by_page['Broken'][0]['error'], "HTTP 500")
+        self.assertIsNotNone(by_page['Broken'][0]['load_time_ms'])
+        self.assertEqual(self.probe.failures, 2)
+    
+    def test_unreachable_url_during_warm_up(self):
+        """A request that gets no response is a failed row instead of an exception; warm-up ones are only counted"""
+        rows = self.probe.run([("Down", f"http://127.0.0.1:{unused_port()}/")], samples=1)
+        self.assertEqual([(row['iteration'], row['status']) for row in rows], [(1, FAILED)])
+        self.assertIsNone(rows[0]['load_time_ms'])
+        self.assertEqual((self.probe.failures, self.probe.warm_up_failures), (1, 1))
+        # The summary only covers rows with timings
+        self.probe.print_summary()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+from live_metrics import LatencyHistogram, LiveMetrics
+import unittest
+
+
+class LatencyHistogramTest(unittest.TestCase):
+    """Bucketing and percentiles of the live metrics histogram"""
+    
+    def test_value_on_a_bound_counts_at_that_bound(self):
+        """Prometheus buckets are 'less than or equal', so 100.0 belongs in le=100"""
+        histogram = LatencyHistogram()
+        for _ in range(10):
+            histogram.record(100.0)
+        self.assertEqual(histogram.count_at_or_below(100), 10)
+        self.assertEqual(histogram.count_at_or_below(99), 0)
+    
+    def test_bounds_above_the_linear_range(self):
+        """Bounds on three-significant-digit edges are exact, including the edge itself"""
+        histogram = LatencyHistogram()
+        for value in [999.5, 1000.0, 1000.1, 2500.0, 2500.1]:
+            histogram.record(value)
+        self.assertEqual(histogram.count_at_or_below(1000), 2)
+        self.assertEqual(histogram.count_at_or_below(2500), 4)
+        self.assertEqual(histogram.count_at_or_below(60000), 5)
+    
+    def test_percentiles_within_one_percent(self):
+        """Percentiles of 1..10000 ms stay within the histogram's 1% resolution"""
+        histogram = LatencyHistogram()
+        for value in range(1, 10001):
+            histogram.record(value)
+        self.assertEqual(histogram.percentile(50), 5000)
+        self.assertAlmostEqual(histogram.percentile(95), 9500, delta=95)
+        self.assertEqual(histogram.percentile(100), 10000)
+        self.assertIsNone(LatencyHistogram().percentile(50))
+
+
+class LiveMetricsTest(unittest.TestCase):
+    """Rows fed into the registry and their Prometheus exposition"""
+    
+    def test_rows_and_failures(self):
+        """Timings go to the page histogram, failed and skipped rows to the failure counter"""
+        metrics = LiveMetrics()
+        for load_time in [100.0, 200.0, 300.0]:
+            metrics.observe({'environment': 'crmsdev', 'page': 'CovA', 'transition': 'navigation',
+                             'load_time_ms': load_time, 'status': 'passed'})
+        metrics.observe({'environment': 'crmsdev', 'page': 'Proc', 'load_time_ms': None, 'status': 'failed'})
+        
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['measurements'], 3)
+        self.assertEqual(snapshot['failures'], 1)
+        pages = {page['page']: page for page in snapshot['pages']}
+        self.assertEqual(pages['CovA']['p50_ms'], 200)
+        self.assertEqual(pages['CovA']['rolling_p95_ms'], 300.0)
+        self.assertEqual(pages['Proc']['failures'], 1)
+        
+        text = metrics.prometheus()
+        self.assertIn('oncore_page_load_milliseconds_bucket{environment="crmsdev",page="CovA",'
+                      'transition="navigation",le="100"} 1', text)
+        self.assertIn('oncore_page_load_milliseconds_count{environment="crmsdev",page="CovA",'
+                      'transition="navigation"} 3', text)
+        self.assertIn('oncore_step_failures_total{environment="crmsdev",page="Proc",status="failed"} 1', text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+from performance_sink import CsvPerformanceSink
+from performance_results import FIELDNAMES, upgrade_csv_header
+import csv
+import os
+import tempfile
+import unittest
+
+
+def read_rows(path):
+    """Header and rows of a CSV file"""
+    with open(path, newline='') as f:
+        reader = csv.DictReader(f)
+        return reader.fieldnames, list(reader)
+
+
+class CsvPerformanceSinkTest(unittest.TestCase):
+    """Batched appends to a results CSV"""
+    
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "results.csv")
+    
+    def test_batches(self):
+        """Rows reach the file when a batch fills up, and the rest on close"""
+        sink = CsvPerformanceSink(self.path, batch_size=2, flush_interval=60)
+        sink.write({'page': "CovA", 'load_time_ms': 100.0})
+        self.assertEqual(os.path.getsize(self.path), 0)
+        sink.write({'page': "Proc", 'load_time_ms': 200.0})
+        header, rows = read_rows(self.path)
+        self.assertEqual(header, FIELDNAMES)
+        self.assertEqual([row['page'] for row in rows], ["CovA", "Proc"])
+        
+        sink.write({'page': "BG", 'load_time_ms': 300.0})
+        sink.close()
+        _, rows = read_rows(self.path)
+        self.assertEqual([row['page'] for row in rows], ["CovA", "Proc", "BG"])
+        self.assertEqual(rows[2]['load_time_ms'], "300.0")
+        self.assertEqual(rows[2]['status'], "")
+        with self.assertRaises(ValueError):
+            sink.write({'page': "Spec"})
+    
+    def test_appends_to_an_older_file(self):
+        """An older file is upgraded once, keeping its own columns, and new rows follow its header"""
+        with open(self.path, "w", newline='') as f:
+            f.write("timestamp,page,load_time_ms,legacy\n2024-01-02 03:04:05,Home,1.5,kept\n")
+        sink = CsvPerformanceSink(self.path, batch_size=1, flush_interval=60)
+        sink.write({'page': "CovA", 'load_time_ms': 2.0, 'status': "passed"})
+        sink.close()
+        
+        header, rows = read_rows(self.path)
+        self.assertEqual(header, FIELDNAMES + ['legacy'])
+        self.assertEqual((rows[0]['page'], rows[0]['legacy']), ("Home", "kept"))
+        self.assertEqual((rows[1]['page'], rows[1]['status'], rows[1]['legacy']), ("CovA", "passed", ""))
+
+
+class UpgradeCsvHeaderTest(unittest.TestCase):
+    """Adding new columns to results files written by older versions"""
+    
+    def test_current_file_is_left_alone(self):
+        """A file whose header has every column keeps its column order and is not rewritten"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.csv")
+            reordered = list(reversed(FIELDNAMES))
+            with open(path, "w", newline='') as f:
+                f.write(",".join(reordered) + "\n")
+            modified = os.path.getmtime(path)
+            self.assertEqual(upgrade_csv_header(path), reordered)
+            self.assertEqual(os.path.getmtime(path), modified)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+from report import summarize, bootstrap_intervals, permutation_test, load_results, _group_sorted
+import numpy as np
+import os
+import tempfile
+import unittest
+
+
+def results_for(groups):
+    """Column arrays for {page: [load times]}, as load_results returns them"""
+    pages = [page for page, values in groups.items() for _ in values]
+    values = [value for values in groups.values() for value in values]
+    return {'page': np.array(pages), 'load_time_ms': np.array(values, dtype=float)}
+
+
+class SummarizeTest(unittest.TestCase):
+    """Per-page statistics checked against values worked out by hand"""
+    
+    def test_statistics_per_page(self):
+        """Mean, sample std, interpolated percentiles and Tukey outliers of small known samples"""
+        results = results_for({'CovA': [5, 1, 4, 2, 3], 'Proc': [10, 10, 100, 10, 10]})
+        summary, outliers = summarize(results, resamples=0)
+        
+        cova = summary['CovA']
+        self.assertEqual(cova['count'], 5)
+        self.assertAlmostEqual(cova['mean'], 3.0)
+        self.assertAlmostEqual(cova['std'], np.sqrt(2.5))
+        self.assertAlmostEqual(cova['p50'], 3.0)
+        self.assertAlmostEqual(cova['p90'], 4.6)
+        self.assertEqual(cova['outliers'], 0)
+        self.assertNotIn('mean_ci', cova)
+        
+        # Quartiles of 10 give an IQR of 0, so only the 100 is outside the fences
+        self.assertEqual(summary['Proc']['outliers'], 1)
+        self.assertEqual(outliers.tolist(), [False] * 7 + [True] + [False] * 2)
+    
+    def test_no_rows(self):
+        """An empty result set summarizes to nothing"""
+        summary, outliers = summarize(results_for({}))
+        self.assertEqual(summary, {})
+        self.assertEqual(len(outliers), 0)
+    
+    def test_intervals_are_seeded(self):
+        """The same seed gives the same intervals, and they contain the sample mean"""
+        results = results_for({'CovA': [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]})
+        first, _ = summarize(results, resamples=500, seed=7)
+        second, _ = summarize(results, resamples=500, seed=7)
+        self.assertEqual(first['CovA']['mean_ci'], second['CovA']['mean_ci'])
+        low, high = first['CovA']['mean_ci']
+        self.assertLess(low, 5.5)
+        self.assertGreater(high, 5.5)
+
+
+class BootstrapIntervalsTest(unittest.TestCase):
+    """Intervals of every group resampled together"""
+    
+    def test_constant_group_has_a_zero_width_interval(self):
+        """Resampling a group of identical values can only give that value back"""
+        pages = np.array(['A'] * 4 + ['B'] * 6)
+        values = np.array([7, 7, 7, 7, 1, 2, 3, 4, 5, 6], dtype=float)
+        sorted_values, _, names, starts, counts = _group_sorted(pages, values)
+        mean_ci, tail_ci = bootstrap_intervals(sorted_values, starts, counts, resamples=300, seed=1)
+        
+        self.assertEqual(names.tolist(), ['A', 'B'])
+        self.assertEqual(mean_ci[0].tolist(), [7.0, 7.0])
+        self.assertEqual(tail_ci[0].tolist(), [7.0, 7.0])
+        # Group B's resamples never leave its own values
+        self.assertGreaterEqual(mean_ci[1][0], 1.0)
+        self.assertLessEqual(mean_ci[1][1], 6.0)
+        self.assertLessEqual(tail_ci[1][1], 6.0)
+
+
+class PermutationTestTest(unittest.TestCase):
+    """Two-sided permutation test on the difference in means"""
+    
+    def test_identical_samples(self):
+        """Every permutation is as extreme as no difference at all"""
+        difference, p_value = permutation_test([3, 3, 3], [3, 3, 3], permutations=500, seed=1)
+        self.assertEqual(difference, 0)
+        self.assertEqual(p_value, 1.0)
+    
+    def test_separated_samples(self):
+        """Two clearly different samples give the observed difference and a small p-value"""
+        difference, p_value = permutation_test([1] * 10, [100] * 10, permutations=2000, seed=1)
+        self.assertEqual(difference, 99)
+        self.assertLess(p_value, 0.01)
+
+
+class LoadResultsTest(unittest.TestCase):
+    """Reading result CSVs of any age into column arrays"""
+    
+    def test_short_rows_are_padded(self):
+        """A short row, e.g. from a run killed mid-write, keeps the other rows' columns whole"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.csv")
+            with open(path, "w", newline="") as f:
+                f.write("page,load_time_ms,environment\nCovA,100.0,crmsdev\nProc\n\nBG,300.0\n")
+            results = load_results([path])
+        
+        # Proc has no load time, so it is dropped as carrying no measurement
+        self.assertEqual(results['page'].tolist(), ['CovA', 'BG'])
+        self.assertEqual(results['load_time_ms'].tolist(), [100.0, 300.0])
+        self.assertEqual(results['environment'].tolist(), ['crmsdev', ''])
+        self.assertEqual(results['transition'].tolist(), ['navigation', 'navigation'])
+        self.assertEqual(results['source'].tolist(), ['results.csv', 'results.csv'])
+
+
+if __name__ == "__main__":
+    unittest.main()
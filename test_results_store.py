@@ -0,0 +1,70 @@
+from results_store import SQLiteResultsStore
+from performance_results import FIELDNAMES
+from datetime import datetime, timedelta
+import csv
+import os
+import tempfile
+import unittest
+
+
+def row(page, load_time, timestamp=None, environment="crmsdev"):
+    """A measurement row with only the columns the queries look at"""
+    return {'page': page, 'load_time_ms': load_time, 'environment': environment,
+            'timestamp': timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+
+
+class SQLiteResultsStoreTest(unittest.TestCase):
+    """Writing measurements to the history database and reading percentiles back"""
+    
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.store = SQLiteResultsStore(os.path.join(directory.name, "results.db"), batch_size=3)
+        self.addCleanup(self.store.close)
+    
+    def test_nearest_rank_percentile(self):
+        """Nearest rank over 1..10 and 1..100; failed rows without a load time are left out"""
+        self.store.write_rows([row("CovA", value) for value in range(10, 0, -1)])
+        self.store.write_rows([row("Proc", value) for value in range(1, 101)] + [row("Proc", None)])
+        self.assertEqual(self.store.percentile("CovA", 50), 5)
+        self.assertEqual(self.store.percentile("CovA", 95), 10)
+        self.assertEqual(self.store.percentile("CovA", 1), 1)
+        self.assertEqual(self.store.percentile("Proc", 95), 95)
+        self.assertEqual(self.store.percentile("Proc", 100), 100)
+        self.assertIsNone(self.store.percentile("BG"))
+    
+    def test_filters(self):
+        """Page globs, environments and the last N days narrow the rows a percentile covers"""
+        old = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d %H:%M:%S")
+        self.store.write_rows([row("16-000265CRA2", 100), row("17-000100CRA2", 300),
+                               row("16-000265CRA2", 900, timestamp=old), row("16-000265CRA2", 50, environment="crmsqa")])
+        self.assertEqual(self.store.percentile("*CRA2", 100, days=7, environment="crmsdev"), 300)
+        self.assertEqual(self.store.percentile("16-000265CRA2", 100, environment="crmsdev"), 900)
+        self.assertEqual(self.store.percentile("16-000265CRA2", 100, days=7), 100)
+    
+    def test_buffered_writes(self):
+        """Rows are inserted in batches and the rest on flush"""
+        for value in [1, 2, 3, 4]:
+            self.store.write(row("Spec", value))
+        self.assertEqual(len(self.store.query(page="Spec")), 3)
+        self.store.flush()
+        self.assertEqual(sorted(r['load_time_ms'] for r in self.store.query(page="Spec")), [1, 2, 3, 4])
+    
+    def test_import_only_adds_new_rows(self):
+        """Importing a file again adds nothing, and rows appended to it later are imported once"""
+        path = os.path.join(self.directory, "results.csv")
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+            writer.writeheader()
+            writer.writerows([dict(row("Home", value), run_id="run1") for value in [1, 2]])
+        self.assertEqual(self.store.import_csv(path, "crmsdev"), 2)
+        self.assertEqual(self.store.import_csv(path, "crmsdev"), 0)
+        with open(path, "a", newline="") as f:
+            csv.DictWriter(f, fieldnames=FIELDNAMES).writerow(dict(row("Home", 3), run_id="run2"))
+        self.assertEqual(self.store.import_csv(path, "crmsdev"), 1)
+        self.assertEqual(sorted(r['load_time_ms'] for r in self.store.query(page="Home")), [1, 2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
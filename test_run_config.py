@@ -0,0 +1,109 @@
+from run_config import RunConfig, RunConfigError, add_run_arguments
+import argparse
+import json
+import os
+import tempfile
+import unittest
+
+
+CONFIG = {
+    'environments': ["crmsdev.mednet.ucla.edu", "https://crmsqa.mednet.ucla.edu/"],
+    'credentials': {'username': "tester", 'password_env': "TEST_ONCORE_PASSWORD"},
+    'targets': [{'protocol_no': "16-000265", 'protocol_id': 1234, 'arm': "BLD", 'subjects': ["111", "222"]}],
+    'iterations': 2,
+    'lanes': 2,
+    'sink': {'batch_size': 5}
+}
+
+
+class RunConfigTest(unittest.TestCase):
+    """Merging a config file, ONCORE_* variables and flags, later ones winning"""
+    
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.path = self.write_config(CONFIG)
+    
+    def write_config(self, data, name="run.json"):
+        """Write a JSON run config into the test's directory"""
+        path = os.path.join(self.directory, name)
+        with open(path, "w") as f:
+            json.dump(data, f)
+        return path
+    
+    def test_file(self):
+        """URLs get their scheme, IDs are read as text and section options are kept"""
+        config = RunConfig.load_settings(self.path, environ={})
+        self.assertEqual(config.environments, ["https://crmsdev.mednet.ucla.edu", "https://crmsqa.mednet.ucla.edu"])
+        self.assertEqual(config.targets[0]['protocol_id'], "1234")
+        self.assertEqual(config.sink, {'batch_size': 5, 'fsync_interval': None})
+        self.assertFalse(config.interactive)
+    
+    def test_environment_overrides_file(self):
+        """ONCORE_* variables win over the file; protocol and subject values apply to every target"""
+        environ = {'ONCORE_PASSWORD': "secret", 'ONCORE_ITERATIONS': "5", 'ONCORE_SUBJECT_MRN': "333, 444",
+                   'ONCORE_SINK_FSYNC_INTERVAL': "0", 'ONCORE_CONFIG': self.path}
+        config = RunConfig.load_settings(environ=environ).prompt_for_missing()
+        self.assertEqual(config.password, "secret")
+        self.assertEqual(config.iterations, 5)
+        self.assertEqual(config.lanes, 2)
+        self.assertEqual(config.sink, {'batch_size': 5, 'fsync_interval': 0.0})
+        self.assertEqual([(case['base_url'], case['subject_mrn']) for case in config.cases()], [
+            ("https://crmsdev.mednet.ucla.edu", "333"), ("https://crmsdev.mednet.ucla.edu", "444"),
+            ("https://crmsqa.mednet.ucla.edu", "333"), ("https://crmsqa.mednet.ucla.edu", "444")])
+    
+    def test_flags_override_environment(self):
+        """Command line flags win over ONCORE_* variables"""
+        args = add_run_arguments(argparse.ArgumentParser()).parse_args(
+            ["--iterations", "7", "--url", "crmsprod.mednet.ucla.edu", "--sink-batch-size", "50"])
+        config = RunConfig.load_settings(self.path, args=args, environ={'ONCORE_ITERATIONS': "5"})
+        self.assertEqual(config.iterations, 7)
+        self.assertEqual(config.environments, ["https://crmsprod.mednet.ucla.edu"])
+        self.assertEqual(config.sink['batch_size'], 50)
+    
+    def test_bad_number_names_the_variable(self):
+        """A non-numeric ONCORE_* value is reported as a RunConfigError naming the variable"""
+        with self.assertRaisesRegex(RunConfigError, "ONCORE_LANES"):
+            RunConfig.load_settings(self.path, environ={'ONCORE_LANES': "two"})
+        config = RunConfig.load_settings(self.write_config(dict(CONFIG, lanes="two"), "bad.json"),
+                                         environ={'ONCORE_PASSWORD': "secret"})
+        with self.assertRaisesRegex(RunConfigError, "lanes"):
+            config.prompt_for_missing()
+    
+    def test_invalid_files(self):
+        """A password in the file and unknown section options are rejected"""
+        credentials = dict(CONFIG['credentials'], password="secret")
+        with self.assertRaises(RunConfigError):
+            RunConfig.from_file(self.write_config(dict(CONFIG, credentials=credentials), "password.json"))
+        with self.assertRaises(RunConfigError):
+            RunConfig.from_file(self.write_config(dict(CONFIG, sink={'batch': 5}), "sink.json"))
+    
+    def test_missing_settings_fail_without_prompting(self):
+        """A config file run never waits for input; missing settings are listed in one error"""
+        config = RunConfig.load_settings(self.path, environ={})
+        with self.assertRaisesRegex(RunConfigError, "password"):
+            config.prompt_for_missing()
+    
+    def test_defaults(self):
+        """Options nobody set get the prompts' defaults"""
+        config = RunConfig.load_settings(self.write_config(dict(CONFIG, iterations=None, lanes=None), "defaults.json"),
+                                         environ={'ONCORE_PASSWORD': "secret"}).prompt_for_missing()
+        self.assertEqual((config.iterations, config.lanes, config.browser_mode), (1, 1, "cold"))
+        self.assertEqual(config.screenshots['mode'], "on-failure")
+        self.assertFalse(config.measure_login)
+        self.assertTrue(config.admin)
+    
+    def test_admin_can_be_turned_off(self):
+        """The admin test is on by default; --no-admin and ONCORE_ADMIN=0 turn it off, --admin back on"""
+        environ = {'ONCORE_PASSWORD': "secret"}
+        parser = add_run_arguments(argparse.ArgumentParser())
+        for argv, admin_env, expected in [(["--no-admin"], None, False), ([], "0", False), (["--admin"], "0", True)]:
+            if admin_env is not None:
+                environ['ONCORE_ADMIN'] = admin_env
+            config = RunConfig.load_settings(self.path, args=parser.parse_args(argv), environ=environ)
+            self.assertEqual(config.prompt_for_missing().admin, expected, msg=argv)
+
+
+if __name__ == "__main__":
+    unittest.main()
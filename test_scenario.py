@@ -0,0 +1,148 @@
+from scenario import Scenario, ScenarioError, ScenarioRunner, parse_shard, render
+from page_objects.oncore_page import OncorePage, MeasurementError
+from performance_results import FAILED, SKIPPED
+import unittest
+
+
+def navigate(name, requires=(), tags=()):
+    """A minimal navigate step"""
+    return {'name': name, 'action': 'navigate', 'url': f"/{name}", 'measure': name,
+            'requires': list(requires), 'tags': list(tags)}
+
+
+# Two chains linked through requires (CRA -> Visit -> Calendar, Subject -> Specimens) and two lone steps
+STEPS = [
+    navigate("Protocol", tags=["protocol"]),
+    navigate("CRA"),
+    navigate("Subject"),
+    navigate("Visit", requires=["CRA"]),
+    navigate("Specimens", requires=["Subject"], tags=["subject"]),
+    navigate("Calendar", requires=["Visit"], tags=["subject"]),
+    navigate("Financials")
+]
+
+
+class ScenarioTest(unittest.TestCase):
+    """Chains, selection and sharding of a scenario's steps"""
+    
+    def setUp(self):
+        self.scenario = Scenario.from_dict({'name': "protocol", 'steps': STEPS})
+    
+    def test_chains(self):
+        """Steps linked through requires share a chain and keep their run order"""
+        chains = [[step.name for step in chain] for chain in self.scenario.chains()]
+        self.assertEqual(chains, [["Protocol"], ["CRA", "Visit", "Calendar"], ["Subject", "Specimens"],
+                                  ["Financials"]])
+    
+    def test_step_joining_two_chains(self):
+        """A step that requires steps of two chains merges them into one"""
+        steps = STEPS + [navigate("Summary", requires=["Calendar", "Specimens"])]
+        scenario = Scenario.from_dict({'name': "protocol", 'steps': steps})
+        chains = [[step.name for step in chain] for chain in scenario.chains()]
+        self.assertEqual(chains, [["Protocol"], ["CRA", "Subject", "Visit", "Specimens", "Calendar", "Summary"],
+                                  ["Financials"]])
+    
+    def test_select_adds_required_steps(self):
+        """Selecting a step keeps the steps it needs, in the scenario's order"""
+        self.assertEqual(self.scenario.select(["Calendar"]).names(), ["CRA", "Visit", "Calendar"])
+    
+    def test_select_by_tag(self):
+        """Tags select every step carrying them, plus their requirements"""
+        self.assertEqual(self.scenario.select(["subject"]).names(),
+                         ["CRA", "Subject", "Visit", "Specimens", "Calendar"])
+    
+    def test_select_unknown(self):
+        """An unknown step or tag is an error rather than an empty run"""
+        with self.assertRaises(ScenarioError):
+            self.scenario.select(["Nope"])
+    
+    def test_shards_cover_every_step_once(self):
+        """Shards split whole chains and together hold every step exactly once"""
+        shards = [self.scenario.shard(index, 2).names() for index in (1, 2)]
+        self.assertEqual(shards, [["CRA", "Visit", "Calendar", "Financials"], ["Protocol", "Subject", "Specimens"]])
+        self.assertEqual(sorted(shards[0] + shards[1]), sorted(self.scenario.names()))
+    
+    def test_invalid_scenarios(self):
+        """Duplicate names and requirements on later steps are rejected"""
+        with self.assertRaises(ScenarioError):
+            Scenario.from_dict({'steps': [navigate("A"), navigate("A")]})
+        with self.assertRaises(ScenarioError):
+            Scenario.from_dict({'steps': [navigate("A", requires=["B"]), navigate("B")]})
+        with self.assertRaises(ScenarioError):
+            Scenario.from_dict({'steps': [{'name': "A", 'action': "navigate"}]})
+    
+    def test_shipped_scenarios_load(self):
+        """The protocol and admin scenarios in scenarios/ are valid"""
+        self.assertIn("CovA", Scenario.load("protocol").names())
+        self.assertEqual(Scenario.load("admin").names(), ["Home", "AdminRPEConsole", "AdminBillingGrid"])
+    
+    def test_shipped_locator_names_exist(self):
+        """Every locator the shipped scenarios name is defined on OncorePage"""
+        for name in ("protocol", "admin"):
+            for step in Scenario.load(name).steps:
+                for value in [step.locator, step.ready] + step.locators:
+                    if isinstance(value, str):
+                        self.assertIsInstance(getattr(OncorePage, value, None), tuple, msg=f"{step.name}: {value}")
+
+
+class UntimedPage:
+    """A page whose loads have no navigation timing; keeps the rows of failed steps"""
+    
+    driver = None
+    screenshots = None
+    
+    def __init__(self):
+        self.failures = []
+    
+    def navigate_to(self, url, ready_locator=None):
+        pass
+    
+    def measure_page_load(self, name):
+        raise MeasurementError(f"No navigation timing entry for {name}")
+    
+    def record_failure(self, name, error, status=FAILED):
+        self.failures.append((name, status))
+
+
+class ScenarioRunnerTest(unittest.TestCase):
+    """How the runner records a step that could not be measured"""
+    
+    def test_untimed_page_fails_its_step(self):
+        """A page without timing gives one failed row and a failed step, so its dependents are skipped"""
+        page = UntimedPage()
+        runner = ScenarioRunner(page, {})
+        home, cra = Scenario.from_dict({'name': "untimed", 'steps': [navigate("Home"),
+                                                                     navigate("CRA", requires=["Home"])]}).steps
+        self.assertEqual((runner.run_step(home), runner.run_step(cra)), (FAILED, SKIPPED))
+        self.assertEqual(page.failures, [("Home", FAILED), ("CRA", SKIPPED)])
+
+
+class ParseShardTest(unittest.TestCase):
+    """Reading "I/N" shard settings"""
+    
+    def test_valid(self):
+        """Index and count are read as numbers"""
+        self.assertEqual(parse_shard("2/3"), (2, 3))
+        self.assertEqual(parse_shard("1/1"), (1, 1))
+    
+    def test_invalid(self):
+        """Malformed and out-of-range shards are rejected"""
+        for value in ["0/3", "4/3", "1/0", "2", "a/b", "1/2/3"]:
+            with self.assertRaises(ScenarioError, msg=value):
+                parse_shard(value)
+
+
+class RenderTest(unittest.TestCase):
+    """Filling placeholders from a case's context"""
+    
+    def test_placeholders(self):
+        """Known placeholders are filled; other braces in scripts are left alone"""
+        context = {'protocol_no': "16-000265"}
+        self.assertEqual(render("{protocol_no}CRA2", context), "16-000265CRA2")
+        self.assertEqual(render("function () { return 1; }", context), "function () { return 1; }")
+        with self.assertRaises(ScenarioError):
+            render("{subject_mrn}", context)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+from screenshot_service import ScreenshotService, ALWAYS, OFF, SAMPLED
+import base64
+import csv
+import os
+import tempfile
+import time
+import unittest
+
+
+class FakeDriver:
+    """Returns the same small image for every screenshot"""
+    
+    def get_screenshot_as_base64(self):
+        return base64.b64encode(b"\x89PNG fake image").decode()
+
+
+class ScreenshotServiceTest(unittest.TestCase):
+    """Background writes, the index and retention of the screenshot directory"""
+    
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+    
+    def make_files(self, ages_days, size=10):
+        """Create screenshots under two run folders, the oldest first; returns their paths"""
+        now = time.time()
+        paths = []
+        for i, age in enumerate(ages_days):
+            path = os.path.join(self.directory, f"run{i % 2}", f"shot{i}.png")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(b"x" * size)
+            os.utime(path, (now - age * 86400, now - age * 86400))
+            paths.append(path)
+        return paths
+    
+    def remaining(self, paths):
+        """Names of the files that retention kept"""
+        return [os.path.basename(path) for path in paths if os.path.exists(path)]
+    
+    def test_max_files(self):
+        """The oldest files beyond the count limit are deleted, whichever run folder they are in"""
+        paths = self.make_files([5, 4, 3, 2, 1])
+        service = ScreenshotService(self.directory, max_files=2)
+        self.assertEqual(service.apply_retention(), 3)
+        self.assertEqual(self.remaining(paths), ["shot3.png", "shot4.png"])
+    
+    def test_max_age_and_size(self):
+        """Files older than max_age_days go first, then the oldest until the size limit is met"""
+        paths = self.make_files([30, 10, 3, 2, 1], size=400 * 1024)
+        service = ScreenshotService(self.directory, max_age_days=7, max_mb=1)
+        self.assertEqual(service.apply_retention(), 3)
+        self.assertEqual(self.remaining(paths), ["shot3.png", "shot4.png"])
+    
+    def test_no_limits(self):
+        """Without limits nothing is deleted"""
+        paths = self.make_files([400, 1])
+        self.assertEqual(ScreenshotService(self.directory).apply_retention(), 0)
+        self.assertEqual(len(self.remaining(paths)), 2)
+    
+    def test_capture_writes_and_indexes(self):
+        """A captured screenshot is written in the background and listed in index.csv"""
+        service = ScreenshotService(self.directory, mode=ALWAYS)
+        path = service.capture(FakeDriver(), "error.png", run_id="run1", iteration=3, worker_id=2, step="PhysEx",
+                               failure=True)
+        service.close()
+        self.assertTrue(os.path.isfile(path))
+        self.assertTrue(os.path.basename(path).startswith("i003-w2-PhysEx-"))
+        with open(os.path.join(self.directory, "index.csv"), newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual([(row['run_id'], row['step'], row['reason'], row['path']) for row in rows],
+                         [("run1", "PhysEx", "failure", path)])
+    
+    def test_modes(self):
+        """Off never captures, even on failure; sampled captures about sample_rate of the time"""
+        self.assertIsNone(ScreenshotService(self.directory, mode=OFF).capture(FakeDriver(), "x.png", failure=True))
+        sampled = ScreenshotService(self.directory, mode=SAMPLED, sample_rate=0.25, seed=1)
+        captured = sum(sampled.should_capture() for _ in range(2000))
+        self.assertAlmostEqual(captured, 500, delta=75)
+        self.assertTrue(sampled.should_capture(failure=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
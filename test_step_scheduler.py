@@ -0,0 +1,119 @@
+from scenario import Scenario
+from step_scheduler import StepScheduler
+from performance_results import PASSED, FAILED, SKIPPED
+import threading
+import unittest
+
+
+class FakeWindows:
+    """The parts of WindowTracker a scenario run touches"""
+    
+    def refresh(self):
+        pass
+    
+    def return_to_first(self):
+        pass
+
+
+class FakePage:
+    """Stands in for a signed-in OncorePage: records the URLs it visits and the rows of failed steps"""
+    
+    def __init__(self, lane, fail=()):
+        self.lane = lane
+        self.driver = None
+        self.screenshots = None
+        self.windows = FakeWindows()
+        self.fail = set(fail)
+        self.visited = []
+        self.failures = []
+    
+    def navigate_to(self, url, ready_locator=None):
+        if url.strip("/") in self.fail:
+            raise RuntimeError(f"{url} did not load")
+        self.visited.append(url)
+    
+    def measure_page_load(self, name):
+        return 1.0
+    
+    def record_failure(self, name, error, status=FAILED):
+        self.failures.append((name, status))
+
+
+def scenario(name, steps):
+    """A scenario of navigate steps given as {name: [required steps]}"""
+    return Scenario.from_dict({'name': name, 'steps': [
+        {'name': step, 'action': "navigate", 'url': f"/{step}", 'measure': step, 'requires': requires}
+        for step, requires in steps.items()]})
+
+
+class StepSchedulerTest(unittest.TestCase):
+    """Running a scenario's independent chains over several lanes"""
+    
+    def run_scheduler(self, chains, lanes=2, fail=(), close_error=None):
+        """Run a scenario on fake lanes; returns the results and the pages that were opened and closed"""
+        opened, closed = {}, []
+        
+        def open_lane(lane):
+            opened[lane] = FakePage(lane, fail)
+            return opened[lane]
+        
+        def close_lane(lane, page):
+            closed.append(lane)
+            if close_error is not None:
+                raise close_error
+        
+        results = StepScheduler(open_lane, close_lane, {}, lanes=lanes).run(chains)
+        return results, opened, closed
+    
+    def test_chains_run_in_order_across_lanes(self):
+        """Every step runs once, each chain in its own order on one lane, and every lane is closed"""
+        steps = scenario("scheduler-order", {'CRA': [], 'Visit': ['CRA'], 'Calendar': ['Visit'],
+                                             'Subject': [], 'Specimens': ['Subject'], 'BG': []})
+        results, opened, closed = self.run_scheduler(steps, lanes=2)
+        
+        self.assertEqual(results, dict.fromkeys(steps.names(), PASSED))
+        visited = [url for page in opened.values() for url in page.visited]
+        self.assertEqual(sorted(visited), sorted(f"/{name}" for name in steps.names()))
+        for page in opened.values():
+            for chain in (["/CRA", "/Visit", "/Calendar"], ["/Subject", "/Specimens"]):
+                ran = [url for url in page.visited if url in chain]
+                self.assertIn(ran, ([], chain))
+        self.assertEqual(sorted(closed), [1, 2])
+    
+    def test_lanes_capped_by_chains(self):
+        """No more lanes are opened than there are chains"""
+        steps = scenario("scheduler-cap", {'CRA': [], 'Visit': ['CRA']})
+        _, opened, _ = self.run_scheduler(steps, lanes=4)
+        self.assertEqual(list(opened), [1])
+    
+    def test_failed_step_skips_only_its_chain(self):
+        """A failure skips the steps that require it; independent chains still pass"""
+        steps = scenario("scheduler-failure", {'CRA': [], 'Visit': ['CRA'], 'BG': []})
+        results, opened, _ = self.run_scheduler(steps, lanes=2, fail={"CRA"})
+        self.assertEqual(results, {'CRA': FAILED, 'Visit': SKIPPED, 'BG': PASSED})
+        failures = [failure for page in opened.values() for failure in page.failures]
+        self.assertEqual(sorted(failures), [('CRA', FAILED), ('Visit', SKIPPED)])
+    
+    def test_close_error_is_logged(self):
+        """An exception from close_lane is kept inside the lane thread and the results still come back"""
+        escaped = []
+        self.addCleanup(setattr, threading, "excepthook", threading.excepthook)
+        threading.excepthook = escaped.append
+        steps = scenario("scheduler-close", {'CRA': [], 'BG': []})
+        results, _, closed = self.run_scheduler(steps, lanes=2, close_error=RuntimeError("pool is closed"))
+        self.assertEqual(results, {'CRA': PASSED, 'BG': PASSED})
+        self.assertEqual(sorted(closed), [1, 2])
+        self.assertEqual(escaped, [])
+    
+    def test_no_lane_starts(self):
+        """When no lane can open, the run raises the lane's error"""
+        def open_lane(lane):
+            raise RuntimeError("no browser")
+        
+        steps = scenario("scheduler-no-lane", {'CRA': [], 'BG': []})
+        with self.assertRaisesRegex(RuntimeError, "no browser"):
+            StepScheduler(open_lane, lambda lane, page: None, {}, lanes=2).run(steps)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+from selenium.common.exceptions import WebDriverException
+from performance_results import WEB_VITALS_FIELDS
+import weakref
+
+
+# Observes paint, LCP, layout shift, long task and interaction entries for the document's lifetime.
+# Guarded so it is safe from Page.addScriptToEvaluateOnNewDocument and again from READ_JS, which installs it
+# late (buffered entries only) in windows the session-start registration did not reach.
+OBSERVER_JS = """
+(function () {
+    if (window.__oncoreVitals || !window.PerformanceObserver) { return; }
+    var vitals = window.__oncoreVitals = {stepStart: 0, fcp: null, lcp: null, shifts: [], longTasks: [], interactions: []};
+    function keep(list, entry) {
+        list.push(entry);
+        if (list.length > 2000) { list.shift(); }
+    }
+    function observe(type, callback, options) {
+        try {
+            var observer = new PerformanceObserver(function (list) { list.getEntries().forEach(callback); });
+            observer.observe(Object.assign({type: type, buffered: true}, options || {}));
+        } catch (e) {
+            // Entry type not supported by this browser
+        }
+    }
+    observe('paint', function (e) { if (e.name === 'first-contentful-paint') { vitals.fcp = e.startTime; } });
+    observe('largest-contentful-paint', function (e) { vitals.lcp = e.startTime; });
+    observe('layout-shift', function (e) { if (!e.hadRecentInput) { keep(vitals.shifts, [e.startTime, e.value]); } });
+    observe('longtask', function (e) { keep(vitals.longTasks, [e.startTime, e.duration]); });
+    observe('event', function (e) {
+        if (e.interactionId) { keep(vitals.interactions, [e.startTime, e.duration]); }
+    }, {durationThreshold: 16});
+})();
+"""
+
+# Summarizes the vitals for the measured step. A navigation covers the whole document; a soft transition
+# only what happened since START_TRANSITION_JS set stepStart, and has no paint or LCP of its own.
+READ_JS = OBSERVER_JS + """
+var navigation = arguments[0];
+var vitals = window.__oncoreVitals;
+if (!vitals) {
+    return null;
+}
+var since = navigation ? 0 : vitals.stepStart;
+
+// CLS: the largest burst of shifts less than 1 s apart and at most 5 s long
+var cls = 0, burst = 0, first = null, last = null;
+vitals.shifts.forEach(function (shift) {
+    if (shift[0] < since) { return; }
+    if (first !== null && shift[0] - last < 1000 && shift[0] - first < 5000) {
+        burst += shift[1];
+    } else {
+        burst = shift[1];
+        first = shift[0];
+    }
+    last = shift[0];
+    cls = Math.max(cls, burst);
+});
+
+// TBT: long task time beyond 50 ms; for a navigation, only tasks after the first contentful paint
+var tbtStart = navigation && vitals.fcp !== null ? vitals.fcp : since;
+var tbt = 0, longTasks = 0;
+vitals.longTasks.forEach(function (task) {
+    if (task[0] < since) { return; }
+    longTasks += 1;
+    if (task[0] >= tbtStart) { tbt += Math.max(0, task[1] - 50); }
+});
+
+// INP: the slowest interaction in the step (there are only a few per step, so no percentile is needed)
+var inp = null;
+vitals.interactions.forEach(function (interaction) {
+    if (interaction[0] >= since) { inp = Math.max(inp || 0, interaction[1]); }
+});
+
+return {
+    fcp_ms: navigation ? vitals.fcp : null,
+    lcp_ms: navigation ? vitals.lcp : null,
+    cls: cls,
+    tbt_ms: tbt,
+    inp_ms: inp,
+    long_tasks: longTasks
+};
+"""
+
+# Drivers that already register the observers for every new document
+_installed = weakref.WeakSet()
+
+
+def install(driver):
+    """Register the observers at session start so they see a page's paints and shifts from the beginning"""
+    if driver in _installed:
+        return
+    if hasattr(driver, "execute_cdp_cmd"):
+        try:
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": OBSERVER_JS})
+        except WebDriverException as e:
+            print(f"Could not register Web Vitals observers, installing them per page instead: {str(e)}")
+    _installed.add(driver)
+
+
+def read(driver, navigation=True):
+    """FCP, LCP, CLS, TBT, INP and the long task count of the measured step, as result columns"""
+    try:
+        vitals = driver.execute_script(READ_JS, navigation) or {}
+    except WebDriverException as e:
+        print(f"Could not read Web Vitals: {str(e)}")
+        vitals = {}
+    row = {name: round(vitals[name], 1) if vitals.get(name) is not None else None for name in WEB_VITALS_FIELDS}
+    # CLS is a unitless score, usually well below 1
+    if vitals.get('cls') is not None:
+        row['cls'] = round(vitals['cls'], 4)
+    return row
@@ -0,0 +1,84 @@
+from selenium.common.exceptions import NoSuchWindowException
+from selenium.webdriver.support.ui import WebDriverWait
+import time
+
+
+class WindowTracker:
+    """Follows a session's windows as they open and close, so a popup is found by the handle it adds
+    
+    Handles are remembered as they are seen rather than counted, so any number of windows can be open and
+    a popup is never confused with a window opened earlier. The windows popups were opened from are kept
+    on a stack to return to, and mark() notes when the action that may open a popup started.
+    """
+    
+    def __init__(self, driver, poll_interval=0.1):
+        self.driver = driver
+        self.poll_interval = poll_interval
+        # Handles already accounted for; None until the first read so creating a tracker costs no round trip
+        self.known = None
+        # Windows to return to, innermost popup's opener last
+        self.openers = []
+        # perf_counter time at which the last action that may have opened a popup started
+        self.action_started = None
+    
+    def refresh(self):
+        """Treat every open window as already seen"""
+        self.known = set(self.driver.window_handles)
+        return self.known
+    
+    def mark(self):
+        """Note that an action that may open a popup is about to run; popups are timed from here"""
+        if self.known is None:
+            self.refresh()
+        self.action_started = time.perf_counter()
+    
+    def _new_windows(self, driver):
+        """Handles not seen before, in the order the browser opened them; forgets windows that have closed"""
+        handles = driver.window_handles
+        self.known.intersection_update(handles)
+        return [handle for handle in handles if handle not in self.known]
+    
+    def wait_for_new(self, timeout=10):
+        """Wait for a window that is not known yet and return its handle
+        
+        The window may already be open when this is called. When an action opened several, each call
+        returns the next one.
+        """
+        if self.known is None:
+            self.refresh()
+        new_windows = WebDriverWait(self.driver, timeout, poll_frequency=self.poll_interval).until(self._new_windows)
+        self.known.add(new_windows[0])
+        return new_windows[0]
+    
+    def switch_to_new(self, timeout=10):
+        """Switch to the next new window; returns the handle of the window it was opened from"""
+        opener = self.driver.current_window_handle
+        handle = self.wait_for_new(timeout)
+        self.openers.append(opener)
+        self.driver.switch_to.window(handle)
+        return opener
+    
+    def close_and_return(self, opener=None):
+        """Close the current window, unless the application already closed it, and switch back to its opener"""
+        if opener is None:
+            if not self.openers:
+                raise ValueError("There is no window to return to")
+            opener = self.openers.pop()
+        elif opener in self.openers:
+            del self.openers[self.openers.index(opener):]
+        try:
+            current = self.driver.current_window_handle
+            self.driver.close()
+            if self.known is not None:
+                self.known.discard(current)
+        except NoSuchWindowException:
+            # A popup that closes itself, e.g. after submitting, leaves nothing to close
+            pass
+        self.driver.switch_to.window(opener)
+        return opener
+    
+    def return_to_first(self):
+        """Switch back to the window the first popup was opened from, e.g. after a popup step failed"""
+        if self.openers:
+            self.driver.switch_to.window(self.openers[0])
+            self.openers = []